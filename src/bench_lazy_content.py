@@ -0,0 +1,57 @@
+"""Benchmark for the lazy loading of the scene contents.
+
+Compare reading a project file completely with reading it in lazy mode,
+measuring time and the memory held by the novel.
+
+usage: python bench_lazy_content.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from timeit import default_timer as timer
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+
+
+def read_project(filePath, **kwargs):
+    """Read the project and print the time spent and the memory used."""
+    tracemalloc.start()
+    start = timer()
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+    readTime = timer() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{kwargs or "Complete"}: {readTime:.2f} s, {size / 1e6:.1f} MB held, {peak / 1e6:.1f} MB peak')
+    return ywFile.novel
+
+
+def main(scenes=20000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/bench.yw7'
+        ywFile = Yw7File(filePath)
+        ywFile.novel = create_novel(scenes)
+        ywFile.write()
+        ywFile = None
+        print(f'{scenes} scenes, {os.path.getsize(filePath) / 1e6:.1f} MB')
+        read_project(filePath)
+        read_project(filePath, streaming=True)
+        novel = read_project(filePath, lazy=True)
+        start = timer()
+        for scene in novel.scenes.values():
+            scene.sceneContent
+        print(f'Loading all scene contents: {timer() - start:.2f} s')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -0,0 +1,45 @@
+"""Benchmark for the conversion of yWriter markup to ODT.
+
+Convert the scene contents of a synthetic project with a growing number
+of document languages, and check that the conversion time per scene 
+does not depend on the number of languages.
+
+usage: python bench_markup.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+from time import perf_counter
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from pywriter.test.synthetic_novel import create_novel
+
+
+def convert_scenes(exportFile):
+    """Return the time needed for converting all scene contents."""
+    exportFile._translator = None
+    start = perf_counter()
+    for scId in exportFile.novel.scenes:
+        exportFile._convert_from_yw(exportFile.novel.scenes[scId].sceneContent)
+    return perf_counter() - start
+
+
+def main(scenes=2000):
+    novel = create_novel(scenes)
+    novel.check_locale()
+    for scId in novel.scenes:
+        novel.scenes[scId].sceneContent = f'[lang=x0-XX]{novel.scenes[scId].sceneContent}[/lang=x0-XX]'
+    for languageCount in (1, 10, 100):
+        novel.languages = [f'x{i}-XX' for i in range(languageCount)]
+        exportFile = OdtWManuscript(f'bench{OdtWManuscript.SUFFIX}{OdtWManuscript.EXTENSION}')
+        exportFile.novel = novel
+        duration = convert_scenes(exportFile)
+        print(f'{languageCount:3} languages: {duration / scenes * 1e6:7.2f} µs/scene')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -0,0 +1,65 @@
+"""Benchmark for the memory used by the novel model.
+
+Measure the memory allocated per scene for a synthetic novel
+built in memory, and for the same novel read from a yWriter project file.
+
+usage: python bench_model_memory.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+
+
+def measure(function):
+    """Return a tuple: (result of function, number of bytes allocated by function)."""
+    gc.collect()
+    tracemalloc.start()
+    result = function()
+    gc.collect()
+    size, __ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def read_novel(filePath):
+    """Return a Novel instance read from filePath, without retaining the xml tree."""
+    ywFile = Yw7File(filePath, streaming=True)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile.novel
+
+
+def main(scenes=20000):
+    scene = Scene()
+    try:
+        instanceSize = sys.getsizeof(scene) + sys.getsizeof(vars(scene))
+    except TypeError:
+        # The instance has no __dict__.
+        instanceSize = sys.getsizeof(scene)
+    print(f'Empty Scene instance: {instanceSize} bytes')
+    novel, size = measure(lambda: create_novel(scenes))
+    print(f'Synthetic novel, {scenes} scenes: {size / scenes:.0f} bytes per scene')
+    with tempfile.TemporaryDirectory() as tempDir:
+        ywFile = Yw7File(f'{tempDir}/bench.yw7')
+        ywFile.novel = novel
+        ywFile.write()
+        ywFile.novel = None
+        novel = None
+        novel, size = measure(lambda: read_novel(ywFile.filePath))
+        print(f'Novel read from yw7 file, {scenes} scenes: {size / scenes:.0f} bytes per scene')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -0,0 +1,62 @@
+"""Benchmark for the ODS reader.
+
+Export a generated novel as scene list, pad the table like Calc does,
+and measure the time and the peak memory needed for reading it back.
+
+usage: python bench_ods_reader.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+import zipfile
+from timeit import default_timer as timer
+from pywriter.model.novel import Novel
+from pywriter.ods_r.ods_r_scenelist import OdsRSceneList
+from pywriter.ods_w.ods_w_scenelist import OdsWSceneList
+from pywriter.test.synthetic_novel import create_novel
+
+PADDING = ('<table:table-row table:number-rows-repeated="1048000">'
+           '<table:table-cell table:number-columns-repeated="1024"/></table:table-row>')
+# Empty rows as appended by Calc when saving the sheet.
+
+
+def pad_table(filePath):
+    """Append empty rows to the table of the ODS file."""
+    with zipfile.ZipFile(filePath) as odfFile:
+        members = {name: odfFile.read(name) for name in odfFile.namelist()}
+    content = members['content.xml'].decode('utf-8')
+    members['content.xml'] = content.replace('</table:table>', f'{PADDING}</table:table>', 1).encode('utf-8')
+    with zipfile.ZipFile(filePath, 'w', zipfile.ZIP_DEFLATED) as odfFile:
+        for name, data in members.items():
+            odfFile.writestr(name, data)
+
+
+def main(scenes=20000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/bench_scenelist.ods'
+        odsFile = OdsWSceneList(filePath)
+        odsFile.novel = create_novel(scenes)
+        odsFile.write()
+        pad_table(filePath)
+        print(f'{scenes} scenes, {os.path.getsize(filePath) / 1e6:.1f} MB')
+        odsFile = OdsRSceneList(filePath)
+        odsFile.novel = Novel()
+        tracemalloc.start()
+        start = timer()
+        odsFile.read()
+        readTime = timer() - start
+        __, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'Reading: {readTime:.2f} s, {peak / 1e6:.1f} MB peak, {len(odsFile.novel.scenes)} scenes read')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -0,0 +1,39 @@
+"""Benchmark for the memory consumption of manuscript exports.
+
+Measure the peak memory allocated while writing ODT manuscripts 
+of synthetic projects with a growing number of scenes.
+Since the document is written as it is generated, the peak should 
+not depend on the size of the project.
+
+usage: python bench_odt_export.py
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import tempfile
+import tracemalloc
+from time import perf_counter
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from pywriter.odt_w.odt_w_proof import OdtWProof
+from pywriter.test.synthetic_novel import create_novel
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tempDir:
+        for scenes in (1000, 5000, 10000):
+            novel = create_novel(scenes)
+            for exportClass in (OdtWManuscript, OdtWProof):
+                exportFile = exportClass(f'{tempDir}/bench{exportClass.SUFFIX}{exportClass.EXTENSION}')
+                exportFile.novel = novel
+                tracemalloc.start()
+                start = perf_counter()
+                exportFile.write()
+                elapsed = perf_counter() - start
+                __, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f'{exportClass.__name__:15} {scenes:6} scenes: {elapsed:.3f} s, peak memory {peak // 1024} KiB')
+
+
+if __name__ == '__main__':
+    main()
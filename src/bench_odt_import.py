@@ -0,0 +1,73 @@
+"""Benchmark for the import of untagged ODT documents.
+
+Generate a work in progress and an outline, each with one long section,
+and measure the time needed for reading them.
+
+usage: python bench_odt_import.py [number of paragraphs]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import tempfile
+import zipfile
+from timeit import default_timer as timer
+from pywriter.model.novel import Novel
+from pywriter.odt_r.odt_r_import import OdtRImport
+from pywriter.odt_r.odt_r_outline import OdtROutline
+
+STYLES_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-styles xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0">
+ <office:styles/>
+</office:document-styles>
+'''
+
+CONTENT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">
+ <office:body>
+  <office:text>
+   <text:h text:style-name="Heading_20_2" text:outline-level="2">Chapter</text:h>
+   %s
+   %s
+  </office:text>
+ </office:body>
+</office:document-content>
+'''
+
+PARAGRAPH = '<text:p>Lorem ipsum dolor sit amet, <text:span text:style-name="Emphasis">consectetur</text:span> adipiscing elit.</text:p>'
+
+
+def write_odt(filePath, heading, paragraphs):
+    """Write an ODT document with a chapter heading, an optional heading, and paragraphs."""
+    with zipfile.ZipFile(filePath, 'w', zipfile.ZIP_DEFLATED) as odfFile:
+        odfFile.writestr('styles.xml', STYLES_XML)
+        odfFile.writestr('content.xml', CONTENT_XML % (heading, PARAGRAPH * paragraphs))
+
+
+def read_odt(fileClass, filePath):
+    """Read the document and print the time spent."""
+    odtFile = fileClass(filePath)
+    odtFile.novel = Novel()
+    start = timer()
+    odtFile.read()
+    print(f'{fileClass.__name__}: {timer() - start:.2f} s')
+    return odtFile.novel
+
+
+def main(paragraphs=5000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        print(f'{paragraphs} paragraphs')
+        filePath = f'{tempDir}/bench_import.odt'
+        write_odt(filePath, '', paragraphs)
+        read_odt(OdtRImport, filePath)
+        filePath = f'{tempDir}/bench_outline.odt'
+        write_odt(filePath, '<text:h text:style-name="Heading_20_3" text:outline-level="3">Scene</text:h>', paragraphs)
+        read_odt(OdtROutline, filePath)
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
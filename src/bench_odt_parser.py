@@ -0,0 +1,60 @@
+"""Benchmark for the ODT parser.
+
+Export a generated novel as manuscript, and measure how fast
+the parser processes the document's content.xml, and the peak memory used.
+
+usage: python bench_odt_parser.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+import tempfile
+import tracemalloc
+import zipfile
+from timeit import default_timer as timer
+from pywriter.odt_r.odt_parser import OdtParser
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from pywriter.test.synthetic_novel import create_novel
+
+
+class NullClient:
+    """Client discarding the parser's calls."""
+
+    def handle_starttag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        pass
+
+    def handle_data(self, data):
+        pass
+
+    def handle_comment(self, data):
+        pass
+
+
+def main(scenes=5000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/bench_manuscript.odt'
+        odtFile = OdtWManuscript(filePath)
+        odtFile.novel = create_novel(scenes)
+        odtFile.write()
+        with zipfile.ZipFile(filePath) as odfFile:
+            contentSize = odfFile.getinfo('content.xml').file_size
+        print(f'{scenes} scenes, content.xml: {contentSize / 1e6:.1f} MB')
+        tracemalloc.start()
+        start = timer()
+        OdtParser(NullClient()).feed_file(filePath)
+        parseTime = timer() - start
+        __, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'Parsing: {parseTime:.2f} s, {contentSize / 1e6 / parseTime:.1f} MB/s, {peak / 1e6:.1f} MB peak')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
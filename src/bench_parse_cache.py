@@ -0,0 +1,49 @@
+"""Benchmark for the parse cache of the yWriter 7 project file.
+
+Compare reading a project file with restoring it from the parse cache.
+
+usage: python bench_parse_cache.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import sys
+import tempfile
+from timeit import default_timer as timer
+from pywriter.model.novel import Novel
+from pywriter.yw.parse_cache import ParseCache
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+
+
+def read_project(filePath, cache=None):
+    """Return the seconds spent reading the project."""
+    start = timer()
+    ywFile = Yw7File(filePath, cache=cache)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return timer() - start
+
+
+def main(scenes=20000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/bench.yw7'
+        ywFile = Yw7File(filePath)
+        ywFile.novel = create_novel(scenes)
+        ywFile.write()
+        print(f'{scenes} scenes, {os.path.getsize(filePath) / 1e6:.1f} MB')
+        print(f'Reading without cache: {read_project(filePath):.2f} s')
+        cache = ParseCache(f'{tempDir}/cache')
+        print(f'Reading and caching: {read_project(filePath, cache):.2f} s')
+        print(f'Cache file: {os.path.getsize(cache.get_cache_path(filePath)) / 1e6:.1f} MB')
+        print(f'Restoring from the cache: {read_project(filePath, cache):.2f} s')
+        print(f'Cache hits: {cache.hits}, misses: {cache.misses}')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
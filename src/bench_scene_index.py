@@ -0,0 +1,70 @@
+"""Benchmark for the structural scene index.
+
+Compare walking the chapters and scenes with the scene index
+for running totals and chapter range statistics.
+
+usage: python bench_scene_index.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+from timeit import default_timer as timer
+from pywriter.test.synthetic_novel import create_novel
+
+QUERIES = 1000
+
+
+def walk_words_before(novel, scId):
+    """Return the word count of the scenes preceding scId, walking the novel structure."""
+    words = 0
+    for chId in novel.srtChapters:
+        for srtScId in novel.chapters[chId].srtScenes:
+            if srtScId == scId:
+                return words
+
+            words += novel.scenes[srtScId].wordCount
+    return words
+
+
+def main(scenes=20000):
+    novel = create_novel(scenes)
+    scIds = list(novel.scenes)
+    queries = [scIds[(i * 7919) % len(scIds)] for i in range(QUERIES)]
+    for scId in scIds:
+        # Have the word counts cached.
+        novel.scenes[scId].wordCount
+
+    start = timer()
+    walked = [walk_words_before(novel, scId) for scId in queries]
+    walkTime = timer() - start
+    print(f'Walking the structure: {walkTime / QUERIES * 1e6:.1f} µs per query')
+
+    start = timer()
+    index = novel.get_scene_index()
+    buildTime = timer() - start
+    print(f'Building the index, {scenes} scenes: {buildTime * 1000:.1f} ms')
+
+    start = timer()
+    indexed = [index.get_words_total(scId) - novel.scenes[scId].wordCount for scId in queries]
+    indexTime = timer() - start
+    print(f'Index lookup: {indexTime / QUERIES * 1e6:.1f} µs per query')
+    assert indexed == walked
+
+    start = timer()
+    for scId in queries:
+        index.update_scene(scId)
+    print(f'Index update: {(timer() - start) / QUERIES * 1e6:.1f} µs per scene')
+
+    start = timer()
+    for __ in range(QUERIES):
+        novel.get_scene_index()
+    print(f'Order check: {(timer() - start) / QUERIES * 1e6:.1f} µs per call')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
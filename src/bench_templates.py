@@ -0,0 +1,67 @@
+"""Benchmark for the template substitution of file exports.
+
+Compare the per-scene overhead of instantiating a string.Template 
+for each scene with the cached compiled templates, using a synthetic project.
+
+usage: python bench_templates.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import sys
+from string import Template
+from time import perf_counter
+from pywriter.odt_w.odt_w_manuscript import OdtWManuscript
+from pywriter.test.synthetic_novel import create_novel
+
+
+class UncachedManuscript(OdtWManuscript):
+    """Manuscript export creating a new template on each call, as formerly done."""
+
+    def _get_template(self, templateName):
+        return Template(getattr(self, templateName))
+
+
+def substitute_scenes(exportFile, mappings):
+    """Return the time needed for the scene template substitution only."""
+    start = perf_counter()
+    for sceneMapping in mappings:
+        exportFile._get_template('_sceneTemplate').safe_substitute(sceneMapping)
+    return perf_counter() - start
+
+
+def generate_document(exportFile):
+    """Return the time needed for generating the whole document."""
+    start = perf_counter()
+    for __ in exportFile._get_fragments():
+        pass
+    return perf_counter() - start
+
+
+def main(scenes=5000):
+    novel = create_novel(scenes)
+    novel.check_locale()
+    novel.get_languages()
+    results = {}
+    for exportClass in (UncachedManuscript, OdtWManuscript):
+        exportFile = exportClass(f'bench{exportClass.SUFFIX}{exportClass.EXTENSION}')
+        exportFile.novel = novel
+        mappings = []
+        for scId in novel.scenes:
+            mappings.append(exportFile._get_sceneMapping(scId, 0, 0, 0))
+        results[exportClass.__name__] = (
+            substitute_scenes(exportFile, mappings),
+            generate_document(exportFile),
+            )
+    for name in results:
+        substitution, document = results[name]
+        print(f'{name:19} substitution: {substitution / scenes * 1e6:6.2f} µs/scene, '
+              f'document: {document / scenes * 1e6:7.2f} µs/scene')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
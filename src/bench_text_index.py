@@ -0,0 +1,65 @@
+"""Benchmark for the full-text index of the scenes.
+
+Compare regular expression searches over all scenes with index queries.
+
+usage: python bench_text_index.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import sys
+from timeit import default_timer as timer
+from pywriter.model.text_index import TextIndex
+from pywriter.test.synthetic_novel import create_novel
+
+QUERIES = 20
+
+
+def scan(novel, pattern):
+    """Return the IDs of the scenes whose content matches a regular expression."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    return [scId for scId in novel.scenes if regex.search(novel.scenes[scId].sceneContent)]
+
+
+def main(scenes=13000):
+    novel = create_novel(scenes)
+    novel.scenes['1'].sceneContent = 'A rare word.'
+    words = sum(novel.scenes[scId].wordCount for scId in novel.scenes)
+    print(f'{scenes} scenes, {words} words')
+
+    start = timer()
+    for __ in range(QUERIES):
+        scan(novel, r'\brare\b')
+    print(f'Regular expression search: {(timer() - start) / QUERIES * 1000:.1f} ms per query')
+
+    start = timer()
+    index = TextIndex()
+    index.build(novel)
+    novel.get_scene_index()
+    # The scene index provides the novel's order of the search results.
+    print(f'Building the index: {timer() - start:.2f} s')
+
+    for query in (index.find_term, index.find_prefix):
+        start = timer()
+        for __ in range(QUERIES):
+            query('rare')
+        print(f'{query.__name__}: {(timer() - start) / QUERIES * 1000:.3f} ms per query')
+    start = timer()
+    for __ in range(QUERIES):
+        index.find_phrase('a rare word')
+    print(f'find_phrase: {(timer() - start) / QUERIES * 1000:.3f} ms per query')
+
+    start = timer()
+    novel.scenes['2'].sceneContent = 'Another rare word.'
+    novel.report_change(novel.scenes, '2')
+    index.update_index()
+    print(f'Updating one scene: {(timer() - start) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -0,0 +1,65 @@
+"""Benchmark for the summary read from yWriter 7 project files.
+
+Compare reading the complete project with reading the summary,
+with and without word counts and letter counts stored in the file.
+
+usage: python bench_yw7_stats.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import sys
+import tempfile
+from timeit import default_timer as timer
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.yw7_stats import Yw7Stats
+from pywriter.test.synthetic_novel import create_novel
+
+
+def read_project(filePath):
+    """Return the seconds spent reading the project and counting the words."""
+    start = timer()
+    ywFile = Yw7File(filePath)
+    ywFile.novel = Novel()
+    ywFile.read()
+    sum([scene.wordCount for scene in ywFile.novel.scenes.values()])
+    return timer() - start
+
+
+def read_stats(filePath):
+    """Return the seconds spent reading the summary and counting the words."""
+    start = timer()
+    stats = Yw7Stats(filePath)
+    stats.read()
+    stats.get_totals()
+    return timer() - start
+
+
+def main(scenes=20000):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/bench.yw7'
+        ywFile = Yw7File(filePath)
+        ywFile.novel = create_novel(scenes)
+        ywFile.write()
+        print(f'{scenes} scenes, {os.path.getsize(filePath) / 1e6:.1f} MB')
+        print(f'Complete read: {read_project(filePath):.2f} s')
+        print(f'Summary, counts not stored: {read_stats(filePath):.2f} s')
+
+        # Store counts like yWriter does.
+        with open(filePath, 'r', encoding='utf-8') as f:
+            xmlText = f.read()
+        xmlText = re.sub('</SceneContent>', '</SceneContent>\n\t\t<WordCount>100</WordCount>\n\t\t<LetterCount>500</LetterCount>', xmlText)
+        with open(filePath, 'w', encoding='utf-8') as f:
+            f.write(xmlText)
+        print(f'Summary, counts stored: {read_stats(filePath):.2f} s')
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
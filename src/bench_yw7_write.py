@@ -0,0 +1,80 @@
+"""Benchmark for writing yWriter 7 project files.
+
+Compare the former post-processing of the written xml file 
+(read back, per-line and per-tag regex substitution, write again)
+with the single-pass in-memory serialization, using a synthetic project.
+
+usage: python bench_yw7_write.py [number of scenes]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import sys
+import tempfile
+from html import unescape
+from time import perf_counter
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+
+
+def legacy_postprocess(ywFile, filePath):
+    """Post-process the xml file written by ElementTree the way it was done before."""
+    with open(filePath, 'r', encoding='utf-8') as f:
+        text = f.read()
+    lines = text.split('\n')
+    newlines = ['<?xml version="1.0" encoding="utf-8"?>']
+    for line in lines:
+        for tag in ywFile._CDATA_TAGS:
+            line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
+            line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
+        newlines.append(line)
+    text = '\n'.join(newlines)
+    text = text.replace('[CDATA[ \n', '[CDATA[')
+    text = text.replace('\n]]', ']]')
+    if not ywFile.novel.chapters:
+        text = text.replace('<CHAPTERS />', '<CHAPTERS></CHAPTERS>')
+    text = unescape(text)
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def main(scenes=10000):
+    ywFile = Yw7File('')
+    ywFile.novel = create_novel(scenes)
+    with tempfile.TemporaryDirectory() as tempDir:
+        ywFile.filePath = f'{tempDir}/legacy.yw7'
+        start = perf_counter()
+        ywFile.write()
+        print(f'Complete write(), {scenes} scenes: {perf_counter() - start:.3f} s')
+
+        ywFile.tree.write(ywFile.filePath, xml_declaration=False, encoding='utf-8')
+        start = perf_counter()
+        legacy_postprocess(ywFile, ywFile.filePath)
+        legacyTime = perf_counter() - start
+        print(f'Legacy post-processing:           {legacyTime:.3f} s')
+
+        ywFile.filePath = f'{tempDir}/single_pass.yw7'
+        start = perf_counter()
+        ywFile._write_element_tree(ywFile)
+        singlePassTime = perf_counter() - start
+        print(f'Single-pass serialization:        {singlePassTime:.3f} s')
+        print(f'Speedup: {legacyTime / singlePassTime:.1f}')
+
+        with open(f'{tempDir}/legacy.yw7', 'rb') as f:
+            legacyBytes = f.read()
+        with open(f'{tempDir}/single_pass.yw7', 'rb') as f:
+            singlePassBytes = f.read()
+        if legacyBytes == singlePassBytes:
+            print('Output is byte-identical.')
+        else:
+            print('ERROR: Output differs.')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        main(int(sys.argv[1]))
+    except IndexError:
+        main()
@@ -3,6 +3,8 @@
 Modules:
 
 export_source_factory -- Provide a factory class for any export source object.
+batch_converter -- Provide a class for the bulk conversion of directory trees.
+export_result -- Provide a class for the result of a multi-target export.
 export_target_factory -- Provide a factory class for any export target object.
 file_factory -- Provide a base class for factories that instantiate conversion objects.
 import_source_factory -- Provide a factory class for any import source object.
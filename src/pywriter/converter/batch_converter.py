@@ -0,0 +1,379 @@
+"""Provide a class for the bulk conversion of directory trees.
+
+Usage as a script:
+python -m pywriter.converter.batch_converter [-h] [-s SUFFIX] [-p PROCESSES] [--state STATE] [--summary SUMMARY] [path ...]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from pywriter.pywriter_globals import *
+from pywriter.converter.yw7_converter import Yw7Converter
+from pywriter.yw.yw7_file import Yw7File
+
+
+def _convert_project(converterClass, ywPath, importPaths, suffixes, kwargs):
+    """Convert the documents of one yWriter project one after another.
+
+    Positional arguments:
+        converterClass -- YwCnvFf subclass.
+        ywPath: str -- path to the yWriter project.
+        importPaths -- list of paths to the documents to be written back to the project.
+        suffixes -- list of target file name suffixes to be exported, or None.
+        kwargs -- keyword arguments passed to the converter.
+
+    Return a list of report entries (dict).
+    This function runs in a worker process. All documents of a project are converted
+    in the same task, so the project file is never written concurrently.
+    The project is exported after importing, so the exported documents are up to date.
+    """
+    converter = converterClass()
+    entries = []
+    for sourcePath in importPaths:
+        start = perf_counter()
+        converter.run(sourcePath, **kwargs)
+        if converter.newFile:
+            entry = _new_entry(sourcePath, 'converted', converter.ui.infoHowText)
+            entry['output'].append(converter.newFile)
+        else:
+            entry = _new_entry(sourcePath, 'failed', converter.ui.infoHowText)
+        entry['seconds'] = perf_counter() - start
+        entries.append(entry)
+    if suffixes:
+        result = converter.export_all(ywPath, suffixes, processes=1, **kwargs)
+        if result.sourceError is None and not result.errors:
+            entry = _new_entry(ywPath, 'converted', converter.ui.infoHowText)
+        else:
+            entry = _new_entry(ywPath, 'failed', converter.ui.infoHowText)
+        entry['output'].extend(result.newFiles.values())
+        entry['seconds'] = result.totalTime
+        entries.append(entry)
+    return entries
+
+
+def _new_entry(sourcePath, status, message=''):
+    """Return a report entry for a file.
+
+    Positional arguments:
+        sourcePath: str -- path to the converted file.
+        status: str -- 'converted', 'failed', 'skipped', or 'locked'.
+
+    Optional arguments:
+        message: str -- message of the converter.
+    """
+    if sourcePath.endswith('.yw7'):
+        conversion = 'export'
+    else:
+        conversion = 'import'
+    return {'source': sourcePath, 'type': conversion, 'status': status, 'output': [], 'seconds': 0.0, 'message': message}
+
+
+class BatchConverter:
+    """Converter for directory trees or lists of yWriter projects and documents.
+
+    Public methods:
+        collect(paths) -- return a list of the convertible files found.
+        run(paths) -- convert all files found that have changed, and return a summary.
+
+    Public instance variables:
+        converterClass -- YwCnvFf subclass used for the conversion of each file.
+        suffixes -- list of target file name suffixes the yWriter projects are exported to.
+        processes: int -- maximum number of worker processes.
+        statePath: str -- path to a JSON file with the state of the files converted so far, or None.
+        kwargs -- keyword arguments passed to the converter.
+
+    Documents to be written back are all files matching one of the converter's IMPORT_SOURCE_CLASSES.
+    They are grouped by their yWriter project. Each project is converted in one worker process,
+    first importing the documents, then exporting the project.
+    Projects locked by yWriter are skipped.
+    With a state file, files whose modification time, size, or content hash are unchanged
+    since the last successful conversion are skipped.
+    """
+
+    def __init__(self, converterClass=Yw7Converter, suffixes=None, processes=None, statePath=None, **kwargs):
+        """Initialize instance variables.
+
+        Optional arguments:
+            converterClass -- YwCnvFf subclass used for the conversion of each file.
+            suffixes -- list of target file name suffixes the yWriter projects are exported to.
+                        Default: no export.
+            processes: int -- maximum number of worker processes.
+                              Default: number of processors. If 1, convert in the calling process.
+            statePath: str -- path to a JSON file with the state of the files converted so far.
+                              Default: convert all files.
+            kwargs -- keyword arguments passed to the converter.
+        """
+        self.converterClass = converterClass
+        self.suffixes = suffixes
+        self.processes = processes
+        self.statePath = statePath
+        self.kwargs = kwargs
+        self._state = {}
+        # key: str -- normalized file path.
+        # value: dict with the keys 'mtime', 'size', 'sha256'.
+
+    def collect(self, paths):
+        """Return a list of the convertible files found.
+
+        Positional arguments:
+            paths -- list of directories, files, and manifests.
+
+        Directories are searched recursively.
+        A manifest is a text file with the extension ".txt", listing one path per line;
+        relative paths refer to the manifest's directory. Lines starting with "#" are ignored.
+        """
+        converter = self.converterClass()
+        return [filePath for filePath in self._list_files(paths) if self._match(converter, filePath) is not None]
+
+    def run(self, paths):
+        """Convert all files found that have changed, and return a summary.
+
+        Positional arguments:
+            paths -- list of directories, files, and manifests.
+
+        The summary is a dictionary that can be serialized as JSON.
+        """
+        start = perf_counter()
+        self._read_state()
+        converter = self.converterClass()
+        entries = []
+        projects = {}
+        # key: str -- path to the yWriter project.
+        # value: list of paths to the changed documents to be imported.
+        exports = set()
+        # Paths to the changed yWriter projects.
+        unchanged = set()
+        # Paths to the unchanged yWriter projects.
+        inputBytes = 0
+        for filePath in self._list_files(paths):
+            ywPath = self._match(converter, filePath)
+            if ywPath is None:
+                continue
+
+            if not ywPath:
+                entries.append(_new_entry(filePath, 'failed', f'!{_("No yWriter project to write")}.'))
+                continue
+
+            if ywPath == filePath and not self.suffixes:
+                continue
+
+            projects.setdefault(ywPath, [])
+            if not self._has_changed(filePath):
+                if ywPath == filePath:
+                    unchanged.add(ywPath)
+                    # An unchanged project is reported as skipped only if no document is written back to it.
+                else:
+                    entries.append(_new_entry(filePath, 'skipped'))
+                continue
+
+            inputBytes += os.path.getsize(filePath)
+            if ywPath == filePath:
+                exports.add(ywPath)
+            else:
+                projects[ywPath].append(filePath)
+        tasks = []
+        for ywPath, importPaths in projects.items():
+            if self.suffixes and (importPaths or ywPath in exports):
+                sourcePaths = importPaths + [ywPath]
+                suffixes = self.suffixes
+            else:
+                sourcePaths = importPaths
+                suffixes = None
+                if ywPath in unchanged:
+                    entries.append(_new_entry(ywPath, 'skipped'))
+            if not sourcePaths:
+                continue
+
+            if Yw7File(ywPath).is_locked():
+                for sourcePath in sourcePaths:
+                    entries.append(_new_entry(sourcePath, 'locked', f'!{_("yWriter seems to be open. Please close first")}.'))
+                continue
+
+            tasks.append((sourcePaths, (self.converterClass, ywPath, importPaths, suffixes, self.kwargs)))
+        if self.processes == 1 or len(tasks) < 2:
+            for __, task in tasks:
+                self._register(entries, _convert_project(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes) as executor:
+                futures = [(sourcePaths, executor.submit(_convert_project, *task)) for sourcePaths, task in tasks]
+                for sourcePaths, future in futures:
+                    try:
+                        self._register(entries, future.result())
+                    except Exception as ex:
+                        # The worker process has been terminated.
+                        for sourcePath in sourcePaths:
+                            entries.append(_new_entry(sourcePath, 'failed', f'!{str(ex)}'))
+        self._write_state()
+        elapsed = perf_counter() - start
+        counts = {}
+        for status in ('converted', 'failed', 'skipped', 'locked'):
+            counts[status] = len([entry for entry in entries if entry['status'] == status])
+        return {
+            'files': entries,
+            'counts': counts,
+            'seconds': elapsed,
+            'filesPerSecond': counts['converted'] / elapsed if elapsed else 0.0,
+            'megabytesPerSecond': inputBytes / 1e6 / elapsed if elapsed else 0.0,
+            }
+
+    def _list_files(self, paths):
+        """Return a list of normalized paths to the files given by directories, files, and manifests."""
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                for dirPath, __, fileNames in os.walk(path):
+                    for fileName in sorted(fileNames):
+                        files.append(os.path.join(dirPath, fileName))
+            elif path.endswith('.txt'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifestDir = os.path.dirname(path)
+                    for line in f:
+                        line = line.strip()
+                        if line and not line.startswith('#'):
+                            files.append(os.path.join(manifestDir, line))
+            else:
+                files.append(path)
+        files = [os.path.normpath(filePath) for filePath in files if not os.path.basename(filePath).startswith('~')]
+        # Skip the lock files of the office application.
+        return files
+
+    def _match(self, converter, filePath):
+        """Return the path to the yWriter project a file belongs to.
+
+        Positional arguments:
+            converter -- YwCnvFf subclass instance.
+            filePath: str -- path to the file to check.
+
+        Return None if the file cannot be converted, and an empty string
+        if it is a document without a project to be written back to.
+        """
+        try:
+            converter.exportSourceFactory.make_file_objects(filePath, **self.kwargs)
+        except Error:
+            pass
+        else:
+            return filePath
+
+        try:
+            source, __ = converter.importSourceFactory.make_file_objects(filePath, **self.kwargs)
+        except Error:
+            return None
+
+        kwargs = dict(self.kwargs)
+        kwargs['suffix'] = source.SUFFIX
+        try:
+            __, target = converter.importTargetFactory.make_file_objects(filePath, **kwargs)
+        except Error:
+            return ''
+
+        return os.path.normpath(target.filePath)
+
+    def _register(self, entries, newEntries):
+        """Add the entries of a converted project to the report, and save the state of the files.
+
+        Positional arguments:
+            entries -- list of report entries.
+            newEntries -- list of report entries returned by a worker.
+        """
+        entries.extend(newEntries)
+        if self.statePath is None:
+            return
+
+        for entry in newEntries:
+            if entry['status'] != 'converted':
+                continue
+
+            filePaths = [entry['source']]
+            if entry['type'] == 'export' or not self.suffixes:
+                filePaths.extend(entry['output'])
+                # The exported documents count as converted, so they are not written back in the next run.
+                # A project written by an import counts as converted only after its export, if requested.
+            for filePath in filePaths:
+                self._state[os.path.normpath(filePath)] = self._get_file_state(filePath)
+
+    def _has_changed(self, filePath):
+        """Return True if the file has changed since its last conversion.
+
+        Positional arguments:
+            filePath: str -- path to the file to check.
+
+        The content hash is only calculated if modification time or size have changed.
+        """
+        if self.statePath is None:
+            return True
+
+        oldState = self._state.get(filePath)
+        if oldState is None:
+            return True
+
+        stat = os.stat(filePath)
+        if stat.st_mtime == oldState['mtime'] and stat.st_size == oldState['size']:
+            return False
+
+        if stat.st_size == oldState['size'] and self._get_hash(filePath) == oldState['sha256']:
+            oldState['mtime'] = stat.st_mtime
+            return False
+
+        return True
+
+    def _get_file_state(self, filePath):
+        """Return a dictionary with modification time, size, and content hash of a file."""
+        stat = os.stat(filePath)
+        return {'mtime': stat.st_mtime, 'size': stat.st_size, 'sha256': self._get_hash(filePath)}
+
+    def _get_hash(self, filePath):
+        """Return the SHA-256 hex digest of a file's content."""
+        sha = hashlib.sha256()
+        with open(filePath, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _read_state(self):
+        """Read the state file, if any."""
+        self._state = {}
+        if self.statePath and os.path.isfile(self.statePath):
+            try:
+                with open(self.statePath, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                # The state file is damaged, so all files are converted.
+                self._state = {}
+
+    def _write_state(self):
+        """Write the state file, if any."""
+        if self.statePath:
+            with open(self.statePath, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, indent=2, sort_keys=True)
+
+
+def main():
+    """Convert the files given on the command line, and print a JSON summary."""
+    parser = argparse.ArgumentParser(description='Bulk conversion of yWriter projects and documents.')
+    parser.add_argument('paths', nargs='*', help='directories, files, or manifests (.txt) to convert')
+    parser.add_argument('-s', '--suffix', action='append', dest='suffixes',
+                        help='export the yWriter projects to the target with this suffix; can be repeated')
+    parser.add_argument('-p', '--processes', type=int, default=None, help='maximum number of worker processes')
+    parser.add_argument('--state', default=None, help='JSON file for skipping files unchanged since the last run')
+    parser.add_argument('--summary', default=None, help='write the JSON summary to this file instead of stdout')
+    args = parser.parse_args()
+    batchConverter = BatchConverter(suffixes=args.suffixes, processes=args.processes, statePath=args.state)
+    summary = batchConverter.run(args.paths)
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+    if summary['counts']['failed']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
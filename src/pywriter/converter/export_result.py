@@ -0,0 +1,80 @@
+"""Provide a class for the result of a multi-target export.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.pywriter_globals import *
+
+
+class ExportResult:
+    """Result of the export of one yWriter project to several targets.
+
+    Public methods:
+        add_success(suffix, filePath, elapsed) -- register a written target file.
+        add_error(suffix, message, elapsed) -- register a failed target.
+        get_message() -- return a summary for the user interface.
+
+    Public instance variables:
+        sourcePath: str -- path to the yWriter project.
+        sourceError: str -- error message, if the project could not be read; otherwise None.
+        readTime: float -- seconds spent reading the project.
+        totalTime: float -- seconds spent on the whole export.
+        newFiles -- dict: key: target suffix, value: path to the written file.
+        errors -- dict: key: target suffix, value: error message.
+        timings -- dict: key: target suffix, value: seconds spent writing the target.
+    """
+
+    def __init__(self, sourcePath):
+        """Initialize instance variables.
+
+        Positional arguments:
+            sourcePath: str -- path to the yWriter project.
+        """
+        self.sourcePath = sourcePath
+        self.sourceError = None
+        self.readTime = 0.0
+        self.totalTime = 0.0
+        self.newFiles = {}
+        self.errors = {}
+        self.timings = {}
+
+    def add_success(self, suffix, filePath, elapsed):
+        """Register a written target file.
+
+        Positional arguments:
+            suffix: str -- target file name suffix.
+            filePath: str -- path to the written file.
+            elapsed: float -- seconds spent writing the file.
+        """
+        self.newFiles[suffix] = filePath
+        self.timings[suffix] = elapsed
+
+    def add_error(self, suffix, message, elapsed=0.0):
+        """Register a failed target.
+
+        Positional arguments:
+            suffix: str -- target file name suffix.
+            message: str -- error message.
+
+        Optional arguments:
+            elapsed: float -- seconds spent before the error occurred.
+        """
+        self.errors[suffix] = message
+        self.timings[suffix] = elapsed
+
+    def get_message(self):
+        """Return a summary for the user interface.
+
+        The message starts with the error marker, if any export failed.
+        """
+        if self.sourceError is not None:
+            return f'!{self.sourceError}'
+
+        lines = [f'{_("File written")}: "{norm_path(filePath)}".' for filePath in self.newFiles.values()]
+        for suffix, message in self.errors.items():
+            lines.append(f'{suffix}: {message}')
+        message = '\n'.join(lines)
+        if self.errors:
+            message = f'!{message}'
+        return message
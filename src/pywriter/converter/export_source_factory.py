@@ -23,7 +23,7 @@ class ExportSourceFactory(FileFactory):
             sourcePath: str -- path to the source file to convert.
 
         Return a tuple with two elements:
-        - sourceFile: a YwFile subclass instance
+        - sourceFile: a YwFile subclass instance, opened read-only
         - targetFile: None
 
         Raise the "Error" exception in case of error. 
@@ -32,6 +32,8 @@ class ExportSourceFactory(FileFactory):
         for fileClass in self._fileClasses:
             if fileClass.EXTENSION == fileExtension:
                 sourceFile = fileClass(sourcePath, **kwargs)
+                sourceFile.readOnly = True
+                # The project is only read for exporting, so no xml tree needs to be kept.
                 return sourceFile, None
 
         raise Error(f'{_("File type is not supported")}: "{norm_path(sourcePath)}".')
@@ -5,19 +5,45 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
 from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
 from pywriter.converter.yw_cnv_ui import YwCnvUi
+from pywriter.converter.export_result import ExportResult
 from pywriter.converter.export_source_factory import ExportSourceFactory
 from pywriter.converter.export_target_factory import ExportTargetFactory
 from pywriter.converter.import_source_factory import ImportSourceFactory
 from pywriter.converter.import_target_factory import ImportTargetFactory
 
 
+def _write_target(target, snapshot):
+    """Write a target file from a pickled Novel snapshot.
+    
+    Positional arguments:
+        target -- FileExport subclass instance.
+        snapshot: bytes -- the pickled Novel instance.
+    
+    Return a tuple: (error message or None, elapsed seconds).
+    This function runs in a worker process, so exceptions are returned as messages.
+    """
+    start = perf_counter()
+    try:
+        target.novel = pickle.loads(snapshot)
+        target.write()
+    except Exception as ex:
+        return str(ex), perf_counter() - start
+
+    return None, perf_counter() - start
+
+
 class YwCnvFf(YwCnvUi):
     """Class for Novel file conversion using factory methods to create target and source classes.
 
     Public methods:
         run(sourcePath, **kwargs) -- create source and target objects and run conversion.
+        export_all(sourcePath, suffixes, processes, **kwargs) -- read a yWriter project once and export it to several targets.
 
     Class constants:
         EXPORT_SOURCE_CLASSES -- list of YwFile subclasses from which can be exported.
@@ -98,3 +124,89 @@ class YwCnvFf(YwCnvUi):
                 self.ui.set_info_how(f'!{str(ex)}')
             else:
                 self.export_from_yw(source, target)
+
+    def export_all(self, sourcePath, suffixes=None, processes=None, **kwargs):
+        """Read a yWriter project once and export it to several targets.
+
+        Positional arguments: 
+            sourcePath: str -- the source file path.
+        
+        Optional arguments:
+            suffixes -- list of target file name suffixes. Default: all export targets.
+            processes: int -- maximum number of worker processes. 
+                              Default: number of processors. If 1, write the targets one after another.
+        
+        Return an ExportResult instance with the per-target file paths, timings, and error messages.
+        
+        The source is read and parsed only once. The targets are written concurrently 
+        in a process pool, each from its own unpickled snapshot of the Novel instance,
+        so a target cannot affect the others. 
+        On platforms without "fork", the calling script must be protected with 
+        if __name__ == '__main__':
+        """
+        start = perf_counter()
+        result = ExportResult(sourcePath)
+        self.newFile = None
+        if suffixes is None:
+            suffixes = [fileClass.SUFFIX for fileClass in self.EXPORT_TARGET_CLASSES]
+        try:
+            if not os.path.isfile(sourcePath):
+                raise Error(f'{_("File not found")}: "{norm_path(sourcePath)}".')
+
+            source, __ = self.exportSourceFactory.make_file_objects(sourcePath, **kwargs)
+        except Error as ex:
+            result.sourceError = str(ex)
+            self.ui.set_info_how(result.get_message())
+            return result
+
+        self.ui.set_info_what(_('Input: {0} "{1}"\nOutput: {2}').format(source.DESCRIPTION, norm_path(sourcePath), ', '.join(suffixes)))
+        targets = {}
+        for suffix in suffixes:
+            kwargs['suffix'] = suffix
+            try:
+                __, target = self.exportTargetFactory.make_file_objects(sourcePath, **kwargs)
+                self.check(source, target)
+            except Error as ex:
+                result.add_error(suffix, str(ex))
+            else:
+                targets[suffix] = target
+        try:
+            source.novel = Novel()
+            source.read()
+            snapshot = pickle.dumps(source.novel)
+        except Exception as ex:
+            result.sourceError = str(ex)
+        else:
+            result.readTime = perf_counter() - start
+            if processes == 1 or len(targets) < 2:
+                for suffix, target in targets.items():
+                    self._register(result, suffix, target, _write_target(target, snapshot))
+            else:
+                with ProcessPoolExecutor(max_workers=processes) as executor:
+                    futures = {}
+                    for suffix, target in targets.items():
+                        futures[suffix] = executor.submit(_write_target, target, snapshot)
+                    for suffix, future in futures.items():
+                        try:
+                            self._register(result, suffix, targets[suffix], future.result())
+                        except Exception as ex:
+                            # The worker process has been terminated, or the target is not picklable.
+                            result.add_error(suffix, str(ex))
+        result.totalTime = perf_counter() - start
+        self.ui.set_info_how(result.get_message())
+        return result
+
+    def _register(self, result, suffix, target, outcome):
+        """Add the outcome of a target export to the result.
+        
+        Positional arguments:
+            result -- ExportResult instance.
+            suffix: str -- target file name suffix.
+            target -- FileExport subclass instance.
+            outcome -- tuple: (error message or None, elapsed seconds).
+        """
+        message, elapsed = outcome
+        if message is None:
+            result.add_success(suffix, target.filePath, elapsed)
+        else:
+            result.add_error(suffix, message, elapsed)
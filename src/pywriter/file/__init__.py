@@ -9,9 +9,11 @@ https://github.com/peter88213/PyWriter/tree/main/src/pywriter/file#readme
 
 Modules:
 
+compiled_template -- Provide a template class with precompiled placeholder positions.
 doc_open -- Helper module for opening documents.
 file_export.py -- Provide a generic class for template-based file export.
 file -- Provide an abstract class for file representation.
+markup_translator -- Provide a class for single-pass markup translation.
 filter.py -- Provide a generic filter class for template-based file export.
 
 Copyright (c) 2023 Peter Triesberger
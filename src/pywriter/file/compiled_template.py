@@ -0,0 +1,73 @@
+"""Provide a template class with precompiled placeholder positions.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from collections import ChainMap
+from string import Template
+
+
+class CompiledTemplate(Template):
+    """String template that is parsed only once.
+    
+    Public methods:
+        safe_substitute(mapping) -- return the template with the placeholders substituted.
+
+    Public instance variables:
+        placeholders -- frozenset of the placeholder names used in the template.
+
+    The template string is split into literal text and placeholders 
+    on instantiation, so substitution needs no regular expression matching.
+    The result is the same as with string.Template.
+    """
+
+    def __init__(self, template):
+        """Split the template string into literal text and placeholders.
+        
+        Positional arguments:
+            template: str -- template string with $-placeholders.
+        
+        Extends the superclass constructor.
+        """
+        super().__init__(template)
+        self._chunks = []
+        # list of tuples: (literal text, placeholder name or None, placeholder text)
+        literal = []
+        position = 0
+        for match in self.pattern.finditer(template):
+            literal.append(template[position:match.start()])
+            position = match.end()
+            name = match.group('named') or match.group('braced')
+            if name is not None:
+                self._chunks.append((''.join(literal), name, match.group()))
+                literal = []
+            elif match.group('escaped') is not None:
+                literal.append(self.delimiter)
+            else:
+                literal.append(match.group())
+        literal.append(template[position:])
+        self._chunks.append((''.join(literal), None, None))
+        self.placeholders = frozenset(chunk[1] for chunk in self._chunks if chunk[1] is not None)
+
+    def safe_substitute(self, mapping={}, **kwargs):
+        """Return the template with the placeholders substituted.
+        
+        Optional arguments:
+            mapping -- dictionary with the placeholder names as keys.
+            kwargs -- placeholder names and values, taking precedence over mapping.
+        
+        Leave placeholders with no value unchanged.
+        Overrides the superclass method.
+        """
+        if kwargs:
+            mapping = ChainMap(kwargs, mapping)
+        text = []
+        for literal, name, placeholder in self._chunks:
+            text.append(literal)
+            if name is not None:
+                try:
+                    text.append(str(mapping[name]))
+                except KeyError:
+                    text.append(placeholder)
+        return ''.join(text)
@@ -8,11 +8,11 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import re
-from string import Template
 from pywriter.pywriter_globals import *
 from pywriter.model.character import Character
 from pywriter.model.scene import Scene
 from pywriter.file.file import File
+from pywriter.file.compiled_template import CompiledTemplate
 from pywriter.file.filter import Filter
 
 
@@ -58,6 +58,22 @@ class FileExport(File):
 
     _DIVIDER = ', '
 
+    _SCENE_TEMPLATES = (
+        '_sceneTemplate',
+        '_firstSceneTemplate',
+        '_appendedSceneTemplate',
+        '_notesSceneTemplate',
+        '_todoSceneTemplate',
+        '_unusedSceneTemplate',
+        '_notExportedSceneTemplate',
+        )
+    # Names of the templates the scene mapping is applied to.
+    # The scene content is converted only if one of them has a $SceneContent placeholder.
+
+    _TEMPLATE_CACHE = {}
+    # Compiled templates, shared by all instances.
+    # Key: (class, template attribute name), value: (template string, CompiledTemplate instance).
+
     def __init__(self, filePath, **kwargs):
         """Initialize filter strategy class instances.
         
@@ -79,11 +95,13 @@ class FileExport(File):
     def write(self):
         """Write instance variables to the export file.
         
-        Create a template-based output file. 
+        Create a template-based output file, writing the text fragments as they are generated. 
         Return a message in case of success.
         Raise the "Error" exception in case of error. 
+        Errors raised while generating the text are passed on unchanged.
+        In any case of error, the previous file is restored, or the incomplete file is removed.
         """
-        text = self._get_text()
+        fragments = self._get_output()
         backedUp = False
         if os.path.isfile(self.filePath):
             try:
@@ -94,11 +112,29 @@ class FileExport(File):
                 backedUp = True
         try:
             with open(self.filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
+                for fragment in fragments:
+                    f.write(fragment)
+        except OSError:
+            self._discard_output(backedUp)
+            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+
         except:
+            self._discard_output(backedUp)
+            raise
+
+    def _discard_output(self, backedUp):
+        """Remove an incompletely written output file.
+
+        Positional arguments:
+            backedUp: bool -- if True, restore the previous file from the backup.
+        """
+        try:
             if backedUp:
                 os.replace(f'{self.filePath}.bak', self.filePath)
-            raise Error(f'{_("Cannot write file")}: "{norm_path(self.filePath)}".')
+            elif os.path.isfile(self.filePath):
+                os.remove(self.filePath)
+        except OSError:
+            pass
 
     def _get_fileHeaderMapping(self):
         """Return a mapping dictionary for the project section.
@@ -165,10 +201,9 @@ class FileExport(File):
         substituting placeholders according to the chapter mapping dictionary.
         For each chapter call the processing of its included scenes.
         Skip chapters not accepted by the chapter filter.
-        Return a list of strings.
+        Generate strings.
         This is a template method that can be extended or overridden by subclasses.
         """
-        lines = []
         chapterNumber = 0
         sceneNumber = 0
         wordsTotal = 0
@@ -196,57 +231,61 @@ class FileExport(File):
                 if self.novel.chapters[chId].chLevel == 1:
                     # Chapter is "Todo Part" type.
                     if self._todoPartTemplate:
-                        template = Template(self._todoPartTemplate)
+                        template = self._get_template('_todoPartTemplate')
                 elif self._todoChapterTemplate:
-                    template = Template(self._todoChapterTemplate)
+                    template = self._get_template('_todoChapterTemplate')
             elif self.novel.chapters[chId].chType == 1:
                 # Chapter is "Notes" type.
                 if self.novel.chapters[chId].chLevel == 1:
                     # Chapter is "Notes Part" type.
                     if self._notesPartTemplate:
-                        template = Template(self._notesPartTemplate)
+                        template = self._get_template('_notesPartTemplate')
                 elif self._notesChapterTemplate:
-                    template = Template(self._notesChapterTemplate)
+                    template = self._get_template('_notesChapterTemplate')
             elif self.novel.chapters[chId].chType == 3:
                 # Chapter is "unused" type.
                 if self._unusedChapterTemplate:
-                    template = Template(self._unusedChapterTemplate)
+                    template = self._get_template('_unusedChapterTemplate')
             elif doNotExport:
                 if self._notExportedChapterTemplate:
-                    template = Template(self._notExportedChapterTemplate)
+                    template = self._get_template('_notExportedChapterTemplate')
             elif self.novel.chapters[chId].chLevel == 1 and self._partTemplate:
-                template = Template(self._partTemplate)
+                template = self._get_template('_partTemplate')
             else:
-                template = Template(self._chapterTemplate)
+                template = self._get_template('_chapterTemplate')
                 chapterNumber += 1
                 dispNumber = chapterNumber
             if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
+                yield template.safe_substitute(self._get_chapterMapping(chId, dispNumber))
 
             #--- Process scenes.
-            sceneLines, sceneNumber, wordsTotal, lettersTotal = self._get_scenes(
-                chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
-            lines.extend(sceneLines)
+            if type(self)._get_scenes is FileExport._get_scenes:
+                sceneNumber, wordsTotal, lettersTotal = yield from self._get_sceneFragments(
+                    chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
+            else:
+                # A subclass overrides the list-based scene processing.
+                sceneLines, sceneNumber, wordsTotal, lettersTotal = self._get_scenes(
+                    chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
+                yield from sceneLines
 
             #--- Process chapter ending.
             template = None
             if self.novel.chapters[chId].chType == 2:
                 if self._todoChapterEndTemplate:
-                    template = Template(self._todoChapterEndTemplate)
+                    template = self._get_template('_todoChapterEndTemplate')
             elif self.novel.chapters[chId].chType == 1:
                 if self._notesChapterEndTemplate:
-                    template = Template(self._notesChapterEndTemplate)
+                    template = self._get_template('_notesChapterEndTemplate')
             elif self.novel.chapters[chId].chType == 3:
                 if self._unusedChapterEndTemplate:
-                    template = Template(self._unusedChapterEndTemplate)
+                    template = self._get_template('_unusedChapterEndTemplate')
             elif doNotExport:
                 if self._notExportedChapterEndTemplate:
-                    template = Template(self._notExportedChapterEndTemplate)
+                    template = self._get_template('_notExportedChapterEndTemplate')
             elif self._chapterEndTemplate:
-                template = Template(self._chapterEndTemplate)
+                template = self._get_template('_chapterEndTemplate')
             if template is not None:
-                lines.append(template.safe_substitute(self._get_chapterMapping(chId, dispNumber)))
-        return lines
+                yield template.safe_substitute(self._get_chapterMapping(chId, dispNumber))
 
     def _get_characterMapping(self, crId):
         """Return a mapping dictionary for a character section.
@@ -295,7 +334,7 @@ class FileExport(File):
             lines = [self._characterSectionHeading]
         else:
             lines = []
-        template = Template(self._characterTemplate)
+        template = self._get_template('_characterTemplate')
         for crId in self.novel.srtCharacters:
             if self._characterFilter.accept(self, crId):
                 lines.append(template.safe_substitute(self._get_characterMapping(crId)))
@@ -311,7 +350,7 @@ class FileExport(File):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._fileHeader)
+        template = self._get_template('_fileHeader')
         lines.append(template.safe_substitute(self._get_fileHeaderMapping()))
         return lines
 
@@ -353,7 +392,7 @@ class FileExport(File):
             lines = [self._itemSectionHeading]
         else:
             lines = []
-        template = Template(self._itemTemplate)
+        template = self._get_template('_itemTemplate')
         for itId in self.novel.srtItems:
             if self._itemFilter.accept(self, itId):
                 lines.append(template.safe_substitute(self._get_itemMapping(itId)))
@@ -397,7 +436,7 @@ class FileExport(File):
             lines = [self._locationSectionHeading]
         else:
             lines = []
-        template = Template(self._locationTemplate)
+        template = self._get_template('_locationTemplate')
         for lcId in self.novel.srtLocations:
             if self._locationFilter.accept(self, lcId):
                 lines.append(template.safe_substitute(self._get_locationMapping(lcId)))
@@ -502,6 +541,12 @@ class FileExport(File):
             minutes = ''
         duration = f'{days}{hours}{minutes}'
 
+        #--- Scene content; don't load and convert it, if no template shows it.
+        if self._uses_placeholder('SceneContent', self._SCENE_TEMPLATES):
+            sceneContent = self._convert_from_yw(self.novel.scenes[scId].sceneContent)
+        else:
+            sceneContent = ''
+
         sceneMapping = dict(
             ID=scId,
             SceneNumber=sceneNumber,
@@ -512,7 +557,7 @@ class FileExport(File):
             LetterCount=str(self.novel.scenes[scId].letterCount),
             LettersTotal=lettersTotal,
             Status=Scene.STATUS[self.novel.scenes[scId].status],
-            SceneContent=self._convert_from_yw(self.novel.scenes[scId].sceneContent),
+            SceneContent=sceneContent,
             FieldTitle1=self._convert_from_yw(self.novel.fieldTitle1, True),
             FieldTitle2=self._convert_from_yw(self.novel.fieldTitle2, True),
             FieldTitle3=self._convert_from_yw(self.novel.fieldTitle3, True),
@@ -550,6 +595,35 @@ class FileExport(File):
     def _get_scenes(self, chId, sceneNumber, wordsTotal, lettersTotal, doNotExport):
         """Process the scenes.
         
+        Positional arguments:
+            chId: str -- chapter ID.
+            sceneNumber: int -- number of previously processed scenes.
+            wordsTotal: int -- accumulated wordcount of the previous scenes.
+            lettersTotal: int -- accumulated lettercount of the previous scenes.
+            doNotExport: bool -- scene belongs to a chapter that is not to be exported.
+        
+        Return a tuple:
+            lines: list of strings generated by _get_sceneFragments().
+            sceneNumber: int -- number of all processed scenes.
+            wordsTotal: int -- accumulated wordcount of all processed scenes.
+            lettersTotal: int -- accumulated lettercount of all processed scenes.
+        
+        This is a template method that can be extended or overridden by subclasses.
+        If it is, _get_chapters() collects the scenes of a chapter with this method. 
+        Otherwise, the scenes are generated one by one with _get_sceneFragments().
+        """
+        lines = []
+        fragments = self._get_sceneFragments(chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
+        while True:
+            try:
+                lines.append(next(fragments))
+            except StopIteration as exhausted:
+                sceneNumber, wordsTotal, lettersTotal = exhausted.value
+                return lines, sceneNumber, wordsTotal, lettersTotal
+
+    def _get_sceneFragments(self, chId, sceneNumber, wordsTotal, lettersTotal, doNotExport):
+        """Process the scenes.
+        
         Positional arguments:
             chId: str -- chapter ID.
             sceneNumber: int -- number of previously processed scenes.
@@ -560,57 +634,50 @@ class FileExport(File):
         Iterate through a sorted scene list and apply the templates, 
         substituting placeholders according to the scene mapping dictionary.
         Skip scenes not accepted by the scene filter.
+        Generate strings.
         
-        Return a tuple:
-            lines: list of strings -- the lines of the processed scene.
+        Return a tuple when exhausted (to be retrieved with "yield from"):
             sceneNumber: int -- number of all processed scenes.
             wordsTotal: int -- accumulated wordcount of all processed scenes.
             lettersTotal: int -- accumulated lettercount of all processed scenes.
         
         This is a template method that can be extended or overridden by subclasses.
         """
-        lines = []
         firstSceneInChapter = True
         for scId in self.novel.chapters[chId].srtScenes:
             dispNumber = 0
             if not self._sceneFilter.accept(self, scId):
                 continue
 
-            sceneContent = self.novel.scenes[scId].sceneContent
-            if sceneContent is None:
-                sceneContent = ''
-
             # The order counts; be aware that "Todo" and "Notes" scenes are
             # always unused.
             if self.novel.scenes[scId].scType == 2:
                 if self._todoSceneTemplate:
-                    template = Template(self._todoSceneTemplate)
+                    template = self._get_template('_todoSceneTemplate')
                 else:
                     continue
 
             elif self.novel.scenes[scId].scType == 1:
                 # Scene is "Notes" type.
                 if self._notesSceneTemplate:
-                    template = Template(self._notesSceneTemplate)
+                    template = self._get_template('_notesSceneTemplate')
                 else:
                     continue
 
             elif self.novel.scenes[scId].scType == 3 or self.novel.chapters[chId].chType == 3:
                 if self._unusedSceneTemplate:
-                    template = Template(self._unusedSceneTemplate)
+                    template = self._get_template('_unusedSceneTemplate')
                 else:
                     continue
 
             elif self.novel.scenes[scId].doNotExport or doNotExport:
                 if self._notExportedSceneTemplate:
-                    template = Template(self._notExportedSceneTemplate)
+                    template = self._get_template('_notExportedSceneTemplate')
                 else:
                     continue
 
-            elif sceneContent.startswith('<HTML>'):
-                continue
-
-            elif sceneContent.startswith('<TEX>'):
+            elif self.novel.scenes[scId].is_raw_markup():
+                # Scene content is HTML or LaTeX code.
                 continue
 
             else:
@@ -618,17 +685,17 @@ class FileExport(File):
                 dispNumber = sceneNumber
                 wordsTotal += self.novel.scenes[scId].wordCount
                 lettersTotal += self.novel.scenes[scId].letterCount
-                template = Template(self._sceneTemplate)
+                template = self._get_template('_sceneTemplate')
                 if not firstSceneInChapter and self.novel.scenes[scId].appendToPrev and self._appendedSceneTemplate:
-                    template = Template(self._appendedSceneTemplate)
+                    template = self._get_template('_appendedSceneTemplate')
             if not (firstSceneInChapter or self.novel.scenes[scId].appendToPrev):
-                lines.append(self._sceneDivider)
+                yield self._sceneDivider
             if firstSceneInChapter and self._firstSceneTemplate:
-                template = Template(self._firstSceneTemplate)
-            lines.append(template.safe_substitute(self._get_sceneMapping(
-                        scId, dispNumber, wordsTotal, lettersTotal)))
+                template = self._get_template('_firstSceneTemplate')
+            yield template.safe_substitute(self._get_sceneMapping(
+                        scId, dispNumber, wordsTotal, lettersTotal))
             firstSceneInChapter = False
-        return lines, sceneNumber, wordsTotal, lettersTotal
+        return sceneNumber, wordsTotal, lettersTotal
 
     def _get_prjNoteMapping(self, pnId):
         """Return a mapping dictionary for a project note.
@@ -657,26 +724,78 @@ class FileExport(File):
         This is a template method that can be extended or overridden by subclasses.
         """
         lines = []
-        template = Template(self._projectNoteTemplate)
+        template = self._get_template('_projectNoteTemplate')
         for pnId in self.novel.srtPrjNotes:
             map = self._get_prjNoteMapping(pnId)
             lines.append(template.safe_substitute(map))
         return lines
 
+    def _get_fragments(self):
+        """Call all processing methods.
+        
+        Generate the strings to be written to the output file.
+        This is a template method that can be extended or overridden by subclasses.
+        """
+        yield from self._get_fileHeader()
+        yield from self._get_chapters()
+        yield from self._get_characters()
+        yield from self._get_locations()
+        yield from self._get_items()
+        yield from self._get_projectNotes()
+        yield self._fileFooter
+
     def _get_text(self):
         """Call all processing methods.
         
         Return a string to be written to the output file.
         This is a template method that can be extended or overridden by subclasses.
+        If it is, the output file is written from its result. 
+        Otherwise, the fragments are written as they are generated.
         """
-        lines = self._get_fileHeader()
-        lines.extend(self._get_chapters())
-        lines.extend(self._get_characters())
-        lines.extend(self._get_locations())
-        lines.extend(self._get_items())
-        lines.extend(self._get_projectNotes())
-        lines.append(self._fileFooter)
-        return ''.join(lines)
+        return ''.join(self._get_fragments())
+
+    def _get_output(self):
+        """Return an iterable of the strings to be written to the output file."""
+        if type(self)._get_text is FileExport._get_text:
+            return self._get_fragments()
+
+        return [self._get_text()]
+
+    def _get_template(self, templateName):
+        """Return a compiled template.
+        
+        Positional arguments:
+            templateName: str -- name of the attribute holding the template string.
+        
+        Templates are compiled once per class and attribute name. 
+        If the template string has been changed, e.g. by an instance, the template is recompiled.
+        """
+        templateStr = getattr(self, templateName)
+        key = (self.__class__, templateName)
+        try:
+            cachedStr, template = self._TEMPLATE_CACHE[key]
+        except KeyError:
+            pass
+        else:
+            if cachedStr == templateStr:
+                return template
+
+        template = CompiledTemplate(templateStr)
+        self._TEMPLATE_CACHE[key] = (templateStr, template)
+        return template
+
+    def _uses_placeholder(self, name, templateNames):
+        """Return True if one of the templates has the placeholder name.
+        
+        Positional arguments:
+            name: str -- placeholder name without the "$" delimiter.
+            templateNames -- iterable of names of the attributes holding the template strings.
+        """
+        for templateName in templateNames:
+            if getattr(self, templateName) and name in self._get_template(templateName).placeholders:
+                return True
+
+        return False
 
     def _remove_inline_code(self, text):
         """Remove inline raw code from text and return the result."""
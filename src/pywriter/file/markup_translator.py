@@ -0,0 +1,455 @@
+"""Provide a class for single-pass markup translation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+
+
+class MarkupTranslator:
+    """Translate yWriter markup into a target format with a single scan.
+
+    Public methods:
+        translate(text) -- return text, converted to the target format.
+
+    The replacements are applied simultaneously; where two source strings
+    start at the same position, the longer one wins. Single characters,
+    such as XML entities, are replaced in advance with str.replace(),
+    which is much faster than str.translate() with string targets.
+    All longer source strings, such as tags, are compiled into one regular
+    expression, structured as a prefix tree. So the conversion time depends
+    on the text length, but not on the number of tags or languages.
+    The markup to be discarded is searched after replacing the single characters.
+
+    Tags given on instantiation are balanced per line in the same scan:
+    A tag that is still open at the end of a line is closed there
+    and reopened at the beginning of the next line.
+    Tags that are closed without being opened get an opening tag
+    at the beginning of the line. Empty tag pairs are removed with a tag stack,
+    the same way as with one str.replace() call per tag; see _close_line().
+    If tags are given, source strings consisting of line breaks are
+    translated after balancing the tags, so line breaks around a line
+    that has become empty are translated together.
+
+    Where source strings overlap, so that the result of chained
+    str.replace() calls depends on their order, a text containing
+    such an overlap is balanced by the same scan, but translated with 
+    the replacements applied one after another, in the order given 
+    on instantiation.
+    """
+
+    def __init__(self, replacements, tags=None, discard=None):
+        """Compile the translation tables.
+
+        Positional arguments:
+            replacements -- iterable of (source string, target string) tuples.
+
+        Optional arguments:
+            tags -- list of yWriter tag names to be balanced, e.g. ['i', 'b'].
+            discard: str -- regular expression without groups, matching markup to be removed.
+        """
+        self._replacements = list(replacements)
+        self._targets = {}
+        # key: str -- source string or yWriter tag to be found by the regular expression.
+        # value: str -- target string.
+        self._tags = {}
+        # key: str -- yWriter opening or closing tag.
+        # value: tuple (tag index, True if opening tag)
+        self._markup = {}
+        # key: tuple (tag index, True if opening tag)
+        # value: str -- target format markup.
+        self._tagSources = {}
+        # key: tuple (tag index, True if opening tag)
+        # value: str -- yWriter tag.
+        singleChars = {}
+        lineBreaks = []
+        for source, target in replacements:
+            if tags and not source.strip('\n'):
+                lineBreaks.append((source, target))
+            elif len(source) == 1 and not (tags and (source.isspace() or '\n' in target or target[-1:].isspace())):
+                singleChars[source] = target
+                # With tags, trailing white space is recognized after replacing the single characters.
+            else:
+                self._targets[source] = target
+        if tags:
+            for i, tag in enumerate(tags):
+                for ywTag, isOpening in ((f'[{tag}]', True), (f'[/{tag}]', False)):
+                    self._tags[ywTag] = (i, isOpening)
+                    self._tagSources[(i, isOpening)] = ywTag
+                    self._markup[(i, isOpening)] = self._targets.get(ywTag, ywTag)
+                    self._targets[ywTag] = self._markup[(i, isOpening)]
+
+        # Replace single characters in advance, if this can neither
+        # break nor create any match of the longer source strings.
+        self._charReplacements = []
+        # list of (source character, target string) tuples,
+        # ordered so that no target is changed by a subsequent replacement.
+        while singleChars:
+            keyChars = set(''.join(self._targets))
+            firstChars = set([key[0] for key in self._targets])
+            unsafe = [source for source, target in singleChars.items()
+                      if source in keyChars or not target or target[0] in keyChars or firstChars.intersection(target)]
+            if not unsafe:
+                independent = [source for source in singleChars
+                               if not any(char in singleChars[source] for char in singleChars if char != source)]
+                if independent:
+                    source = independent[0]
+                    self._charReplacements.append((source, singleChars.pop(source)))
+                    continue
+
+                unsafe = list(singleChars)
+                # Circular dependency: leave it to the regular expression.
+            source = unsafe[0]
+            self._targets[source] = singleChars.pop(source)
+
+        self._rawSources = {}
+        # key: str -- source string whose target would be stripped differently from the source.
+        # value: str -- target string.
+        # These source strings are converted after removing trailing white space.
+        if tags:
+            for source, target in self._targets.items():
+                if not source in self._tags and (not target or target.rstrip() != ('' if source.isspace() else target)):
+                    self._rawSources[source] = target
+
+        self._lineBreaks = {}
+        # Cache of converted line break sequences.
+        # key: int -- number of line breaks.
+        # value: str -- converted line breaks.
+        self._lineBreakTranslator = None
+        if lineBreaks:
+            self._lineBreakTranslator = MarkupTranslator(lineBreaks)
+
+        alternatives = []
+        if self._targets:
+            alternatives.append(self._get_tree_pattern(self._targets))
+        if tags:
+            alternatives.append('\n\n*')
+            # Not "\n+", so that all alternatives begin with a literal character,
+            # which enables the fast search for possible match positions.
+        if discard:
+            alternatives.append(f'(?:{discard})')
+        if alternatives:
+            self._pattern = re.compile('|'.join(alternatives))
+        else:
+            self._pattern = None
+
+        # Find the strings that are translated differently by a single scan and by chained replacements.
+        overlaps = set()
+        sources = {}
+        # key: str -- first character of a source string.
+        # value: list of tuples (position in the replacements, source string)
+        for i, (source, __) in enumerate(self._replacements):
+            sources.setdefault(source[:1], []).append((i, source))
+        for j, (second, __) in enumerate(self._replacements):
+            for position, char in enumerate(second):
+                for i, first in sources.get(char, []):
+                    if i >= j or first == second:
+                        continue
+
+                    if second.startswith(first, position):
+                        overlaps.add(second)
+                        # The first source string would break the second one.
+                    elif position and first.startswith(second[position:]):
+                        overlaps.add(second[:position] + first)
+                        # The first source string would be found inside the text matched by the second one.
+        self._overlapPattern = None
+        if overlaps:
+            self._overlapPattern = re.compile(self._get_tree_pattern(overlaps))
+        self._discardPattern = None
+        if discard:
+            self._discardPattern = re.compile(discard)
+
+    def translate(self, text, rstrip=False):
+        """Return text, converted to the target format.
+
+        Positional arguments:
+            text: str -- text with yWriter markup.
+
+        Optional arguments:
+            rstrip: bool -- if True, remove trailing white space.
+        """
+        if self._overlapPattern is not None and self._overlapPattern.search(text):
+            return self._translate_sequentially(text, rstrip)
+
+        if not self._tags:
+            if rstrip:
+                text = text.rstrip()
+            text = self._replace_chars(text)
+            if self._pattern is not None:
+                text = self._pattern.sub(self._replace, text)
+            return text
+
+        newText, hasRemovedPairs = self._scan_lines(self._replace_chars(text), rstrip, True)
+        if hasRemovedPairs and self._overlapPattern is not None:
+            balancedText, __ = self._scan_lines(text, rstrip, False)
+            if self._overlapPattern.search(balancedText):
+                # Removing an empty tag pair has made source strings overlap.
+                return self._replace_sequentially(balancedText)
+
+        return newText
+
+    def _translate_sequentially(self, text, rstrip):
+        """Return the converted text, with the replacements applied one after another.
+
+        Positional arguments:
+            text: str -- text with yWriter markup.
+            rstrip: bool -- if True, remove trailing white space after balancing the tags.
+        """
+        if self._tags:
+            text, __ = self._scan_lines(text, rstrip, False)
+        elif rstrip:
+            text = text.rstrip()
+        return self._replace_sequentially(text)
+
+    def _replace_sequentially(self, text):
+        """Return text with the replacements applied one after another.
+
+        Positional arguments:
+            text: str -- text with balanced tags.
+
+        Inserted target strings are not subject to subsequent replacements.
+        The markup to be discarded is removed at last.
+        """
+        segments = [(text, True)]
+        # list of tuples: (string, True if not replaced yet)
+        for source, target in self._replacements:
+            newSegments = []
+            for segment, isSource in segments:
+                if isSource and source in segment:
+                    parts = segment.split(source)
+                    newSegments.append((parts[0], True))
+                    for part in parts[1:]:
+                        newSegments.append((target, False))
+                        newSegments.append((part, True))
+                else:
+                    newSegments.append((segment, isSource))
+            segments = newSegments
+        text = ''.join([segment for segment, __ in segments])
+        if self._discardPattern is not None:
+            text = self._discardPattern.sub('', text)
+        return text
+
+    def _scan_lines(self, text, rstrip, translate):
+        """Return a tuple: (text with the tags balanced per line, True if an empty tag pair has been removed).
+
+        Positional arguments:
+            text: str -- text with yWriter markup; with the single characters replaced, if translate is True.
+            rstrip: bool -- if True, remove trailing white space after balancing the tags.
+            translate: bool -- if True, convert the markup; otherwise, return yWriter markup.
+
+        The text is scanned once. The items of a line are collected until the line break, 
+        and then balanced by _close_line(). Line breaks around lines that have become empty 
+        are converted together.
+        """
+        lines = []
+        # list of tuples: (number of preceding line breaks, list of the line's items)
+        lineBreaks = 0
+        isOpen = set()
+        # Indices of the tags to be reopened at the beginning of the next line.
+        items = []
+        # Items of the current line: strings, tags as tuples (tag index, True if opening tag),
+        # and None for discarded markup.
+        balance = {}
+        # key: int -- index of a tag used in the current line.
+        # value: int -- number of opening tags minus number of closing tags.
+        hasEmptyPair = False
+        # True if the current line contains an opening tag directly followed by its closing tag.
+        hasRemovedPairs = False
+        position = 0
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            if start > position:
+                items.append(text[position:start])
+            position = match.end()
+            source = match.group()
+            tag = self._tags.get(source)
+            if tag is not None:
+                items.append(tag)
+                if tag[1]:
+                    balance[tag[0]] = balance.get(tag[0], 0) + 1
+                else:
+                    balance[tag[0]] = balance.get(tag[0], 0) - 1
+                    if len(items) > 1 and items[-2] == (tag[0], True):
+                        hasEmptyPair = True
+            elif source[0] == '\n':
+                if balance or isOpen:
+                    items, isRemoved = self._close_line(items, balance, isOpen, hasEmptyPair)
+                    hasRemovedPairs = hasRemovedPairs or isRemoved
+                    balance = {}
+                    hasEmptyPair = False
+                if items:
+                    lines.append((lineBreaks, items))
+                    lineBreaks = 0
+                    items = []
+                lineBreaks += len(source)
+            elif translate and not source in self._rawSources:
+                items.append(self._targets.get(source))
+                # Discarded markup is kept as None until the line is closed.
+            else:
+                items.append(source)
+        if position < len(text):
+            items.append(text[position:])
+        if balance or isOpen:
+            items, isRemoved = self._close_line(items, balance, isOpen, hasEmptyPair)
+            hasRemovedPairs = hasRemovedPairs or isRemoved
+        if items:
+            lines.append((lineBreaks, items))
+            lineBreaks = 0
+        if rstrip:
+            lineBreaks = 0
+            while lines:
+                line = lines[-1][1]
+                while line and line[-1].__class__ is str and line[-1].isspace():
+                    line.pop()
+                if line:
+                    if line[-1].__class__ is str:
+                        line[-1] = line[-1].rstrip()
+                    break
+
+                lines.pop()
+
+        newText = []
+        for count, line in lines:
+            if count:
+                if translate:
+                    newText.append(self._translate_line_breaks(count))
+                else:
+                    newText.append('\n' * count)
+            for item in line:
+                if item.__class__ is tuple:
+                    if translate:
+                        newText.append(self._markup[item])
+                    else:
+                        newText.append(self._tagSources[item])
+                elif item:
+                    if translate and self._rawSources:
+                        item = self._rawSources.get(item, item)
+                    newText.append(item)
+        if lineBreaks:
+            if translate:
+                newText.append(self._translate_line_breaks(lineBreaks))
+            else:
+                newText.append('\n' * lineBreaks)
+        return ''.join(newText), hasRemovedPairs
+
+    def _close_line(self, items, balance, isOpen, hasEmptyPair):
+        """Return a tuple: (the line's items with balanced tags, True if an empty tag pair has been removed).
+
+        Positional arguments:
+            items -- list of the line's items.
+            balance -- dict of tag balances within the line.
+            isOpen -- set of tags opened in a previous line.
+            hasEmptyPair: bool -- True if the items contain an opening tag directly followed by its closing tag.
+
+        isOpen is updated for the next line.
+        A tag still open at the end of the line is closed there, and reopened 
+        at the beginning of the next line. A tag closed without being opened 
+        gets an opening tag at the beginning of the line. 
+        Then empty tag pairs are removed with a tag stack, as if removed with 
+        one str.replace() call per tag, in the given order of the tags:
+        A pair of the tag with index i is removed if the pairs removed in between 
+        have lower indices. So of nested empty pairs of the same tag, only the 
+        innermost one is removed.
+        """
+        prefix = []
+        suffix = []
+        for i in sorted(isOpen.union(balance)):
+            count = balance.get(i, 0)
+            openingCount = 0
+            if i in isOpen:
+                openingCount = 1
+                count += 1
+            if count > 0:
+                suffix.extend([(i, False)] * count)
+                isOpen.add(i)
+            else:
+                openingCount -= count
+                isOpen.discard(i)
+            prefix[:0] = [(i, True)] * openingCount
+            # The opening tags of each tag are placed before the previous ones.
+        sequence = prefix + items + suffix
+        if not hasEmptyPair:
+            # Look for empty tag pairs where the tags have been added.
+            if prefix and sequence[len(prefix)] == (prefix[-1][0], False):
+                hasEmptyPair = True
+            elif suffix and sequence[-len(suffix) - 1] == (suffix[0][0], True):
+                hasEmptyPair = True
+            else:
+                return sequence, False
+
+        line = []
+        barriers = []
+        # Highest index of the tags removed after each item of the line, or -1.
+        isRemoved = False
+        for item in sequence:
+            if (item.__class__ is tuple and not item[1] and line and line[-1] == (item[0], True)
+                    and barriers[-1] < item[0]):
+                # Remove an empty tag pair.
+                line.pop()
+                barrier = max(barriers.pop(), item[0])
+                if barriers and barriers[-1] < barrier:
+                    barriers[-1] = barrier
+                isRemoved = True
+            else:
+                line.append(item)
+                barriers.append(-1)
+        return line, isRemoved
+
+    def _translate_line_breaks(self, count):
+        """Return a sequence of line breaks, converted to the target format."""
+        try:
+            return self._lineBreaks[count]
+
+        except KeyError:
+            if self._lineBreakTranslator is None:
+                self._lineBreaks[count] = '\n' * count
+            else:
+                self._lineBreaks[count] = self._lineBreakTranslator.translate('\n' * count)
+            return self._lineBreaks[count]
+
+    def _replace_chars(self, text):
+        """Return text with the single characters replaced."""
+        for source, target in self._charReplacements:
+            text = text.replace(source, target)
+        return text
+
+    def _replace(self, match):
+        return self._targets.get(match.group(), '')
+
+    def _get_tree_pattern(self, keys):
+        """Return an alternation matching the longest of the keys.
+
+        Positional arguments:
+            keys -- iterable of source strings.
+
+        The keys are arranged as a prefix tree, so the regular expression
+        engine has to check only one branch at each position of the text.
+        """
+        tree = {}
+        for key in keys:
+            node = tree
+            for char in key:
+                node = node.setdefault(char, {})
+            node[''] = None
+        pattern = '|'.join([re.escape(char) + self._get_node_pattern(tree[char]) for char in sorted(tree)])
+        # The root branches are not grouped, so each alternative begins with a literal character.
+        return pattern
+
+    def _get_node_pattern(self, node):
+        """Return a regular expression for a node of the prefix tree."""
+        branches = [re.escape(char) + self._get_node_pattern(node[char]) for char in sorted(node) if char]
+        if not branches:
+            return ''
+
+        if len(branches) == 1:
+            pattern = branches[0]
+        else:
+            pattern = '|'.join(branches)
+        if '' in node:
+            return f'(?:{pattern})?'
+
+        if len(branches) == 1:
+            return pattern
+
+        return f'(?:{pattern})'
@@ -9,8 +9,11 @@ scene -- Provide a class for yWriter scene representation.
 world_element -- Provide a generic class for yWriter story world element representation.
 character -- Provide a class for yWriter character representation.
 cross_references -- Provide a class for yWriter cross reference generation.
+scene_index -- Provide a class for a novel's structural scene index.
+text_index -- Provide a class for a full-text index of a novel's scenes.
 splitter -- Provide a helper class for scene and chapter splitting.
 id_generator -- Helper module for ID generation.
+id_allocator -- Provide a class for ID allocation.
 
 Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
@@ -12,8 +12,18 @@ class BasicElement:
     Public instance variables:
         title: str -- title (name).
         desc: str -- description.
-        kwVar: dict -- custom keyword variables.
+        kwVar: dict -- custom keyword variables (property, created on first access).
+
+    Public class constants:
+        KWVAR_KEYS -- tuple of the keyword variables the kwVar dictionary is created with.
+        
+    The instance variables are stored in slots, because large projects have many elements.
+    Subclasses define slots for their own instance variables.
     """
+    __slots__ = ('title', 'desc', '_kwVar')
+
+    KWVAR_KEYS = ()
+    # The keyword variables are initialized with None, when the dictionary is created.
 
     def __init__(self):
         """Initialize instance variables."""
@@ -23,5 +33,16 @@ class BasicElement:
         self.desc = None
         # xml: <Desc>
 
-        self.kwVar = {}
+        self._kwVar = None
         # Optional key/value instance variables for customization.
+        # None means: No dictionary is allocated yet.
+
+    @property
+    def kwVar(self):
+        if self._kwVar is None:
+            self._kwVar = dict.fromkeys(self.KWVAR_KEYS)
+        return self._kwVar
+
+    @kwVar.setter
+    def kwVar(self, kwVar: dict):
+        self._kwVar = kwVar
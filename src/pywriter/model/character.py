@@ -17,6 +17,10 @@ class Character(WorldElement):
         fullName: str -- full name (the title inherited may be a short name).
         isMajor: bool -- True, if it's a major character.
     """
+    __slots__ = ('notes', 'bio', 'goals', 'fullName', 'isMajor')
+
+    KWVAR_KEYS = ('Field_Link', 'Field_BirthDate', 'Field_DeathDate')
+
     MAJOR_MARKER = 'Major'
     MINOR_MARKER = 'Minor'
 
@@ -11,6 +11,10 @@ class CrossReferences:
 
     Public methods:
         generate_xref(novel) -- Generate cross references for a novel.
+        update_scene(scId) -- Update the cross references after a scene's relations have changed.
+        update_chapter(chId) -- Update the cross references after a chapter's scene list has changed.
+        update_xref() -- Update the cross references after the changes reported to the novel.
+        register_change(elements, elemId) -- Note a change reported to the novel.
 
     Public instance variables:
         scnPerChr -- scenes per character.
@@ -21,7 +25,19 @@ class CrossReferences:
         locPerTag -- locations per tag.
         itmPerTag -- items per tag.
         chpPerScn -- chapters per scene.
-        srtScenes -- the novel's sorted scene IDs.
+        chrPerScn -- characters per scene.
+        locPerScn -- locations per scene.
+        itmPerScn -- items per scene.
+        tagPerScn -- tags per scene.
+        srtScenes -- the novel's sorted scene IDs (property, determined on access after changes).
+        
+    After generate_xref(), the cross references observe the novel, and update_xref() 
+    processes the changes reported with Novel.report_change() since. 
+    A changed scene is re-inserted into the lists of its former and current relations. 
+    A changed chapter's scenes are re-inserted as well; the other chapters are not visited.
+    If a scene has been moved to another chapter, both chapters are to be reported.
+    If the chapter order, or the characters, locations, or items have changed, all is generated again.
+    After incremental updates, the order of the keys of scnPerTag may differ from a regeneration.
     """
 
     def __init__(self):
@@ -61,8 +77,52 @@ class CrossReferences:
         # key = scene ID, value: chapter ID
         # Chapter to which the scene belongs
 
-        self.srtScenes = None
-        # Scene IDs in the overall order
+        self.chrPerScn = {}
+        # key = scene ID, value: list of character IDs
+        # Characters per scene
+
+        self.locPerScn = {}
+        # key = scene ID, value: list of location IDs
+        # Locations per scene
+
+        self.itmPerScn = {}
+        # key = scene ID, value: list of item IDs
+        # Items per scene
+
+        self.tagPerScn = {}
+        # key = scene ID, value: list of tags
+        # Tags per scene
+
+        self._srtScenes = None
+        # Scene IDs in the overall order; None means: To be determined on the next access.
+
+        self._novel = None
+        # The novel processed by generate_xref().
+
+        self._chapterOrdinals = {}
+        # key = chapter ID, value: index in the novel's chapter list
+
+        self._scenePositions = {}
+        # key = scene ID, value: tuple (chapter ordinal, index in the chapter's scene list)
+        # Sort key of the scene lists; gaps left by scenes moved to another chapter don't matter.
+
+        self._chapterScenes = {}
+        # key = chapter ID, value: copy of the chapter's scene list
+
+        self._changedScenes = {}
+        self._changedChapters = {}
+        # Reported changes; dictionaries used as ordered sets.
+
+        self._isOutdated = False
+        # True if all is to be generated again.
+
+    @property
+    def srtScenes(self):
+        if self._srtScenes is None and self._novel is not None:
+            self._srtScenes = []
+            for chId in self._chapterOrdinals:
+                self._srtScenes.extend(self._chapterScenes.get(chId, []))
+        return self._srtScenes
 
     def generate_xref(self, novel):
         """Generate cross references for a novel.
@@ -78,7 +138,21 @@ class CrossReferences:
         self.locPerTag = {}
         self.itmPerTag = {}
         self.chpPerScn = {}
-        self.srtScenes = []
+        self.chrPerScn = {}
+        self.locPerScn = {}
+        self.itmPerScn = {}
+        self.tagPerScn = {}
+        self._srtScenes = []
+        self._chapterOrdinals = {}
+        self._scenePositions = {}
+        self._chapterScenes = {}
+        self._changedScenes = {}
+        self._changedChapters = {}
+        self._isOutdated = False
+        if self._novel is not None and self._novel is not novel:
+            self._novel.remove_observer(self)
+        self._novel = novel
+        novel.add_observer(self)
 
         #--- Characters per tag.
         for crId in novel.srtCharacters:
@@ -108,11 +182,18 @@ class CrossReferences:
                     self.itmPerTag[tag].append(itId)
 
         #--- Process chapters and scenes.
-        for chId in novel.srtChapters:
+        for chapterOrdinal, chId in enumerate(novel.srtChapters):
+            self._chapterOrdinals[chId] = chapterOrdinal
+            self._chapterScenes[chId] = list(novel.chapters[chId].srtScenes)
 
-            for scId in novel.chapters[chId].srtScenes:
-                self.srtScenes.append(scId)
+            for i, scId in enumerate(novel.chapters[chId].srtScenes):
+                self._scenePositions[scId] = (chapterOrdinal, i)
+                self._srtScenes.append(scId)
                 self.chpPerScn[scId] = chId
+                self.chrPerScn[scId] = list(novel.scenes[scId].characters or [])
+                self.locPerScn[scId] = list(novel.scenes[scId].locations or [])
+                self.itmPerScn[scId] = list(novel.scenes[scId].items or [])
+                self.tagPerScn[scId] = list(novel.scenes[scId].tags or [])
 
                 #--- Scenes per character.
                 if novel.scenes[scId].characters:
@@ -135,3 +216,170 @@ class CrossReferences:
                         if not tag in self.scnPerTag:
                             self.scnPerTag[tag] = []
                         self.scnPerTag[tag].append(scId)
+
+    def update_scene(self, scId):
+        """Update the cross references after a scene's relations have changed.
+        
+        Positional argument:
+            scId: str -- ID of a scene whose characters, locations, items, or tags have changed.
+            
+        Only the lists concerned are updated. 
+        Scenes not belonging to a chapter are not cross-referenced.
+        """
+        if not scId in self.chpPerScn:
+            return
+
+        scene = self._novel.scenes[scId]
+        for perScn, scnPer, relations in (
+                (self.chrPerScn, self.scnPerChr, scene.characters),
+                (self.locPerScn, self.scnPerLoc, scene.locations),
+                (self.itmPerScn, self.scnPerItm, scene.items),
+                (self.tagPerScn, self.scnPerTag, scene.tags),
+                ):
+            relations = list(relations or [])
+            if relations != perScn[scId]:
+                self._remove_scene(scnPer, scId, perScn[scId])
+                perScn[scId] = relations
+                self._insert_scene(scnPer, scId, relations)
+
+    def update_chapter(self, chId):
+        """Update the cross references after a chapter's scene list has changed.
+        
+        Positional argument:
+            chId: str -- ID of a chapter whose scenes have been added, removed, or reordered.
+            
+        Only the chapter's former and current scenes are re-inserted into the lists.
+        If a scene has been moved from another chapter, it is removed from there. 
+        If a scene has been moved to another chapter, update that chapter as well.
+        """
+        novel = self._novel
+        if chId in novel.chapters and not chId in self._chapterOrdinals and chId in novel.srtChapters:
+            # The chapter is new, so the chapter order has changed.
+            self.generate_xref(novel)
+            return
+
+        oldScenes = self._chapterScenes.pop(chId, [])
+        if chId in self._chapterOrdinals and chId in novel.chapters:
+            newScenes = list(novel.chapters[chId].srtScenes)
+        else:
+            newScenes = []
+        for scId in oldScenes:
+            if self.chpPerScn.get(scId, None) == chId:
+                self._remove_references(scId)
+        for scId in newScenes:
+            formerChId = self.chpPerScn.get(scId, None)
+            if formerChId is not None:
+                # The scene has been moved from another chapter.
+                self._remove_references(scId)
+                self._chapterScenes[formerChId].remove(scId)
+        if newScenes:
+            self._chapterScenes[chId] = newScenes
+        chapterOrdinal = self._chapterOrdinals.get(chId, None)
+        for i, scId in enumerate(newScenes):
+            self._scenePositions[scId] = (chapterOrdinal, i)
+            self.chpPerScn[scId] = chId
+            for perScn, scnPer in self._get_scene_references():
+                perScn[scId] = []
+            self.update_scene(scId)
+        self._srtScenes = None
+
+    def update_xref(self):
+        """Update the cross references after the changes reported to the novel.
+        
+        Process the chapters and scenes reported with Novel.report_change(). 
+        If the chapter order or the characters, locations, or items have changed, 
+        generate all cross references again.
+        """
+        if self._isOutdated:
+            self.generate_xref(self._novel)
+            return
+
+        changedChapters = self._changedChapters
+        changedScenes = self._changedScenes
+        self._changedChapters = {}
+        self._changedScenes = {}
+        for chId in changedChapters:
+            self.update_chapter(chId)
+        for scId in changedScenes:
+            self.update_scene(scId)
+
+    def register_change(self, elements, elemId):
+        """Note a change reported to the novel, to be processed by update_xref().
+        
+        Positional arguments:
+            elements -- dictionary containing the changed element, the novel, or None.
+            elemId: str -- ID of the changed element, or None.
+            
+        Called by the novel observed.
+        """
+        novel = self._novel
+        if elements is novel.scenes:
+            if elemId is not None:
+                self._changedScenes[elemId] = None
+        elif elements is novel.chapters and elemId is not None:
+            self._changedChapters[elemId] = None
+        elif elements is not novel and elements is not novel.projectNotes:
+            # The chapter order, or the characters, locations, or items have changed.
+            self._isOutdated = True
+
+    def _get_scene_references(self):
+        """Return a tuple of (references per scene, scenes per reference) dictionary pairs."""
+        return ((self.chrPerScn, self.scnPerChr),
+                (self.locPerScn, self.scnPerLoc),
+                (self.itmPerScn, self.scnPerItm),
+                (self.tagPerScn, self.scnPerTag),
+                )
+
+    def _remove_references(self, scId):
+        """Remove a scene from all lists, and forget its chapter and position."""
+        for perScn, scnPer in self._get_scene_references():
+            self._remove_scene(scnPer, scId, perScn.pop(scId))
+        del self.chpPerScn[scId]
+        del self._scenePositions[scId]
+
+    def _insert_scene(self, scnPer, scId, keys):
+        """Insert a scene ID into the scene lists of the keys, keeping the scene order.
+        
+        Positional arguments:
+            scnPer -- dictionary of scene lists, e.g. scnPerChr.
+            scId: str -- scene ID.
+            keys -- list of keys, e.g. character IDs.
+        """
+        position = self._scenePositions[scId]
+        for key in keys:
+            scenes = scnPer.setdefault(key, [])
+            scenes.insert(self._find_position(scenes, position), scId)
+
+    def _remove_scene(self, scnPer, scId, keys):
+        """Remove a scene ID from the scene lists of the keys.
+        
+        Positional arguments:
+            scnPer -- dictionary of scene lists, e.g. scnPerChr.
+            scId: str -- scene ID.
+            keys -- list of keys, e.g. character IDs.
+            
+        Tags without scenes are removed, like generate_xref() does.
+        """
+        position = self._scenePositions[scId]
+        for key in set(keys):
+            scenes = scnPer.get(key)
+            if scenes is None:
+                continue
+
+            i = self._find_position(scenes, position)
+            while i < len(scenes) and scenes[i] == scId:
+                del scenes[i]
+            if not scenes and scnPer is self.scnPerTag:
+                del scnPer[key]
+
+    def _find_position(self, scenes, position):
+        """Return the index of the first scene in the list not sorting before the position."""
+        low = 0
+        high = len(scenes)
+        while low < high:
+            middle = (low + high) // 2
+            if self._scenePositions[scenes[middle]] < position:
+                low = middle + 1
+            else:
+                high = middle
+        return low
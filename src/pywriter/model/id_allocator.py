@@ -0,0 +1,72 @@
+"""Provide a class for ID allocation.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from heapq import heappop, heappush
+
+
+class IdAllocator:
+    """Allocator of unused IDs for new elements.
+    
+    Public methods:
+        create_id() -- return an unused ID for a new element.
+        release_id(elemId) -- make the ID of a removed element available for reuse.
+
+    Public instance variables:
+        elements -- list or dictionary containing all existing IDs.
+    
+    IDs are strings representing positive integers.
+    On instantiation, the existing IDs are scanned once. After that, 
+    the allocator keeps track of the highest ID and of the unused IDs below, 
+    so an ID is created in constant (amortized) time.
+    The lowest unused ID is returned first, like create_id() in the id_generator module does.
+    IDs added to the elements without the allocator are skipped.
+    """
+
+    def __init__(self, elements):
+        """Scan the existing IDs.
+        
+        Positional arguments:
+            elements -- list or dictionary containing all existing IDs.
+        """
+        self.elements = elements
+        self._highestId = 0
+        for elemId in elements:
+            try:
+                number = int(elemId)
+            except (TypeError, ValueError):
+                continue
+
+            if number > self._highestId:
+                self._highestId = number
+        self._freeIds = [i for i in range(1, self._highestId) if str(i) not in elements]
+        # The list is sorted, so it is a heap.
+        self._freeIdSet = set(self._freeIds)
+        # The numbers in the heap, for checking membership in constant time.
+
+    def create_id(self):
+        """Return an unused ID for a new element."""
+        while self._freeIds:
+            number = heappop(self._freeIds)
+            self._freeIdSet.discard(number)
+            elemId = str(number)
+            if not elemId in self.elements:
+                return elemId
+
+        self._highestId += 1
+        while str(self._highestId) in self.elements:
+            self._highestId += 1
+        return str(self._highestId)
+
+    def release_id(self, elemId):
+        """Make the ID of a removed element available for reuse.
+        
+        Positional arguments:
+            elemId: str -- ID of an element that has been removed.
+        """
+        number = int(elemId)
+        if number <= self._highestId and not number in self._freeIdSet:
+            heappush(self._freeIds, number)
+            self._freeIdSet.add(number)
@@ -5,11 +5,13 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import locale
-import re
+import weakref
 from pywriter.pywriter_globals import *
 from pywriter.model.basic_element import BasicElement
-
-LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+from pywriter.model.id_allocator import IdAllocator
+from pywriter.model.scene_index import SceneIndex
+from pywriter.model.scene import LANGUAGE_TAG
+# Formerly defined here; kept for applications importing it from this module.
 
 
 class Novel(BasicElement):
@@ -22,6 +24,12 @@ class Novel(BasicElement):
     Public methods:
         get_languages() -- Determine the languages used in the document.
         check_locale() -- Check the document's locale (language code and country code).
+        create_id(elements) -- Return an unused ID for a new element.
+        release_id(elements, elemId) -- Make the ID of a removed element available for reuse.
+        get_scene_index() -- Return an index of the scene positions and running totals.
+        add_observer(observer) -- Have an observer notified of the changes reported.
+        remove_observer(observer) -- Stop notifying an observer.
+        report_change(elements, elemId) -- Notify the observers of a change of the novel.
 
     Public instance variables:
         authorName -- author's name.
@@ -41,7 +49,15 @@ class Novel(BasicElement):
         srtCharacters: list -- the novel's sorted character IDs.
         projectNotes: dict --  (key: ID, value: projectNote instance).
         srtPrjNotes: list -- the novel's sorted project notes.
+
+    Components keeping data derived from the novel, e.g. indexes, or the xml tree of a project file, 
+    observe the novel. The novel can't see the changes of its elements, e.g. lists changed in place, 
+    so the application reports each change with report_change(). Then the observers process
+    only the elements reported.
     """
+    _observers = weakref.WeakKeyDictionary()
+    # key: Novel instance, value: WeakSet of the observers.
+    # Not an instance variable, so the observers are not pickled with the novel.
 
     def __init__(self):
         """Initialize instance variables.
@@ -135,6 +151,12 @@ class Novel(BasicElement):
         self.countryCode = None
         # Country code acc. to ISO 3166-2.
 
+        self._idAllocators = {}
+        # key: id() of an element dictionary, value: IdAllocator instance.
+
+        self._sceneIndex = None
+        # SceneIndex instance, built on first use.
+
     def get_languages(self):
         """Determine the languages used in the document.
         
@@ -142,29 +164,14 @@ class Novel(BasicElement):
         Example:
         - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
         - language code: 'en-AU'
+        
+        The scenes cache their language codes, so only scenes changed since the last call are searched.
         """
-
-        def languages(text):
-            """Return the language codes appearing in text.
-            
-            Example:
-            - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
-            - language code: 'en-AU'
-            """
-            if text:
-                m = LANGUAGE_TAG.search(text)
-                while m:
-                    text = text[m.span()[1]:]
-                    yield m.group(1)
-                    m = LANGUAGE_TAG.search(text)
-
-        self.languages = []
+        languages = {}
+        # Used as an ordered set.
         for scId in self.scenes:
-            text = self.scenes[scId].sceneContent
-            if text:
-                for language in languages(text):
-                    if not language in self.languages:
-                        self.languages.append(language)
+            languages.update(dict.fromkeys(self.scenes[scId].get_languages()))
+        self.languages = list(languages)
 
     def check_locale(self):
         """Check the document's locale (language code and country code).
@@ -196,3 +203,78 @@ class Novel(BasicElement):
         self.languageCode = 'zxx'
         self.countryCode = 'none'
 
+    def create_id(self, elements):
+        """Return an unused ID for a new element.
+        
+        Positional arguments:
+            elements -- dictionary containing the novel's elements of a kind, e.g. self.scenes.
+        """
+        return self._get_id_allocator(elements).create_id()
+
+    def release_id(self, elements, elemId):
+        """Make the ID of a removed element available for reuse.
+        
+        Positional arguments:
+            elements -- dictionary containing the novel's elements of a kind, e.g. self.scenes.
+            elemId: str -- ID of the removed element.
+        """
+        self._get_id_allocator(elements).release_id(elemId)
+
+    def get_scene_index(self):
+        """Return a SceneIndex instance for the current chapter and scene order.
+        
+        The index is built on first use, and built again after the chapter 
+        or scene order has changed, or a chapter has been reported as changed.
+        Checking the order takes O(n) time, but compares only lists of IDs. 
+        A scene reported as changed is updated in O(log n) time; see report_change().
+        """
+        if self._sceneIndex is None:
+            self._sceneIndex = SceneIndex()
+        if not self._sceneIndex.is_current(self):
+            self._sceneIndex.build(self)
+        return self._sceneIndex
+
+    def add_observer(self, observer):
+        """Have an observer notified of the changes reported.
+        
+        Positional arguments:
+            observer -- object with a register_change(elements, elemId) method.
+            
+        The novel holds only a weak reference to the observer.
+        """
+        self._observers.setdefault(self, weakref.WeakSet()).add(observer)
+
+    def remove_observer(self, observer):
+        """Stop notifying an observer.
+        
+        Positional arguments:
+            observer -- object added with add_observer().
+        """
+        observers = self._observers.get(self, None)
+        if observers is not None:
+            observers.discard(observer)
+
+    def report_change(self, elements=None, elemId=None):
+        """Notify the observers of a change of the novel.
+        
+        Optional arguments:
+            elements -- dictionary containing the changed element, e.g. self.scenes;
+                        the novel itself, if the novel's own attributes have changed.
+            elemId: str -- ID of the changed element.
+            
+        Report a changed element with both arguments, e.g. a scene whose content, attributes,
+        or relations have changed, or a chapter whose scene list has changed. 
+        This applies to added and removed elements as well.
+        Report a changed order of the elements, e.g. of srtChapters, with the elements only.
+        Report any other changes, e.g. after reading a file into the novel, without arguments.
+        """
+        for observer in list(self._observers.get(self, ())):
+            observer.register_change(elements, elemId)
+
+    def _get_id_allocator(self, elements):
+        """Return the ID allocator for the elements, creating it on first use."""
+        allocator = self._idAllocators.get(id(elements), None)
+        if allocator is None or allocator.elements is not elements:
+            allocator = IdAllocator(elements)
+            self._idAllocators[id(elements)] = allocator
+        return allocator
@@ -22,14 +22,56 @@ NON_LETTERS = re.compile(r'\[.+?\]|\/\*.+?\*\/|\n|\r')
 # this is to be replaced by empty strings, thus excluding markup, comments, and linefeeds
 # from letter counting
 
+LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+# this is to find the language codes in the language markup
+
+RAW_MARKUP = ('<HTML>', '<TEX>')
+# Beginnings of scene contents that are passed through by the document export.
+
+# Note: None of the expressions above reaches across a line break.
+# So the counts of a text are the sums of the counts of its lines.
+
+
+def split_words(text):
+    """Return a list of the words in text, separated like in LibreOffice."""
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return text.split()
+
+
+def count_words(text):
+    """Return the number of words in text, counted like in LibreOffice."""
+    return len(split_words(text))
+
+
+def count_letters(text):
+    """Return the number of letters in text, counted like in LibreOffice."""
+    return len(NON_LETTERS.sub('', text))
+
+
+def find_languages(text):
+    """Return a tuple of the language codes appearing in text, in order of first appearance.
+    
+    Example:
+    - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
+    - language code: 'en-AU'
+    """
+    return tuple(dict.fromkeys(LANGUAGE_TAG.findall(text)))
+
 
 class Scene(BasicElement):
     """yWriter scene representation.
     
+    Public methods:
+        append_paragraph(text) -- append a paragraph to the scene content.
+        get_languages() -- return the language codes appearing in the scene content.
+        is_raw_markup() -- return True if the scene content is HTML or TeX raw markup.
+        set_content_loader(loader, wordCount, letterCount) -- have the scene content loaded on first access.
+
     Public instance variables:
         sceneContent: str -- scene content (property with getter and setter).
-        wordCount: int -- word count (derived; updated by the sceneContent setter).
-        letterCount: int -- letter count (derived; updated by the sceneContent setter).
+        wordCount: int -- word count (derived; counted on first access after a sceneContent change).
+        letterCount: int -- letter count (derived; counted on first access after a sceneContent change).
         scType: int -- Scene type (Normal/Notes/Todo/Unused).
         doNotExport: bool -- True if the scene is not to be exported to RTF.
         status: int -- scene status (Outline/Draft/1st Edit/2nd Edit/Done).
@@ -60,6 +102,15 @@ class Scene(BasicElement):
         scnArcs: str -- Semicolon-separated arc titles.
         scnMode: str -- Mode of discourse (Narration/Dramatic action/Dialogue/Description/Exposition).
     """
+    __slots__ = ('_sceneContent', '_paragraphs', '_contentLoader', '_wordCount', '_letterCount', '_languages',
+                 'scType', 'doNotExport', 'status', 'notes', 'tags',
+                 'field1', 'field2', 'field3', 'field4',
+                 'appendToPrev', 'isReactionScene', 'isSubPlot', 'goal', 'conflict', 'outcome',
+                 'characters', 'locations', 'items', 'date', 'time', 'day',
+                 'lastsMinutes', 'lastsHours', 'lastsDays', 'image', 'scnArcs', 'scnMode')
+
+    KWVAR_KEYS = ('Field_SceneArcs', 'Field_SceneMode')
+
     STATUS = [None,
                     'Outline',
                     'Draft',
@@ -87,13 +138,23 @@ class Scene(BasicElement):
         # xml: <SceneContent>
         # Scene text with yW7 raw markup.
 
-        self.wordCount = 0
+        self._paragraphs = None
+        # list of str: Scene text paragraphs appended since the last sceneContent access.
+
+        self._contentLoader = None
+        # Callable returning the scene text, if not loaded yet.
+
+        self._wordCount = 0
         # xml: <WordCount>
-        # To be updated by the sceneContent setter
+        # None means: To be counted on the next access.
 
-        self.letterCount = 0
+        self._letterCount = 0
         # xml: <LetterCount>
-        # To be updated by the sceneContent setter
+        # None means: To be counted on the next access.
+
+        self._languages = ()
+        # tuple of str: Language codes appearing in the scene content.
+        # None means: To be searched on the next get_languages() call.
 
         self.scType = None
         # Scene type (Normal/Notes/Todo/Unused).
@@ -216,15 +277,115 @@ class Scene(BasicElement):
 
     @property
     def sceneContent(self):
+        if self._contentLoader is not None:
+            self._sceneContent = self._contentLoader()
+            self._contentLoader = None
+        if self._paragraphs is not None:
+            self._sceneContent = '\n'.join(self._paragraphs)
+            self._paragraphs = None
         return self._sceneContent
 
     @sceneContent.setter
     def sceneContent(self, text: str):
-        """Set sceneContent updating word count and letter count."""
+        """Set sceneContent, having word count and letter count updated on the next access."""
         self._sceneContent = text
-        text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-        text = NO_WORD_LIMITS.sub('', text)
-        wordList = text.split()
-        self.wordCount = len(wordList)
-        text = NON_LETTERS.sub('', self._sceneContent)
-        self.letterCount = len(text)
+        self._paragraphs = None
+        self._contentLoader = None
+        self._wordCount = None
+        self._letterCount = None
+        self._languages = None
+
+    @property
+    def wordCount(self):
+        if self._wordCount is None:
+            if self.sceneContent:
+                self._wordCount = count_words(self.sceneContent)
+            else:
+                self._wordCount = 0
+        return self._wordCount
+
+    @wordCount.setter
+    def wordCount(self, count: int):
+        self._wordCount = count
+
+    @property
+    def letterCount(self):
+        if self._letterCount is None:
+            if self.sceneContent:
+                self._letterCount = count_letters(self.sceneContent)
+            else:
+                self._letterCount = 0
+        return self._letterCount
+
+    @letterCount.setter
+    def letterCount(self, count: int):
+        self._letterCount = count
+
+    def append_paragraph(self, text):
+        """Append a paragraph to the scene content.
+        
+        Positional arguments:
+            text: str -- paragraph to append, without line break.
+        
+        The paragraphs are joined on the next sceneContent access, so appending is done in constant time.
+        Word count and letter count, if already known, are increased by the counts of the new paragraph.
+        """
+        if self._paragraphs is None:
+            if self.sceneContent is None:
+                self._paragraphs = []
+            else:
+                self._paragraphs = [self._sceneContent]
+        self._paragraphs.append(text)
+        if self._wordCount is not None:
+            self._wordCount += count_words(text)
+        if self._letterCount is not None:
+            self._letterCount += count_letters(text)
+        if self._languages is not None:
+            self._languages = tuple(dict.fromkeys(self._languages + find_languages(text)))
+
+    def get_languages(self):
+        """Return a tuple of the language codes appearing in the scene content.
+        
+        The codes are in order of first appearance.
+        The scene content is searched only once after each change.
+        """
+        if self._languages is None:
+            if self.sceneContent:
+                self._languages = find_languages(self.sceneContent)
+            else:
+                self._languages = ()
+        return self._languages
+
+    def is_raw_markup(self):
+        """Return True if the scene content is HTML or TeX raw markup.
+        
+        If the scene content is not loaded yet, and the loader has a startswith() method,
+        such as a ContentLoader instance, let the loader check the beginning of the content.
+        """
+        if self._contentLoader is not None:
+            try:
+                return self._contentLoader.startswith(RAW_MARKUP)
+
+            except AttributeError:
+                pass
+        sceneContent = self.sceneContent
+        return bool(sceneContent) and sceneContent.startswith(RAW_MARKUP)
+
+    def set_content_loader(self, loader, wordCount=None, letterCount=None):
+        """Have the scene content loaded on first access.
+        
+        Positional arguments:
+            loader -- callable returning the scene content.
+        
+        Optional arguments:
+            wordCount: int -- word count to be used until the scene content changes.
+            letterCount: int -- letter count to be used until the scene content changes.
+        
+        If a count is None, it is counted on the next access, which loads the scene content.
+        """
+        self._sceneContent = None
+        self._paragraphs = None
+        self._contentLoader = loader
+        self._wordCount = wordCount
+        self._letterCount = letterCount
+        self._languages = None
@@ -0,0 +1,256 @@
+"""Provide a class for a novel's structural scene index.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class SceneIndex:
+    """Positions, display numbers, and running totals of a novel's scenes.
+
+    Public methods:
+        build(novel) -- Index the scenes of a novel.
+        is_current(novel) -- Return True if the novel's chapter and scene order is indexed.
+        update_scene(scId) -- Update the index after a scene's content or type has changed.
+        register_change(elements, elemId) -- Process a change reported to the novel.
+        get_ordinal(scId) -- Return the scene's position within the novel.
+        get_number(scId) -- Return the scene's display number.
+        get_words_total(scId) -- Return the accumulated word count up to the scene.
+        get_letters_total(scId) -- Return the accumulated letter count up to the scene.
+        get_chapter_counts(firstChId, lastChId) -- Return word count and letter count of a range of chapters.
+        get_totals() -- Return the number of numbered scenes, and the novel's word and letter count.
+
+    Public instance variables:
+        chpPerScn -- chapters per scene.
+        srtScenes -- the novel's sorted scene IDs.
+
+    Display numbers and totals refer to the "normal" scenes, i.e. the scenes
+    a document export numbers and counts: Neither "Notes", "Todo", nor "Unused" type,
+    not in an "Unused" chapter, not excluded from export, and no raw markup.
+    Ordinals start with 0; display numbers start with 1; 0 means "not numbered".
+    Scene lookups take O(1), and counts take O(log n) time.
+    Scene contents that are not loaded yet are left in the file; the stored counts are used.
+
+    The index observes the novel: A scene reported with Novel.report_change() 
+    is updated at once. After a global report, a chapter report, or a changed 
+    chapter or scene order, the index must be built again; see Novel.get_scene_index().
+    """
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.chpPerScn = {}
+        # key = scene ID, value: chapter ID
+        # Chapter to which the scene belongs
+
+        self.srtScenes = []
+        # list of the novel's scene IDs
+        # Scenes in the novel's order
+
+        self._novel = None
+        # The indexed Novel instance.
+
+        self._isOutdated = False
+        # If True, the index must be built again.
+
+        self._scenePositions = {}
+        # key = scene ID, value: position in srtScenes
+
+        self._chapterRanges = {}
+        # key = chapter ID, value: tuple (position of the first scene, position after the last scene)
+
+        self._srtChapters = []
+        # Copy of the novel's chapter list, for detecting changes.
+
+        self._chapterScenes = {}
+        # key = chapter ID, value: copy of the chapter's scene list, for detecting changes.
+
+        self._values = []
+        # list of tuples (numbered: int, word count, letter count) per scene position.
+
+        self._numberTree = []
+        self._wordTree = []
+        self._letterTree = []
+        # Binary indexed trees (Fenwick trees) over the scene positions.
+
+    def build(self, novel):
+        """Index the scenes of a novel.
+
+        Positional arguments:
+            novel -- Novel instance to process.
+
+        Take O(n) time.
+        """
+        if self._novel is not None:
+            self._novel.remove_observer(self)
+        self._novel = novel
+        novel.add_observer(self)
+        self._isOutdated = False
+        self.chpPerScn = {}
+        self.srtScenes = []
+        self._chapterRanges = {}
+        self._srtChapters = list(novel.srtChapters)
+        self._chapterScenes = {}
+        for chId in novel.srtChapters:
+            srtScenes = novel.chapters[chId].srtScenes
+            self._chapterScenes[chId] = list(srtScenes)
+            start = len(self.srtScenes)
+            for scId in srtScenes:
+                self.chpPerScn[scId] = chId
+                self.srtScenes.append(scId)
+            self._chapterRanges[chId] = (start, len(self.srtScenes))
+        self._scenePositions = {scId: i for i, scId in enumerate(self.srtScenes)}
+        self._values = [self._get_values(scId) for scId in self.srtScenes]
+        self._numberTree = _new_tree([values[0] for values in self._values])
+        self._wordTree = _new_tree([values[1] for values in self._values])
+        self._letterTree = _new_tree([values[2] for values in self._values])
+
+    def is_current(self, novel):
+        """Return True if the novel's chapter and scene order is indexed.
+
+        Positional arguments:
+            novel -- Novel instance to check.
+        """
+        if self._isOutdated or novel is not self._novel or novel.srtChapters != self._srtChapters:
+            return False
+
+        for chId in self._srtChapters:
+            if novel.chapters[chId].srtScenes != self._chapterScenes[chId]:
+                return False
+
+        return True
+
+    def update_scene(self, scId):
+        """Update the index after a scene's content or type has changed.
+
+        Positional arguments:
+            scId: str -- ID of the changed scene.
+
+        Take O(log n) time.
+        """
+        i = self._scenePositions[scId]
+        newValues = self._get_values(scId)
+        for tree, oldValue, newValue in zip((self._numberTree, self._wordTree, self._letterTree), self._values[i], newValues):
+            if newValue != oldValue:
+                _add(tree, i, newValue - oldValue)
+        self._values[i] = newValues
+
+    def register_change(self, elements, elemId):
+        """Process a change reported to the novel.
+
+        Positional arguments:
+            elements -- dictionary containing the changed element; the novel itself; or None.
+            elemId: str -- ID of the changed element, or None.
+
+        Called by the novel; see Novel.report_change().
+        """
+        if elements is None or elements is self._novel.chapters:
+            self._isOutdated = True
+        elif elements is self._novel.scenes:
+            if elemId is None or elemId not in self._novel.scenes:
+                self._isOutdated = True
+            elif elemId in self._scenePositions:
+                self.update_scene(elemId)
+
+    def get_ordinal(self, scId):
+        """Return the scene's position within the novel.
+
+        Positional arguments:
+            scId: str -- scene ID.
+        """
+        return self._scenePositions[scId]
+
+    def get_number(self, scId):
+        """Return the scene's display number; 0 if the scene is not numbered.
+
+        Positional arguments:
+            scId: str -- scene ID.
+        """
+        i = self._scenePositions[scId]
+        if self._values[i][0]:
+            return _sum(self._numberTree, i + 1)
+
+        return 0
+
+    def get_words_total(self, scId):
+        """Return the accumulated word count of the normal scenes up to and including the scene.
+
+        Positional arguments:
+            scId: str -- scene ID.
+        """
+        return _sum(self._wordTree, self._scenePositions[scId] + 1)
+
+    def get_letters_total(self, scId):
+        """Return the accumulated letter count of the normal scenes up to and including the scene.
+
+        Positional arguments:
+            scId: str -- scene ID.
+        """
+        return _sum(self._letterTree, self._scenePositions[scId] + 1)
+
+    def get_chapter_counts(self, firstChId, lastChId=None):
+        """Return a tuple: (word count, letter count) of the normal scenes of a range of chapters.
+
+        Positional arguments:
+            firstChId: str -- ID of the first chapter of the range.
+
+        Optional arguments:
+            lastChId: str -- ID of the last chapter of the range. Default: The first chapter.
+        """
+        if lastChId is None:
+            lastChId = firstChId
+        start = self._chapterRanges[firstChId][0]
+        end = self._chapterRanges[lastChId][1]
+        if end <= start:
+            return 0, 0
+
+        return (_sum(self._wordTree, end) - _sum(self._wordTree, start),
+                _sum(self._letterTree, end) - _sum(self._letterTree, start))
+
+    def get_totals(self):
+        """Return a tuple: (number of normal scenes, word count, letter count)."""
+        n = len(self.srtScenes)
+        return _sum(self._numberTree, n), _sum(self._wordTree, n), _sum(self._letterTree, n)
+
+    def _get_values(self, scId):
+        """Return a tuple: (1 if the scene is numbered, else 0; word count; letter count)."""
+        scene = self._novel.scenes[scId]
+        if scene.scType in (1, 2, 3) or scene.doNotExport:
+            return 0, 0, 0
+
+        if self._novel.chapters[self.chpPerScn[scId]].chType == 3:
+            return 0, 0, 0
+
+        if scene.is_raw_markup():
+            return 0, 0, 0
+
+        return 1, scene.wordCount or 0, scene.letterCount or 0
+
+
+def _new_tree(values):
+    """Return a binary indexed tree for a list of values, built in O(n) time."""
+    n = len(values)
+    tree = [0] + values
+    for i in range(1, n + 1):
+        j = i + (i & -i)
+        if j <= n:
+            tree[j] += tree[i]
+    return tree
+
+
+def _add(tree, i, delta):
+    """Add delta to the value at position i."""
+    i += 1
+    n = len(tree)
+    while i < n:
+        tree[i] += delta
+        i += i & -i
+
+
+def _sum(tree, i):
+    """Return the sum of the values at the positions before i."""
+    total = 0
+    while i > 0:
+        total += tree[i]
+        i -= i & -i
+    return total
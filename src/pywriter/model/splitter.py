@@ -7,7 +7,6 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 from pywriter.pywriter_globals import *
 from pywriter.model.chapter import Chapter
 from pywriter.model.scene import Scene
-from pywriter.model.id_generator import create_id
 
 
 class Splitter:
@@ -140,7 +139,7 @@ class Splitter:
                         file.novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
                         newLines = []
                         sceneSplitCount += 1
-                        sceneId = create_id(file.novel.scenes)
+                        sceneId = file.novel.create_id(file.novel.scenes)
                         create_scene(sceneId, file.novel.scenes[scId], sceneSplitCount, title, desc)
                         srtScenes.append(sceneId)
                         scenesSplit = True
@@ -154,7 +153,7 @@ class Splitter:
                             inScene = False
                         file.novel.chapters[chapterId].srtScenes = srtScenes
                         srtScenes = []
-                        chapterId = create_id(file.novel.chapters)
+                        chapterId = file.novel.create_id(file.novel.chapters)
                         if not title:
                             title = _('New Chapter')
                         create_chapter(chapterId, title, desc, 0)
@@ -169,7 +168,7 @@ class Splitter:
                             inScene = False
                         file.novel.chapters[chapterId].srtScenes = srtScenes
                         srtScenes = []
-                        chapterId = create_id(file.novel.chapters)
+                        chapterId = file.novel.create_id(file.novel.chapters)
                         if not title:
                             title = _('New Part')
                         create_chapter(chapterId, title, desc, 1)
@@ -178,7 +177,7 @@ class Splitter:
                         # Append a scene without heading to a new chapter or part.
                         newLines.append(line)
                         sceneSplitCount += 1
-                        sceneId = create_id(file.novel.scenes)
+                        sceneId = file.novel.create_id(file.novel.scenes)
                         create_scene(sceneId, file.novel.scenes[scId], sceneSplitCount, '', '')
                         srtScenes.append(sceneId)
                         scenesSplit = True
@@ -189,4 +188,6 @@ class Splitter:
                     file.novel.scenes[sceneId].sceneContent = '\n'.join(newLines)
             file.novel.chapters[chapterId].srtScenes = srtScenes
         file.novel.srtChapters = srtChapters
+        if scenesSplit:
+            file.novel.report_change()
         return scenesSplit
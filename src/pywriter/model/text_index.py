@@ -0,0 +1,230 @@
+"""Provide a class for a full-text index of a novel's scenes.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+from bisect import bisect_left
+from pywriter.model.scene import split_words
+
+WORD_PUNCTUATION = re.compile(r'^\W+|\W+$')
+# this is to be replaced by empty strings, thus separating words from adjacent punctuation
+
+
+def get_terms(text):
+    """Return a list of the search terms in text.
+
+    Words are separated like in the word counter, and converted
+    to lower case, without leading and trailing punctuation.
+    """
+    terms = []
+    if text:
+        for word in split_words(text):
+            term = WORD_PUNCTUATION.sub('', word).casefold()
+            if term:
+                terms.append(term)
+    return terms
+
+
+class TextIndex:
+    """Inverted index of the words in the scene contents, descriptions, and notes.
+
+    Public methods:
+        build(novel) -- Index the scenes of a novel.
+        update_scene(scId) -- Update the index after a scene's text has changed.
+        update_index() -- Update the index after the changes reported to the novel.
+        register_change(elements, elemId) -- Note a change reported to the novel.
+        find_term(term) -- Return the IDs of the scenes containing a word.
+        find_prefix(prefix) -- Return the IDs of the scenes containing a word beginning with prefix.
+        find_phrase(phrase) -- Return the IDs of the scenes containing a sequence of words.
+
+    Public instance variables:
+        postings -- dict: key: term, value: dict (key: scene ID, value: list of word positions).
+
+    Searching is case-insensitive. Markup, comments, and punctuation are ignored.
+    Search results are lists of scene IDs in the novel's order.
+    Scenes that don't belong to a chapter are listed at the end.
+
+    The index observes the novel: update_index() re-indexes only the scenes 
+    reported with Novel.report_change(), or the whole novel after a global report.
+    Alternatively, the application calls update_scene() after changing a scene's text.
+    """
+
+    def __init__(self):
+        """Initialize instance variables."""
+        self.postings = {}
+        self._novel = None
+        self._changedScenes = {}
+        # key = ID of a scene reported as changed, value: None
+        self._isOutdated = False
+        # If True, the index is built again on the next update.
+        self._sceneTerms = {}
+        # key = scene ID, value: set of the scene's terms
+        self._srtTerms = None
+        # Sorted list of the terms, for prefix search; None means: To be sorted on the next access.
+
+    def build(self, novel):
+        """Index the scenes of a novel.
+
+        Positional arguments:
+            novel -- Novel instance to process.
+        """
+        if self._novel is not None:
+            self._novel.remove_observer(self)
+        self._novel = novel
+        novel.add_observer(self)
+        self.postings = {}
+        self._changedScenes = {}
+        self._isOutdated = False
+        self._sceneTerms = {}
+        self._srtTerms = None
+        for scId in novel.scenes:
+            self._add_scene(scId)
+
+    def update_scene(self, scId):
+        """Update the index after a scene's text has changed, or the scene has been added or removed.
+
+        Positional arguments:
+            scId: str -- ID of the changed scene.
+        """
+        self._remove_scene(scId)
+        if scId in self._novel.scenes:
+            self._add_scene(scId)
+
+    def update_index(self):
+        """Update the index after the changes reported to the novel."""
+        if self._isOutdated:
+            self.build(self._novel)
+            return
+
+        for scId in self._changedScenes:
+            self.update_scene(scId)
+        self._changedScenes = {}
+
+    def register_change(self, elements, elemId):
+        """Note a change reported to the novel.
+
+        Positional arguments:
+            elements -- dictionary containing the changed element; the novel itself; or None.
+            elemId: str -- ID of the changed element, or None.
+
+        Called by the novel; see Novel.report_change().
+        """
+        if elements is None:
+            self._isOutdated = True
+        elif elements is self._novel.scenes and elemId is not None:
+            self._changedScenes[elemId] = None
+        elif elements is self._novel.scenes:
+            # Scenes have been added or removed without being reported one by one.
+            self._isOutdated = True
+
+    def find_term(self, term):
+        """Return a list of the IDs of the scenes containing a word.
+
+        Positional arguments:
+            term: str -- the word to search for.
+        """
+        terms = get_terms(term)
+        if len(terms) != 1:
+            return []
+
+        return self._sort_scenes(self.postings.get(terms[0], {}))
+
+    def find_prefix(self, prefix):
+        """Return a list of the IDs of the scenes containing a word beginning with prefix.
+
+        Positional arguments:
+            prefix: str -- the beginning of the words to search for.
+        """
+        terms = get_terms(prefix)
+        if len(terms) != 1:
+            return []
+
+        prefix = terms[0]
+        if self._srtTerms is None:
+            self._srtTerms = sorted(self.postings)
+        scIds = set()
+        i = bisect_left(self._srtTerms, prefix)
+        while i < len(self._srtTerms) and self._srtTerms[i].startswith(prefix):
+            scIds.update(self.postings[self._srtTerms[i]])
+            i += 1
+        return self._sort_scenes(scIds)
+
+    def find_phrase(self, phrase):
+        """Return a list of the IDs of the scenes containing a sequence of words.
+
+        Positional arguments:
+            phrase: str -- the words to search for.
+        """
+        terms = get_terms(phrase)
+        if not terms:
+            return []
+
+        termPostings = []
+        for term in terms:
+            if not term in self.postings:
+                return []
+
+            termPostings.append(self.postings[term])
+        termPostings.sort(key=len)
+        scIds = set(termPostings[0]).intersection(*termPostings[1:])
+        if len(terms) > 1:
+            scIds = [scId for scId in scIds if self._contains_phrase(scId, terms)]
+        return self._sort_scenes(scIds)
+
+    def _contains_phrase(self, scId, terms):
+        """Return True if the terms occur consecutively in the scene's text."""
+        positionSets = [set(self.postings[term][scId]) for term in terms[1:]]
+        for start in self.postings[terms[0]][scId]:
+            for offset, positions in enumerate(positionSets, 1):
+                if not start + offset in positions:
+                    break
+            else:
+                return True
+
+        return False
+
+    def _add_scene(self, scId):
+        """Add a scene's words to the index."""
+        scene = self._novel.scenes[scId]
+        texts = scene.sceneContent, scene.desc, scene.notes
+        position = 0
+        sceneTerms = set()
+        for text in texts:
+            for term in get_terms(text):
+                scenePostings = self.postings.get(term, None)
+                if scenePostings is None:
+                    scenePostings = self.postings[term] = {}
+                    self._srtTerms = None
+                positions = scenePostings.get(scId, None)
+                if positions is None:
+                    positions = scenePostings[scId] = []
+                    sceneTerms.add(term)
+                positions.append(position)
+                position += 1
+            position += 1
+            # Skip one position, so no phrase reaches across the end of a text.
+        self._sceneTerms[scId] = sceneTerms
+
+    def _remove_scene(self, scId):
+        """Remove a scene's words from the index."""
+        for term in self._sceneTerms.pop(scId, ()):
+            scenePostings = self.postings[term]
+            del scenePostings[scId]
+            if not scenePostings:
+                del self.postings[term]
+                self._srtTerms = None
+
+    def _sort_scenes(self, scIds):
+        """Return a list of scene IDs in the novel's order."""
+        sceneIndex = self._novel.get_scene_index()
+        unsorted = len(sceneIndex.srtScenes)
+
+        def sort_key(scId):
+            try:
+                return sceneIndex.get_ordinal(scId), ''
+            except KeyError:
+                return unsorted, scId
+
+        return sorted(scIds, key=sort_key)
@@ -15,6 +15,9 @@ class WorldElement(BasicElement):
         tags -- list of tags.
         aka: str -- alternate name.
     """
+    __slots__ = ('image', 'tags', 'aka')
+
+    KWVAR_KEYS = ('Field_Link',)
 
     def __init__(self):
         """Initialize instance variables.
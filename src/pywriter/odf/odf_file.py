@@ -8,10 +8,7 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import zipfile
-import tempfile
-from shutil import rmtree
 from datetime import datetime
-from string import Template
 from pywriter.pywriter_globals import *
 from pywriter.file.file_export import FileExport
 
@@ -21,8 +18,10 @@ class OdfFile(FileExport):
 
     Public methods:
         write() -- write instance variables to the export file.
+
+    Public instance variables:
+        compressLevel: int -- compression level of the zipped ODF components (None: zlib default).
     """
-    _ODF_COMPONENTS = []
     _MIMETYPE = ''
     _SETTINGS_XML = ''
     _MANIFEST_XML = ''
@@ -30,47 +29,31 @@ class OdfFile(FileExport):
     _META_XML = ''
 
     def __init__(self, filePath, **kwargs):
-        """Create a temporary directory for zipfile generation.
+        """Initialize instance variables.
         
         Positional arguments:
             filePath: str -- path to the file represented by the Novel instance.
             
         Optional arguments:
-            kwargs -- keyword arguments to be used by subclasses.            
+            compress_level: int -- compression level from 0 (none) to 9 (best).
 
         Extends the superclass constructor,        
         """
         super().__init__(filePath, **kwargs)
-        self._tempDir = tempfile.mkdtemp(suffix='.tmp', prefix='odf_')
-        self._originalPath = self._filePath
-
-    def __del__(self):
-        """Make sure to delete the temporary directory, in case write() has not been called."""
-        self._tear_down()
-
-    def write_content_xml(self):
-        super().write()
+        self.compressLevel = kwargs.get('compress_level', None)
 
     def write(self):
         """Write instance variables to the export file.
         
         Create a template-based output file. 
         Raise the "Error" exception in case of error. 
-        Extends the super class method, adding ZIP file operations.
+        Overrides the super class method, writing the ODF components directly into the ZIP file.
+        The content is compressed as it is generated.
+        Errors raised while generating the content are passed on unchanged.
+        In any case of error, the previous file is restored, or the incomplete file is removed.
         """
-
-        #--- Create a temporary directory
-        # containing the internal structure of an ODS file except "content.xml".
-        self._set_up()
-
-        #--- Add "content.xml" to the temporary directory.
-        self._originalPath = self._filePath
-        self._filePath = f'{self._tempDir}/content.xml'
-        self.write_content_xml()
-        self._filePath = self._originalPath
-
-        #--- Pack the contents of the temporary directory into the ODF file.
-        workdir = os.getcwd()
+        components = self._get_components()
+        fragments = self._get_output()
         backedUp = False
         if os.path.isfile(self.filePath):
             try:
@@ -80,56 +63,33 @@ class OdfFile(FileExport):
             else:
                 backedUp = True
         try:
-            with zipfile.ZipFile(self.filePath, 'w') as odfTarget:
-                os.chdir(self._tempDir)
-                for file in self._ODF_COMPONENTS:
-                    odfTarget.write(file, compress_type=zipfile.ZIP_DEFLATED)
-        except:
-            os.chdir(workdir)
-            if backedUp:
-                os.replace(f'{self.filePath}.bak', self.filePath)
+            with zipfile.ZipFile(self.filePath, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=self.compressLevel) as odfTarget:
+                odfTarget.writestr('mimetype', self._MIMETYPE, compress_type=zipfile.ZIP_STORED)
+                # The ODF specification requires an uncompressed "mimetype" file at the beginning of the package.
+                for file in components:
+                    odfTarget.writestr(file, components[file])
+                with odfTarget.open('content.xml', 'w') as f:
+                    for fragment in fragments:
+                        f.write(fragment.encode('utf-8'))
+        except (OSError, zipfile.LargeZipFile):
+            self._discard_output(backedUp)
             raise Error(f'{_("Cannot create file")}: "{norm_path(self.filePath)}".')
 
-        #--- Remove temporary data.
-        os.chdir(workdir)
-        self._tear_down()
+        except:
+            self._discard_output(backedUp)
+            raise
+
         return f'{_("File written")}: "{norm_path(self.filePath)}".'
 
-    def _set_up(self):
+    def _get_components(self):
         """Helper method for ZIP file generation.
 
-        Prepare the temporary directory containing the internal structure of an ODF file except 'content.xml'.
-        Raise the "Error" exception in case of error. 
+        Return a dictionary with the internal structure of an ODF file except "mimetype" and "content.xml".
+        Key: path within the ZIP file, value: text to be written.
         """
-
-        #--- Create and open a temporary directory for the files to zip.
-        try:
-            self._tear_down()
-            os.mkdir(self._tempDir)
-            os.mkdir(f'{self._tempDir}/META-INF')
-        except:
-            raise Error(f'{_("Cannot create directory")}: "{norm_path(self._tempDir)}".')
-
-        #--- Generate mimetype.
-        try:
-            with open(f'{self._tempDir}/mimetype', 'w', encoding='utf-8') as f:
-                f.write(self._MIMETYPE)
-        except:
-            raise Error(f'{_("Cannot write file")}: "mimetype"')
-
-        #--- Generate settings.xml.
-        try:
-            with open(f'{self._tempDir}/settings.xml', 'w', encoding='utf-8') as f:
-                f.write(self._SETTINGS_XML)
-        except:
-            raise Error(f'{_("Cannot write file")}: "settings.xml"')
-
-        #--- Generate META-INF\manifest.xml.
-        try:
-            with open(f'{self._tempDir}/META-INF/manifest.xml', 'w', encoding='utf-8') as f:
-                f.write(self._MANIFEST_XML)
-        except:
-            raise Error(f'{_("Cannot write file")}: "manifest.xml"')
+        components = {}
+        components['settings.xml'] = self._SETTINGS_XML
+        components['META-INF/manifest.xml'] = self._MANIFEST_XML
 
         #--- Generate styles.xml.
         self.novel.check_locale()
@@ -137,13 +97,8 @@ class OdfFile(FileExport):
             Language=self.novel.languageCode,
             Country=self.novel.countryCode,
             )
-        template = Template(self._STYLES_XML)
-        text = template.safe_substitute(localeMapping)
-        try:
-            with open(f'{self._tempDir}/styles.xml', 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            raise Error(f'{_("Cannot write file")}: "styles.xml"')
+        template = self._get_template('_STYLES_XML')
+        components['styles.xml'] = template.safe_substitute(localeMapping)
 
         #--- Generate meta.xml with actual document metadata.
         metaMapping = dict(
@@ -152,18 +107,6 @@ class OdfFile(FileExport):
             Summary=f'<![CDATA[{self.novel.desc}]]>',
             Datetime=datetime.today().replace(microsecond=0).isoformat(),
         )
-        template = Template(self._META_XML)
-        text = template.safe_substitute(metaMapping)
-        try:
-            with open(f'{self._tempDir}/meta.xml', 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            raise Error(f'{_("Cannot write file")}: "meta.xml".')
-
-    def _tear_down(self):
-        """Delete the temporary directory containing the unpacked ODF directory structure."""
-        try:
-            rmtree(self._tempDir)
-        except:
-            pass
-
+        template = self._get_template('_META_XML')
+        components['meta.xml'] = template.safe_substitute(metaMapping)
+        return components
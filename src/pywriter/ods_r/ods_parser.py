@@ -8,16 +8,37 @@ import zipfile
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 
+NAMESPACES = dict(
+    office='urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    text='urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+    table='urn:oasis:names:tc:opendocument:xmlns:table:1.0',
+    )
+_BODY_TAG = f'{{{NAMESPACES["office"]}}}body'
+_SPREADSHEET_TAG = f'{{{NAMESPACES["office"]}}}spreadsheet'
+_TABLE_TAG = f'{{{NAMESPACES["table"]}}}table'
+_ROW_TAG = f'{{{NAMESPACES["table"]}}}table-row'
+_CELL_TAG = f'{{{NAMESPACES["table"]}}}table-cell'
+_PARAGRAPH_TAG = f'{{{NAMESPACES["text"]}}}p'
+_COLUMNS_REPEATED_ATTRIBUTE = f'{{{NAMESPACES["table"]}}}number-columns-repeated'
+
 
 class OdsParser:
     """An ODS document parser.
     
     Public methods:
         get_rows(filePath, cellsPerRow) -- Return rows and cells from an ODS document.
+        iter_rows(filePath, cellsPerRow) -- Return an iterator over the rows of an ODS document.
            
     Return a list of rows, containing lists of column cells.
     The PyWriter csv import classes thus can be reused.
+    content.xml is decompressed and parsed chunk by chunk, and each row is released after reading.
+    Rows with an empty ID cell are skipped, so the empty rows Calc appends to fill up the sheet
+    cost one element each, no matter how often they are repeated.
+    A row repeated by "number-rows-repeated" is returned once, because its copies
+    would carry the same ID.
     """
+    _CHUNK_SIZE = 0x100000
+    # Number of bytes read from the content.xml stream at once.
 
     def __init__(self):
         super().__init__()
@@ -29,66 +50,109 @@ class OdsParser:
     def get_rows(self, filePath, cellsPerRow):
         """Return a nested list with rows and cells from an ODS document.
         
+        Positional arguments:
+            filePath: str -- ODS document path.
+            cellsPerRow: int -- Number of cells per row.
+        """
+        return list(self.iter_rows(filePath, cellsPerRow))
+
+    def iter_rows(self, filePath, cellsPerRow):
+        """Return an iterator over the rows of an ODS document, yielding lists of cells.
+        
         Positional arguments:
             filePath: str -- ODS document path.
             cellsPerRow: int -- Number of cells per row.
         
-        First unzip the ODS file located at self.filePath, then parse content.xml.
+        First unzip the ODS file located at self.filePath, then parse content.xml,
+        streaming it from the ODS file. Only the first table of the spreadsheet is read.
+        Each row is yielded as soon as it is parsed.
+        Raise the "Error" exception when iterating, if the file cannot be read.
         """
-        namespaces = dict(
-            office='urn:oasis:names:tc:opendocument:xmlns:office:1.0',
-            text='urn:oasis:names:tc:opendocument:xmlns:text:1.0',
-            table='urn:oasis:names:tc:opendocument:xmlns:table:1.0',
-            )
         try:
-            with zipfile.ZipFile(filePath, 'r') as odfFile:
-                content = odfFile.read('content.xml')
+            odfFile = zipfile.ZipFile(filePath, 'r')
         except:
             raise Error(f'{_("Cannot read file")}: "{norm_path(filePath)}".')
 
-        root = ET.fromstring(content)
-
-        #--- Parse 'content.xml'.
-        body = root.find('office:body', namespaces)
-        spreadsheet = body.find('office:spreadsheet', namespaces)
-        table = spreadsheet.find('table:table', namespaces)
-        rows = []
-        for row in table.findall('table:table-row', namespaces):
-            cells = []
-            i = 0
-            for cell in row.findall('table:table-cell', namespaces):
-                content = ''
-                if cell.find('text:p', namespaces) is not None:
-                    paragraphs = []
-                    for par in cell.findall('text:p', namespaces):
-                        strippedText = ''.join(par.itertext())
-                        paragraphs.append(strippedText)
-                    content = '\n'.join(paragraphs)
-                    cells.append(content)
-                elif i > 0:
-                    cells.append(content)
-                else:
-                    # The ID cell is empty.
-                    break
-
-                i += 1
-                if i >= cellsPerRow:
-                    # The cell is excess, created by Calc.
-                    break
-
-                # Add repeated cells.
-                attribute = cell.get(f'{{{namespaces["table"]}}}number-columns-repeated')
-                if attribute:
-                    repeat = int(attribute) - 1
-                    for j in range(repeat):
-                        if i >= cellsPerRow:
-                            # The cell is excess, created by Calc.
-                            break
-
-                        cells.append(content)
-                        i += 1
-            if cells:
-                rows.append(cells)
-                # print(cells)
-        return rows
+        with odfFile:
+            try:
+                content = odfFile.open('content.xml')
+            except:
+                raise Error(f'{_("Cannot read file")}: "{norm_path(filePath)}".')
+
+            with content:
+                yield from self._parse_content(content, cellsPerRow)
+
+    def _parse_content(self, content, cellsPerRow):
+        """Parse 'content.xml' chunk by chunk and yield the rows of the first table.
 
+        Positional arguments:
+            content -- binary file object of content.xml, as returned by ZipFile.open().
+            cellsPerRow: int -- Number of cells per row.
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        path = []
+        # Open elements.
+        tablePath = [_BODY_TAG, _SPREADSHEET_TAG, _TABLE_TAG]
+        while True:
+            data = content.read(self._CHUNK_SIZE)
+            if not data:
+                break
+
+            parser.feed(data)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    path.append(element)
+                    continue
+
+                path.pop()
+                if element.tag == _ROW_TAG and [parent.tag for parent in path[1:]] == tablePath:
+                    cells = self._read_row(element, cellsPerRow)
+                    path[-1].remove(element)
+                    if cells:
+                        yield cells
+                elif element.tag == _TABLE_TAG and [parent.tag for parent in path[1:]] == tablePath[:-1]:
+                    # The first table is complete; the rest of the document is not needed.
+                    return
+
+        parser.close()
+
+    def _read_row(self, row, cellsPerRow):
+        """Return a list with the cells of a table row, or an empty list if the ID cell is empty.
+
+        Positional arguments:
+            row -- xml element of the table row.
+            cellsPerRow: int -- Number of cells per row.
+        """
+        cells = []
+        i = 0
+        for cell in row:
+            if cell.tag != _CELL_TAG:
+                continue
+
+            paragraphs = [''.join(par.itertext()) for par in cell if par.tag == _PARAGRAPH_TAG]
+            content = '\n'.join(paragraphs)
+            if paragraphs:
+                cells.append(content)
+            elif i > 0:
+                cells.append(content)
+            else:
+                # The ID cell is empty.
+                break
+
+            i += 1
+            if i >= cellsPerRow:
+                # The cell is excess, created by Calc.
+                break
+
+            # Add repeated cells.
+            attribute = cell.get(_COLUMNS_REPEATED_ATTRIBUTE)
+            if attribute:
+                repeat = int(attribute) - 1
+                for j in range(repeat):
+                    if i >= cellsPerRow:
+                        # The cell is excess, created by Calc.
+                        break
+
+                    cells.append(content)
+                    i += 1
+        return cells
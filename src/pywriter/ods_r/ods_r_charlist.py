@@ -55,3 +55,4 @@ class OdsRCharList(OdsReader):
                     self.novel.characters[crId].tags = string_to_list(cells[8], divider=self._DIVIDER)
                 if self.novel.characters[crId].notes or cells[9]:
                     self.novel.characters[crId].notes = self._convert_to_yw(cells[9])
+        self.novel.report_change()
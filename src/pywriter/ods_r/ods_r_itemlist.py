@@ -43,3 +43,4 @@ class OdsRItemList(OdsReader):
                     self.novel.items[itId].aka = self._convert_to_yw(cells[3])
                 if self.novel.items[itId].tags or cells[4]:
                     self.novel.items[itId].tags = string_to_list(cells[4], divider=self._DIVIDER)
+        self.novel.report_change()
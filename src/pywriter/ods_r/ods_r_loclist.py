@@ -43,3 +43,4 @@ class OdsRLocList(OdsReader):
                     self.novel.locations[lcId].aka = self._convert_to_yw(cells[3])
                 if self.novel.locations[lcId].tags or cells[4]:
                     self.novel.locations[lcId].tags = string_to_list(cells[4], divider=self._DIVIDER)
+        self.novel.report_change()
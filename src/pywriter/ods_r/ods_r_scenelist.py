@@ -105,3 +105,4 @@ class OdsRSceneList(OdsReader):
                 # Can't write back location IDs, because self.locations is None.
                 i += 1
                 # Can't write back item IDs, because self.items is None.
+        self.novel.report_change()
@@ -45,18 +45,28 @@ class OdsReader(File, ABC):
     def read(self):
         """Parse the file and get the instance variables.
         
-        Parse the ODS file located at filePath, fetching the rows.
-        Check the number of fields in each row.
-        Raise the "Error" exception in case of error. 
+        Set up the rows of the ODS file located at filePath as an iterator.
+        The rows are parsed while the subclass applies them, and the number 
+        of fields is checked for each row on the fly.
+        Raise the "Error" exception in case of error, when iterating the rows. 
         Overrides the superclass method.
         """
-        self._rows = []
+        self._rows = self._check_rows(OdsParser().iter_rows(self.filePath, len(self._rowTitles)))
+
+    def _check_rows(self, rows):
+        """Yield the rows, checking the number of fields in each row.
+
+        Positional arguments:
+            rows -- iterable of lists of cells.
+
+        Raise the "Error" exception in case of a wrong table structure.
+        """
         cellsPerRow = len(self._rowTitles)
-        parser = OdsParser()
-        self._rows = parser.get_rows(self.filePath, cellsPerRow)
-        for row in self._rows:
+        for row in rows:
             if len(row) != cellsPerRow:
                 print(row)
                 print(len(row), cellsPerRow)
                 raise Error(f'{_("Wrong table structure")}.')
 
+            yield row
+
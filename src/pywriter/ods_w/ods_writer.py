@@ -6,15 +6,13 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from pywriter.file.markup_translator import MarkupTranslator
 from pywriter.odf.odf_file import OdfFile
 
 
 class OdsWriter(OdfFile):
     """Generic OpenDocument spreadsheet document writer."""
     EXTENSION = '.ods'
-    _ODF_COMPONENTS = ['META-INF', 'content.xml', 'meta.xml', 'mimetype',
-                      'settings.xml', 'styles.xml', 'META-INF/manifest.xml']
-
     # Column width:
     # co1 2.000cm
     # co2 3.000cm
@@ -266,6 +264,15 @@ class OdsWriter(OdfFile):
 '''
     _MIMETYPE = 'application/vnd.oasis.opendocument.spreadsheet'
 
+    _TRANSLATOR = MarkupTranslator([
+        ('&', '&amp;'),
+        ('"', '&quot;'),
+        ("'", '&apos;'),
+        ('>', '&gt;'),
+        ('<', '&lt;'),
+        ('\n', '</text:p>\n<text:p>'),
+        ])
+
     def _convert_from_yw(self, text, quick=False):
         """Return text, converted from yw7 markup to target format.
         
@@ -277,18 +284,8 @@ class OdsWriter(OdfFile):
         
         Overrides the superclass method.
         """
-        ODS_REPLACEMENTS = [
-            ('&', '&amp;'),  # must be first!
-            ('"', '&quot;'),
-            ("'", '&apos;'),
-            ('>', '&gt;'),
-            ('<', '&lt;'),
-            ('\n', '</text:p>\n<text:p>'),
-        ]
         try:
-            text = text.rstrip()
-            for yw, od in ODS_REPLACEMENTS:
-                text = text.replace(yw, od)
+            text = self._TRANSLATOR.translate(text.rstrip())
         except AttributeError:
             text = ''
         return text
@@ -5,108 +5,223 @@ For further information see https://github.com/peter88213/
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import zipfile
-from xml import sax
+from xml.parsers import expat
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 
+NAMESPACES = dict(
+    office='urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    style='urn:oasis:names:tc:opendocument:xmlns:style:1.0',
+    fo='urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0',
+    dc='http://purl.org/dc/elements/1.1/',
+    meta='urn:oasis:names:tc:opendocument:xmlns:meta:1.0'
+    )
 
-class OdtParser(sax.ContentHandler):
+
+class OdtParser:
     """An ODT document parser, using the html.parser.HTMLParser API.
-    
+
     Public methods:
         feed_file(filePath) -- Feed an ODT file to the parser.
-    
-      Methods overriding xml.sax.ContentHandler methods:
-        characters -- Receive notification of character data.
-        endElement -- Signals the end of an element in non-namespace mode.
-        startElement -- Signals the start of an element in non-namespace mode.
-      
+
+    The content is parsed with expat callbacks. The style hierarchy is collected from styles.xml
+    and from the automatic styles of content.xml. Text formatting is taken from the automatic styles
+    and from the "Emphasis" and "Strong Emphasis" character styles.
+    Before the document body is parsed, each style's inheritance chain is resolved into
+    lookup tables for emphasis, strong emphasis, quotations, heading level, and language.
+    content.xml is decompressed and parsed chunk by chunk, so it is never held in memory as a whole.
+    Character data is passed to the client once per text run between two tags,
+    no matter where the chunk boundaries are.
     """
+    _CHUNK_SIZE = 0x100000
+    # Number of bytes read from the content.xml stream at once.
 
     def __init__(self, client):
-        super().__init__()
-        self._emTags = ['Emphasis']
-        self._strongTags = ['Strong_20_Emphasis']
-        self._blockquoteTags = ['Quotations']
-        self._languageTags = {}
-        self._headingTags = {}
+        """Initialize instance variables.
+
+        Positional arguments:
+            client -- object with an HTMLParser-like API, receiving the document's content.
+        """
+        self._emStyles = set()
+        self._strongStyles = set()
+        self._quotationStyles = {'Quotations'}
+        self._headingStyles = {}
+        # key: style name, value: heading tag.
+        self._languageStyles = {}
+        # key: style name, value: locale.
+        self._styles = {}
+        # key: style name, value: [parent style name, font style, font weight, locale].
         self._heading = None
         self._paragraph = False
         self._commentParagraphCount = None
+        self._comment = ''
         self._blockquote = False
         self._list = False
         self._span = []
+        self._spanTagCounts = []
+        # Number of tags opened by each open text span.
         self._style = None
+        self._text = []
+        # Character data received since the last tag.
         self._client = client
+        self._startHandlers = {
+            'text:p': self._start_paragraph,
+            'text:span': self._start_span,
+            'text:section': self._start_section,
+            'office:annotation': self._start_annotation,
+            'text:h': self._start_heading,
+            'text:list-item': self._start_list_item,
+            'style:style': self._start_style,
+            'style:text-properties': self._start_text_properties,
+            'text:s': self._start_space,
+            'office:body': self._start_body,
+            }
+        self._endHandlers = {
+            'text:p': self._end_paragraph,
+            'text:span': self._end_span,
+            'text:section': self._end_section,
+            'office:annotation': self._end_annotation,
+            'text:h': self._end_heading,
+            'text:list-item': self._end_list_item,
+            'style:style': self._end_style,
+            'office:body': self._end_body,
+            }
 
     def feed_file(self, filePath):
         """Feed an ODT file to the parser.
-        
+
         Positional arguments:
             filePath: str -- ODT document path.
-        
-        First unzip the ODT file located at self.filePath, 
-        and get languageCode, countryCode, title, desc, and authorName,        
-        Then call the sax parser for content.xml.
-        """
-        namespaces = dict(
-            office='urn:oasis:names:tc:opendocument:xmlns:office:1.0',
-            style='urn:oasis:names:tc:opendocument:xmlns:style:1.0',
-            fo='urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0',
-            dc='http://purl.org/dc/elements/1.1/',
-            meta='urn:oasis:names:tc:opendocument:xmlns:meta:1.0'
-            )
 
+        First unzip the ODT file located at self.filePath,
+        and get languageCode, countryCode, title, desc, and authorName,
+        Then parse content.xml, streaming it from the ODT file.
+        """
         try:
-            with zipfile.ZipFile(filePath, 'r') as odfFile:
-                content = odfFile.read('content.xml')
+            odfFile = zipfile.ZipFile(filePath, 'r')
+        except:
+            raise Error(f'{_("Cannot read file")}: "{norm_path(filePath)}".')
+
+        with odfFile:
+            try:
+                content = odfFile.open('content.xml')
                 styles = odfFile.read('styles.xml')
                 try:
                     meta = odfFile.read('meta.xml')
                 except KeyError:
                     # meta.xml may be missing in outlines created with e.g. FreeMind
                     meta = None
-        except:
-            raise Error(f'{_("Cannot read file")}: "{norm_path(filePath)}".')
+            except:
+                raise Error(f'{_("Cannot read file")}: "{norm_path(filePath)}".')
+
+            with content:
+                self._read_styles(styles)
+                if meta:
+                    self._read_meta(meta)
+                self._parse_content(content)
+
+    def _read_styles(self, styles):
+        """Get language and country, and the common styles from 'styles.xml'.
+
+        Positional arguments:
+            styles: bytes -- content of styles.xml.
+        """
 
-        #--- Get language and country from 'styles.xml'.
         root = ET.fromstring(styles)
-        styles = root.find('office:styles', namespaces)
-        for defaultStyle in styles.findall('style:default-style', namespaces):
-            if defaultStyle.get(f'{{{namespaces["style"]}}}family') == 'paragraph':
-                textProperties = defaultStyle.find('style:text-properties', namespaces)
-                lngCode = textProperties.get(f'{{{namespaces["fo"]}}}language')
-                ctrCode = textProperties.get(f'{{{namespaces["fo"]}}}country')
+        styles = root.find('office:styles', NAMESPACES)
+        for defaultStyle in styles.findall('style:default-style', NAMESPACES):
+            if defaultStyle.get(f'{{{NAMESPACES["style"]}}}family') == 'paragraph':
+                textProperties = defaultStyle.find('style:text-properties', NAMESPACES)
+                lngCode = textProperties.get(f'{{{NAMESPACES["fo"]}}}language')
+                ctrCode = textProperties.get(f'{{{NAMESPACES["fo"]}}}country')
                 self._client.handle_starttag('body', [('language', lngCode), ('country', ctrCode)])
                 break
 
-        #--- Get title, description, and author from 'meta.xml'.
-        if meta:
-            root = ET.fromstring(meta)
-            meta = root.find('office:meta', namespaces)
-            title = meta.find('dc:title', namespaces)
-            if title is not None:
-                if title.text:
-                    self._client.handle_starttag('title', [()])
-                    self._client.handle_data(title.text)
-                    self._client.handle_endtag('title')
-            author = meta.find('meta:initial-creator', namespaces)
-            if author is not None:
-                if author.text:
-                    self._client.handle_starttag('meta', [('', 'author'), ('', author.text)])
-            desc = meta.find('dc:description', namespaces)
-            if desc is not None:
-                if desc.text:
-                    self._client.handle_starttag('meta', [('', 'description'), ('', desc.text)])
-
-        #--- Parse 'content.xml'.
-        sax.parseString(content, self)
-
-    def characters(self, content):
-        """Receive notification of character data.
-        
-        Overrides the xml.sax.ContentHandler method             
+        for commonStyle in styles.findall('style:style', NAMESPACES):
+            styleName = commonStyle.get(f'{{{NAMESPACES["style"]}}}name')
+            parentStyleName = commonStyle.get(f'{{{NAMESPACES["style"]}}}parent-style-name', '')
+            self._styles[styleName] = [parentStyleName, None, None, None]
+            # The common styles' text properties are the document's design, not formatting.
+        self._styles.setdefault('Emphasis', ['', None, None, None])[1] = 'italic'
+        self._styles.setdefault('Strong_20_Emphasis', ['', None, None, None])[2] = 'bold'
+
+    def _read_meta(self, meta):
+        """Get title, description, and author from 'meta.xml'.
+
+        Positional arguments:
+            meta: bytes -- content of meta.xml.
+        """
+        root = ET.fromstring(meta)
+        meta = root.find('office:meta', NAMESPACES)
+        title = meta.find('dc:title', NAMESPACES)
+        if title is not None:
+            if title.text:
+                self._client.handle_starttag('title', [()])
+                self._client.handle_data(title.text)
+                self._client.handle_endtag('title')
+        author = meta.find('meta:initial-creator', NAMESPACES)
+        if author is not None:
+            if author.text:
+                self._client.handle_starttag('meta', [('', 'author'), ('', author.text)])
+        desc = meta.find('dc:description', NAMESPACES)
+        if desc is not None:
+            if desc.text:
+                self._client.handle_starttag('meta', [('', 'description'), ('', desc.text)])
+
+    def _parse_content(self, content):
+        """Parse 'content.xml' chunk by chunk.
+
+        Positional arguments:
+            content -- binary file object of content.xml, as returned by ZipFile.open().
+        """
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._characters
+        while True:
+            data = content.read(self._CHUNK_SIZE)
+            if not data:
+                break
+
+            parser.Parse(data, False)
+        parser.Parse(b'', True)
+        if self._text:
+            self._flush_text()
+
+    def _start_element(self, name, attrs):
+        """Dispatch a start tag to its handler.
+
+        Positional arguments:
+            name: str -- element name, with namespace prefix.
+            attrs: dict -- the element's attributes.
+        """
+        if self._text:
+            self._flush_text()
+        handler = self._startHandlers.get(name, None)
+        if handler is not None:
+            handler(attrs)
+
+    def _end_element(self, name):
+        """Dispatch an end tag to its handler.
+
+        Positional arguments:
+            name: str -- element name, with namespace prefix.
         """
+        if self._text:
+            self._flush_text()
+        handler = self._endHandlers.get(name, None)
+        if handler is not None:
+            handler()
+
+    def _characters(self, content):
+        """Collect character data until the next tag."""
+        self._text.append(content)
+
+    def _flush_text(self):
+        """Pass the collected character data to the client."""
+        content = ''.join(self._text)
+        self._text = []
         if self._commentParagraphCount is not None:
             if self._commentParagraphCount == 1:
                 self._comment = f'{self._comment}{content}'
@@ -115,122 +230,188 @@ class OdtParser(sax.ContentHandler):
         elif self._heading is not None:
             self._client.handle_data(content)
 
-    def endElement(self, name):
-        """Signals the end of an element in non-namespace mode.
-        
-        Overrides the xml.sax.ContentHandler method     
+    def _resolve_styles(self):
+        """Resolve the inheritance chains of the styles into the lookup tables.
+
+        Walk up each style's chain of parent styles. For each text property, 
+        the nearest style that defines it counts. A style inherits the quotation 
+        and heading meaning from any style in its chain.
         """
-        if name == 'text:p':
-            if self._commentParagraphCount is None:
-                while self._span:
-                    self._client.handle_endtag(self._span.pop())
-                if self._blockquote:
-                    self._client.handle_endtag('blockquote')
-                    self._blockquote = False
-                elif self._heading:
-                    self._client.handle_endtag(self._heading)
-                    self._heading = None
-                else:
-                    self._client.handle_endtag('p')
-                self._paragraph = False
-        elif name == 'text:span':
-            if self._span:
+        for styleName in self._styles:
+            fontStyle = None
+            fontWeight = None
+            locale = None
+            heading = None
+            isQuotation = False
+            chainStyle = styleName
+            visited = set()
+            while chainStyle and not chainStyle in visited:
+                visited.add(chainStyle)
+                parent, chainFontStyle, chainFontWeight, chainLocale = self._styles.get(chainStyle, ('', None, None, None))
+                # The parent style may be undefined.
+                if fontStyle is None:
+                    fontStyle = chainFontStyle
+                if fontWeight is None:
+                    fontWeight = chainFontWeight
+                if locale is None:
+                    locale = chainLocale
+                if heading is None and chainStyle.startswith('Heading') and chainStyle[-1].isdigit():
+                    heading = f'h{chainStyle[-1]}'
+                if chainStyle in self._quotationStyles:
+                    isQuotation = True
+                chainStyle = parent
+            if fontStyle == 'italic':
+                self._emStyles.add(styleName)
+            if fontWeight == 'bold':
+                self._strongStyles.add(styleName)
+            if isQuotation:
+                self._quotationStyles.add(styleName)
+            if heading is not None and not styleName.startswith('Heading'):
+                self._headingStyles[styleName] = heading
+            if locale is not None:
+                self._languageStyles[styleName] = locale
+
+    def _start_paragraph(self, attrs):
+        """Open a paragraph, a quotation, a heading, or a list item."""
+        style = attrs.get('text:style-name', '')
+        param = [()]
+        if style in self._languageStyles:
+            param = [('lang', self._languageStyles[style])]
+        if self._commentParagraphCount is not None:
+            self._commentParagraphCount += 1
+        elif style in self._quotationStyles:
+            self._client.handle_starttag('blockquote', param)
+            self._paragraph = True
+            self._blockquote = True
+        elif style.startswith('Heading'):
+            self._heading = f'h{style[-1]}'
+            self._client.handle_starttag(self._heading, [()])
+        elif style in self._headingStyles:
+            self._heading = self._headingStyles[style]
+            self._client.handle_starttag(self._heading, [()])
+        elif self._list:
+            self._client.handle_starttag('li', [()])
+            self._paragraph = True
+        else:
+            self._client.handle_starttag('p', param)
+            self._paragraph = True
+        if style in self._emStyles:
+            self._span.append('em')
+            self._client.handle_starttag('em', [()])
+        if style in self._strongStyles:
+            self._span.append('strong')
+            self._client.handle_starttag('strong', [()])
+
+    def _end_paragraph(self):
+        """Close the paragraph and its open spans."""
+        if self._commentParagraphCount is None:
+            while self._span:
                 self._client.handle_endtag(self._span.pop())
-        elif name == 'text:section':
-            self._client.handle_endtag('div')
-        elif name == 'office:annotation':
-            self._client.handle_comment(self._comment)
-            self._commentParagraphCount = None
-        elif name == 'text:h':
-            self._client.handle_endtag(self._heading)
-            self._heading = None
-        elif name == 'text:list-item':
-            self._list = False
-        elif name == 'style:style':
-            self._style = None
-
-    def startElement(self, name, attrs):
-        """Signals the start of an element in non-namespace mode.
-        
-        Overrides the xml.sax.ContentHandler method             
-        """
-        xmlAttributes = {}
-        for attribute in attrs.items():
-            attrKey, attrValue = attribute
-            xmlAttributes[attrKey] = attrValue
-        style = xmlAttributes.get('text:style-name', '')
-        if name == 'text:p':
-            param = [()]
-            if style in self._languageTags:
-                param = [('lang', self._languageTags[style])]
-            if self._commentParagraphCount is not None:
-                self._commentParagraphCount += 1
-            elif style in self._blockquoteTags:
-                self._client.handle_starttag('blockquote', param)
-                self._paragraph = True
-                self._blockquote = True
-            elif style.startswith('Heading'):
-                self._heading = f'h{style[-1]}'
-                self._client.handle_starttag(self._heading, [()])
-            elif style in self._headingTags:
-                self._heading = self._headingTags[style]
-                self._client.handle_starttag(self._heading, [()])
-            elif self._list:
-                self._client.handle_starttag('li', [()])
-                self._paragraph = True
+            self._spanTagCounts.clear()
+            if self._blockquote:
+                self._client.handle_endtag('blockquote')
+                self._blockquote = False
+            elif self._heading:
+                self._client.handle_endtag(self._heading)
+                self._heading = None
             else:
-                self._client.handle_starttag('p', param)
-                self._paragraph = True
-            if style in self._emTags:
-                self._span.append('em')
-                self._client.handle_starttag('em', [()])
-            if style in self._strongTags:
-                self._span.append('strong')
-                self._client.handle_starttag('strong', [()])
-        elif name == 'text:span':
-            if style in self._emTags:
-                self._span.append('em')
-                self._client.handle_starttag('em', [()])
-            if style in self._strongTags:
-                self._span.append('strong')
-                self._client.handle_starttag('strong', [()])
-            if style in self._languageTags:
-                self._span.append('lang')
-                self._client.handle_starttag('lang', [('lang', self._languageTags[style])])
-        elif name == 'text:section':
-            sectionId = xmlAttributes['text:name']
-            self._client.handle_starttag('div', [('id', sectionId)])
-        elif name == 'office:annotation':
-            self._commentParagraphCount = 0
-            self._comment = ''
-        elif name == 'text:h':
-            try:
-                self._heading = f'h{xmlAttributes["text:outline-level"]}'
-            except:
-                self._heading = f'h{style[-1]}'
-            self._client.handle_starttag(self._heading, [()])
-        elif name == 'text:list-item':
-            self._list = True
-        elif name == 'style:style':
-            self._style = xmlAttributes.get('style:name', None)
-            styleName = xmlAttributes.get('style:parent-style-name', '')
-            if styleName.startswith('Heading'):
-                self._headingTags[self._style] = f'h{styleName[-1]}'
-            elif styleName == 'Quotations':
-                self._blockquoteTags.append(self._style)
-        elif name == 'style:text-properties':
-            if xmlAttributes.get('fo:font-style', None) == 'italic':
-                self._emTags.append(self._style)
-            if xmlAttributes.get('fo:font-weight', None) == 'bold':
-                self._strongTags.append(self._style)
-            if xmlAttributes.get('fo:language', False):
-                lngCode = xmlAttributes['fo:language']
-                ctrCode = xmlAttributes['fo:country']
-                if ctrCode != 'none':
-                    locale = f'{lngCode}-{ctrCode}'
-                else:
-                    locale = lngCode
-                self._languageTags[self._style] = locale
-        elif name == 'text:s':
-            self._client.handle_starttag('s', [()])
+                self._client.handle_endtag('p')
+            self._paragraph = False
+
+    def _start_span(self, attrs):
+        """Open the emphasis, strong emphasis, and language tags of a text span."""
+        style = attrs.get('text:style-name', '')
+        spanTags = len(self._span)
+        if style in self._emStyles:
+            self._span.append('em')
+            self._client.handle_starttag('em', [()])
+        if style in self._strongStyles:
+            self._span.append('strong')
+            self._client.handle_starttag('strong', [()])
+        if style in self._languageStyles:
+            self._span.append('lang')
+            self._client.handle_starttag('lang', [('lang', self._languageStyles[style])])
+        self._spanTagCounts.append(len(self._span) - spanTags)
+
+    def _end_span(self):
+        """Close the tags opened by the text span."""
+        if self._spanTagCounts:
+            for __ in range(self._spanTagCounts.pop()):
+                if self._span:
+                    self._client.handle_endtag(self._span.pop())
+
+    def _start_section(self, attrs):
+        """Open a section; its name is the ID of a chapter or a scene."""
+        self._client.handle_starttag('div', [('id', attrs['text:name'])])
+
+    def _end_section(self):
+        """Close a section."""
+        self._client.handle_endtag('div')
+
+    def _start_annotation(self, attrs):
+        """Start collecting a comment."""
+        self._commentParagraphCount = 0
+        self._comment = ''
+
+    def _end_annotation(self):
+        """Pass the collected comment to the client."""
+        self._client.handle_comment(self._comment)
+        self._commentParagraphCount = None
+
+    def _start_heading(self, attrs):
+        """Open a heading with its outline level."""
+        try:
+            self._heading = f'h{attrs["text:outline-level"]}'
+        except:
+            self._heading = f'h{attrs.get("text:style-name", "")[-1]}'
+        self._client.handle_starttag(self._heading, [()])
+
+    def _end_heading(self):
+        """Close a heading."""
+        self._client.handle_endtag(self._heading)
+        self._heading = None
+
+    def _start_list_item(self, attrs):
+        """Start a list item."""
+        self._list = True
+
+    def _end_list_item(self):
+        """End a list item."""
+        self._list = False
+
+    def _start_style(self, attrs):
+        """Collect a style definition, to be resolved before the document body is parsed."""
+        self._style = attrs.get('style:name', None)
+        self._styles[self._style] = [attrs.get('style:parent-style-name', ''), None, None, None]
+
+    def _end_style(self):
+        """End a style definition."""
+        self._style = None
+
+    def _start_text_properties(self, attrs):
+        """Collect the text properties of the current style."""
+        if self._style is None:
+            return
+
+        styleDefinition = self._styles[self._style]
+        styleDefinition[1] = attrs.get('fo:font-style', None)
+        styleDefinition[2] = attrs.get('fo:font-weight', None)
+        lngCode = attrs.get('fo:language', None)
+        if lngCode:
+            ctrCode = attrs.get('fo:country', None)
+            if ctrCode and ctrCode != 'none':
+                styleDefinition[3] = f'{lngCode}-{ctrCode}'
+            else:
+                styleDefinition[3] = lngCode
+
+    def _start_space(self, attrs):
+        """Pass a space to the client."""
+        self._client.handle_starttag('s', [()])
+
+    def _start_body(self, attrs):
+        """Resolve the styles, which are complete at the beginning of the document body."""
+        self._resolve_styles()
 
+    def _end_body(self):
+        """Pass the end of the document body to the client."""
+        self._client.handle_endtag('body')
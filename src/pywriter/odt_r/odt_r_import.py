@@ -43,13 +43,15 @@ class OdtRImport(OdtRFormatted):
             filePath: str -- path to the file represented by the Novel instance.
             
         The ODT parser works like a state machine. 
-        Chapter and scene count must be saved between the transitions.         
+        Scene count and the current scene's paragraphs must be saved between the transitions.         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
-        self._chCount = 0
+        self._paragraphs = []
+        # Paragraphs of the current scene, committed when the scene is closed.
         self._scCount = 0
         self._heading = False
+        self._sceneStart = False
 
     def handle_comment(self, data):
         """Process inline comments within scene content.
@@ -61,7 +63,7 @@ class OdtRImport(OdtRFormatted):
         Overrides the superclass method.
         """
         if self._scId is not None:
-            if not self._lines:
+            if self._sceneStart and not self._lines:
                 # Comment is at scene start
                 try:
                     self.novel.scenes[self._scId].title = data.strip()
@@ -80,7 +82,7 @@ class OdtRImport(OdtRFormatted):
         Overrides the superclass method.
         """
         if self._scId is not None and self._SCENE_DIVIDER in data:
-            self._scId = None
+            self._close_scene()
         else:
             self._lines.append(data)
 
@@ -96,17 +98,12 @@ class OdtRImport(OdtRFormatted):
             if self._language:
                 self._lines.append(f'[/lang={self._language}]')
                 self._language = ''
-            self._lines.append('\n')
             if self._scId is not None:
-                sceneText = ''.join(self._lines).rstrip()
-                sceneText = self._cleanup_scene(sceneText)
-                self.novel.scenes[self._scId].sceneContent = sceneText
-                if self.novel.scenes[self._scId].wordCount < self._LOW_WORDCOUNT:
-                    self.novel.scenes[self._scId].status = 1
-                    # Outline
-                else:
-                    self.novel.scenes[self._scId].status = 2
-                    # Draft
+                self._paragraphs.append(''.join(self._lines))
+                self._lines = []
+                self._sceneStart = False
+            else:
+                self._lines.append('\n')
         elif tag == 'em' and not self._heading:
             self._lines.append('[/i]')
         elif tag == 'strong' and not self._heading:
@@ -121,6 +118,8 @@ class OdtRImport(OdtRFormatted):
             self._heading = False
         elif tag == 'title':
             self.novel.title = ''.join(self._lines)
+        elif tag == 'body':
+            self._close_scene()
 
     def handle_starttag(self, tag, attrs):
         """Recognize the paragraph's beginning.
@@ -134,8 +133,10 @@ class OdtRImport(OdtRFormatted):
         if tag == 'p':
             if self._scId is None and self._chId is not None:
                 self._lines = []
+                self._paragraphs = []
                 self._scCount += 1
-                self._scId = str(self._scCount)
+                self._scId = self.novel.create_id(self.novel.scenes)
+                self._sceneStart = True
                 self.novel.scenes[self._scId] = Scene()
                 self.novel.chapters[self._chId].srtScenes.append(self._scId)
                 self.novel.scenes[self._scId].status = 1
@@ -160,10 +161,9 @@ class OdtRImport(OdtRFormatted):
                     self.novel.languages.append(self._language)
                 self._lines.append(f'[lang={self._language}]')
         elif tag in ('h1', 'h2'):
-            self._scId = None
+            self._close_scene()
             self._lines = []
-            self._chCount += 1
-            self._chId = str(self._chCount)
+            self._chId = self.novel.create_id(self.novel.chapters)
             self.novel.chapters[self._chId] = Chapter()
             self.novel.chapters[self._chId].srtScenes = []
             self.novel.srtChapters.append(self._chId)
@@ -174,7 +174,7 @@ class OdtRImport(OdtRFormatted):
                 self.novel.chapters[self._chId].chLevel = 0
             self._heading = True
         elif tag == 'div':
-            self._scId = None
+            self._close_scene()
             self._chId = None
         elif tag == 'meta':
             if attrs[0][1] == 'author':
@@ -215,3 +215,22 @@ class OdtRImport(OdtRFormatted):
         self.novel.languages = []
         super().read()
 
+    def _close_scene(self):
+        """Set the content of the current scene and the scene status.
+        
+        The scene content is assembled and cleaned up once, when the scene is complete.
+        """
+        if self._scId is None:
+            return
+
+        scene = self.novel.scenes[self._scId]
+        if self._paragraphs:
+            scene.sceneContent = self._cleanup_scene('\n'.join(self._paragraphs).rstrip())
+            self._paragraphs = []
+            if scene.wordCount < self._LOW_WORDCOUNT:
+                scene.status = 1
+                # Outline
+            else:
+                scene.status = 2
+                # Draft
+        self._scId = None
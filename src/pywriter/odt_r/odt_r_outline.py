@@ -37,13 +37,12 @@ class OdtROutline(OdtReader):
         Positional arguments:
             filePath: str -- path to the file represented by the Novel instance.
             
-        The ODT parser works like a state machine. 
-        Chapter and scene count must be saved between the transitions.         
+        The paragraphs of the current chapter or scene description must be saved between the transitions.         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
-        self._chCount = 0
-        self._scCount = 0
+        self._paragraphs = []
+        # Paragraphs of the current description, committed at the next heading.
 
     def handle_data(self, data):
         """Collect data within scene sections.
@@ -63,22 +62,19 @@ class OdtROutline(OdtReader):
 
         Overrides the superclass method.
         """
-        text = ''.join(self._lines)
         if tag == 'p':
-            text = f'{text.strip()}\n'
-            self._lines = [text]
-            if self._scId is not None:
-                self.novel.scenes[self._scId].desc = text
-            elif self._chId is not None:
-                self.novel.chapters[self._chId].desc = text
+            self._paragraphs.append(''.join(self._lines).rstrip())
+            self._lines = []
         elif tag in ('h1', 'h2'):
-            self.novel.chapters[self._chId].title = text.strip()
+            self.novel.chapters[self._chId].title = ''.join(self._lines).strip()
             self._lines = []
         elif tag == 'h3':
-            self.novel.scenes[self._scId].title = text.strip()
+            self.novel.scenes[self._scId].title = ''.join(self._lines).strip()
             self._lines = []
         elif tag == 'title':
-            self.novel.title = text.strip()
+            self.novel.title = ''.join(self._lines).strip()
+        elif tag == 'body':
+            self._close_description()
 
     def handle_starttag(self, tag, attrs):
         """Recognize the paragraph's beginning.
@@ -90,10 +86,10 @@ class OdtROutline(OdtReader):
         Overrides the superclass method.
         """
         if tag in ('h1', 'h2'):
+            self._close_description()
             self._scId = None
             self._lines = []
-            self._chCount += 1
-            self._chId = str(self._chCount)
+            self._chId = self.novel.create_id(self.novel.chapters)
             self.novel.chapters[self._chId] = Chapter()
             self.novel.chapters[self._chId].srtScenes = []
             self.novel.srtChapters.append(self._chId)
@@ -103,15 +99,16 @@ class OdtROutline(OdtReader):
             else:
                 self.novel.chapters[self._chId].chLevel = 0
         elif tag == 'h3':
+            self._close_description()
             self._lines = []
-            self._scCount += 1
-            self._scId = str(self._scCount)
+            self._scId = self.novel.create_id(self.novel.scenes)
             self.novel.scenes[self._scId] = Scene()
             self.novel.chapters[self._chId].srtScenes.append(self._scId)
             self.novel.scenes[self._scId].sceneContent = ''
             self.novel.scenes[self._scId].status = 1
             self.novel.scenes[self._scId].scType = 0
         elif tag == 'div':
+            self._close_description()
             self._scId = None
             self._chId = None
         elif tag == 'meta':
@@ -131,3 +128,17 @@ class OdtROutline(OdtReader):
                         self.novel.countryCode = attr[1]
         elif tag == 's':
             self._lines.append(' ')
+
+    def _close_description(self):
+        """Set the description of the current scene or chapter, if any paragraphs were read.
+        
+        Leading and trailing whitespace of the description is removed, and a line break is appended.
+        Empty paragraphs are left out.
+        """
+        if self._paragraphs:
+            text = '\n'.join([paragraph for paragraph in self._paragraphs if paragraph]).strip()
+            if self._scId is not None:
+                self.novel.scenes[self._scId].desc = f'{text}\n'
+            elif self._chId is not None:
+                self.novel.chapters[self._chId].desc = f'{text}\n'
+            self._paragraphs = []
@@ -19,34 +19,45 @@ class OdtRProof(OdtRFormatted):
         handle_starttag -- Recognize the paragraph's beginning.
     
     Import a manuscript with visibly tagged chapters and scenes.
+    The scene markers are recognized by the plain text of the whole paragraph,
+    so they are found even if the word processor has split them up by formatting.
     """
     DESCRIPTION = _('Tagged manuscript for proofing')
     SUFFIX = '_proof'
+    _PARAGRAPH_TAGS = ('p', 'li', 'blockquote', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+    # Tags beginning or ending a paragraph that may hold a scene marker.
+    _SCENE_START_MARKER = re.compile(r'\[ScID\D*([0-9]+)')
+
+    def __init__(self, filePath, **kwargs):
+        """Initialize local instance variables for parsing.
+
+        Positional arguments:
+            filePath: str -- path to the file represented by the Novel instance.
+            
+        The plain text of the current paragraph and its position in the lines 
+        must be saved between the transitions.         
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath)
+        self._paragraphText = []
+        # Plain text of the current paragraph, for recognizing the scene markers.
+        self._paragraphStart = 0
+        # Number of lines collected before the current paragraph.
 
     def handle_data(self, data):
-        """Parse the paragraphs and build the document structure.      
+        """Collect data within scene sections, and the paragraph's plain text.      
 
         Positional arguments:
             data: str -- text to be parsed. 
         
         Overrides the superclass method.
         """
-        try:
-            if self._skip_data:
-                self._skip_data = False
-            elif '[ScID' in data:
-                self._scId = re.search(r'[0-9]+', data).group()
-                self._lines = []
-            elif '[/ScID' in data:
-                if self._scId in self.novel.scenes:
-                    text = ''.join(self._lines)
-                    self.novel.scenes[self._scId].sceneContent = self._cleanup_scene(text).strip()
-                    self._lines = []
-                self._scId = None
-            elif self._scId is not None:
+        if self._skip_data:
+            self._skip_data = False
+        else:
+            self._paragraphText.append(data)
+            if self._scId is not None:
                 self._lines.append(data)
-        except:
-            raise Error(f'{_("Corrupt marker")}: "{data}"')
 
     def handle_endtag(self, tag):
         """Recognize the paragraph's end.      
@@ -56,11 +67,13 @@ class OdtRProof(OdtRFormatted):
 
         Overrides the superclass method.
         """
-        if tag in ['p', 'h2', 'h1', 'blockquote']:
-            self._lines.append('\n')
-            if self._language:
-                self._lines.append(f'[/lang={self._language}]')
-                self._language = ''
+        if tag in self._PARAGRAPH_TAGS:
+            if tag in ['p', 'h2', 'h1', 'blockquote']:
+                self._lines.append('\n')
+                if self._language:
+                    self._lines.append(f'[/lang={self._language}]')
+                    self._language = ''
+            self._read_marker()
         elif tag == 'em':
             self._lines.append('[/i]')
         elif tag == 'strong':
@@ -79,6 +92,9 @@ class OdtRProof(OdtRFormatted):
         
         Overrides the superclass method.
         """
+        if tag in self._PARAGRAPH_TAGS:
+            self._paragraphText = []
+            self._paragraphStart = len(self._lines)
         if tag == 'em':
             self._lines.append('[i]')
         elif tag == 'strong':
@@ -122,3 +138,25 @@ class OdtRProof(OdtRFormatted):
         elif tag == 's':
             self._lines.append(' ')
 
+    def _read_marker(self):
+        """Build the document structure, if the paragraph just completed is a scene marker.
+        
+        A scene start marker begins collecting the scene content.
+        A scene end marker completes the scene, leaving out the marker paragraph.
+        Raise the "Error" exception in case of a corrupt marker.
+        """
+        text = ''.join(self._paragraphText)
+        self._paragraphText = []
+        if '[ScID' in text:
+            match = self._SCENE_START_MARKER.search(text)
+            if match is None:
+                raise Error(f'{_("Corrupt marker")}: "{text}"')
+
+            self._scId = match.group(1)
+            self._lines = []
+        elif '[/ScID' in text:
+            if self._scId in self.novel.scenes:
+                text = ''.join(self._lines[:self._paragraphStart])
+                self.novel.scenes[self._scId].sceneContent = self._cleanup_scene(text).strip()
+            self._lines = []
+            self._scId = None
@@ -117,6 +117,7 @@ class OdtReader(File, ABC):
     def read(self):
         parser = OdtParser(self)
         parser.feed_file(self.filePath)
+        self.novel.report_change()
 
     def _convert_to_yw(self, text):
         """Convert html formatting tags to yWriter 7 raw markup.
@@ -66,10 +66,16 @@ class OdtWExport(OdtWFormatted):
         return chapterMapping
 
     def _get_replacements(self):
+        """Return a list of tuples: (yWriter markup, ODT markup).
+        
+        Comments and notes are converted by _get_fragments(), 
+        so the translator compiled from the replacements doesn't depend on the author name.
+        Overrides the superclass method.
+        """
         return [
-                ('\n\n', ('</text:p>\r<text:p text:style-name="First_20_line_20_indent" />\r'
+                ('\n\n', ('</text:p>\n<text:p text:style-name="First_20_line_20_indent" />\n'
                           '<text:p text:style-name="Text_20_body">')),
-                ('\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent">'),
+                ('\n', '</text:p>\n<text:p text:style-name="First_20_line_20_indent">'),
                 ('\r', '\n'),
                 ('[i]', '<text:span text:style-name="Emphasis">'),
                 ('[/i]', '</text:span>'),
@@ -77,7 +83,12 @@ class OdtWExport(OdtWFormatted):
                 ('[/b]', '</text:span>'),
                 ]
 
-    def _get_text(self):
+    def _get_fragments(self):
+        """Call all processing methods.
+        
+        Generate the strings to be written to the output file.
+        Extends the superclass method, converting comments, footnotes, and endnotes.
+        """
 
         def replace_note(match):
             noteType = match.group(1)
@@ -100,19 +111,17 @@ class OdtWExport(OdtWFormatted):
                     f'text:label="{noteLabel}">*</text:note-citation><text:note-body>'
                     f'<text:p text:style-name="{noteStyle}">{text}</text:p></text:note-body></text:note>')
 
-        text = super()._get_text()
-
-        #--- Convert comments, footnotes, and endnotes.
-        # This is done once for the entire document because of the document-wide note numbering.
-        if text.find('/*') > 0:
-            text = text.replace('\r', '@r@').replace('\n', '@n@')
-            self._noteCounter = 0
-            self._noteNumber = 0
-            simpleComment = (f'<office:annotation><dc:creator>{self.novel.authorName}'
-                             '</dc:creator><text:p>\\1</text:p></office:annotation>'
-                             )
-            text = re.sub(r'\/\* *@([ef]n\**) (.*?)\*\/', replace_note, text)
-            text = re.sub(r'\/\*(.*?)\*\/', simpleComment, text)
-            text = text.replace(r'@r@', '\r').replace('@n@', '\n')
-        return text
+        self._noteCounter = 0
+        self._noteNumber = 0
+        # The note numbering is document-wide.
+        simpleComment = (f'<office:annotation><dc:creator>{self.novel.authorName}'
+                         '</dc:creator><text:p>\\1</text:p></office:annotation>'
+                         )
+        for text in super()._get_fragments():
+            if '/*' in text:
+                text = text.replace('\r', '@r@').replace('\n', '@n@')
+                text = re.sub(r'\/\* *@([ef]n\**) (.*?)\*\/', replace_note, text)
+                text = re.sub(r'\/\*(.*?)\*\/', simpleComment, text)
+                text = text.replace(r'@r@', '\r').replace('@n@', '\n')
+            yield text
 
@@ -5,8 +5,9 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import re
-from string import Template
+from itertools import chain
 from pywriter.pywriter_globals import *
+from pywriter.file.markup_translator import MarkupTranslator
 from pywriter.odt_w.odt_writer import OdtWriter
 
 
@@ -18,6 +19,11 @@ class OdtWFormatted(OdtWriter):
     
     Provide methods for processing chapters with formatted text.
     """
+    _DISCARDED_MARKUP = r'\[\/*[h|c|r|s|u]\d*\]'
+    # Highlighting, alignment, strikethrough, and underline tags.
+
+    _QUICK_TRANSLATOR = MarkupTranslator(OdtWriter._XML_ENTITIES, discard=_DISCARDED_MARKUP)
+
     _CONTENT_XML_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
 
 <office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:number="urn:oasis:names:tc:opendocument:xmlns:datastyle:1.0" xmlns:svg="urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0" xmlns:chart="urn:oasis:names:tc:opendocument:xmlns:chart:1.0" xmlns:dr3d="urn:oasis:names:tc:opendocument:xmlns:dr3d:1.0" xmlns:math="http://www.w3.org/1998/Math/MathML" xmlns:form="urn:oasis:names:tc:opendocument:xmlns:form:1.0" xmlns:script="urn:oasis:names:tc:opendocument:xmlns:script:1.0" xmlns:ooo="http://openoffice.org/2004/office" xmlns:ooow="http://openoffice.org/2004/writer" xmlns:oooc="http://openoffice.org/2004/calc" xmlns:dom="http://www.w3.org/2001/xml-events" xmlns:xforms="http://www.w3.org/2002/xforms" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:rpt="http://openoffice.org/2005/report" xmlns:of="urn:oasis:names:tc:opendocument:xmlns:of:1.2" xmlns:xhtml="http://www.w3.org/1999/xhtml" xmlns:grddl="http://www.w3.org/2003/g/data-view#" xmlns:tableooo="http://openoffice.org/2009/table" xmlns:field="urn:openoffice:names:experimental:ooo-ms-interop:xmlns:field:1.0" office:version="1.2">
@@ -33,6 +39,20 @@ class OdtWFormatted(OdtWriter):
 
 '''
 
+    def __init__(self, filePath, **kwargs):
+        """Initialize instance variables.
+        
+        Positional arguments:
+            filePath: str -- path to the file represented by the File instance.
+            
+        Optional arguments:
+            kwargs -- keyword arguments to be used by subclasses.            
+
+        Extends the superclass constructor.
+        """
+        super().__init__(filePath, **kwargs)
+        self._translator = None
+
     def write(self):
         """Determine the languages used in the document before writing.
         
@@ -40,6 +60,7 @@ class OdtWFormatted(OdtWriter):
         """
         if self.novel.languages is None:
             self.novel.get_languages()
+        self._translator = None
         return super().write()
 
     def _convert_from_yw(self, text, quick=False):
@@ -54,60 +75,32 @@ class OdtWFormatted(OdtWriter):
         Overrides the superclass method.
         """
         if text:
-            # Apply XML predefined entities.
-            odtReplacements = [
-                ('&', '&amp;'),
-                ('>', '&gt;'),
-                ('<', '&lt;'),
-                ("'", '&apos;'),
-                ('"', '&quot;'),
-                ]
-            if not quick:
-                tags = ['i', 'b']
-                odtReplacements.extend(self._get_replacements())
-                for i, language in enumerate(self.novel.languages, 1):
-                    tags.append(f'lang={language}')
-                    odtReplacements.append((f'[lang={language}]', f'<text:span text:style-name="T{i}">'))
-                    odtReplacements.append((f'[/lang={language}]', '</text:span>'))
-
-                #--- Process markup reaching across linebreaks.
-                newlines = []
-                lines = text.split('\n')
-                isOpen = {}
-                opening = {}
-                closing = {}
-                for tag in tags:
-                    isOpen[tag] = False
-                    opening[tag] = f'[{tag}]'
-                    closing[tag] = f'[/{tag}]'
-                for line in lines:
-                    for tag in tags:
-                        if isOpen[tag]:
-                            if line.startswith('&gt; '):
-                                line = f"&gt; {opening[tag]}{line.lstrip('&gt; ')}"
-                            else:
-                                line = f'{opening[tag]}{line}'
-                            isOpen[tag] = False
-                        while line.count(opening[tag]) > line.count(closing[tag]):
-                            line = f'{line}{closing[tag]}'
-                            isOpen[tag] = True
-                        while line.count(closing[tag]) > line.count(opening[tag]):
-                            line = f'{opening[tag]}{line}'
-                        line = line.replace(f'{opening[tag]}{closing[tag]}', '')
-                    newlines.append(line)
-                text = '\n'.join(newlines).rstrip()
-
-            #--- Apply odt formating.
-            for yw, od in odtReplacements:
-                text = text.replace(yw, od)
-
-            # Remove highlighting, alignment,
-            # strikethrough, and underline tags.
-            text = re.sub(r'\[\/*[h|c|r|s|u]\d*\]', '', text)
+            if quick:
+                text = self._QUICK_TRANSLATOR.translate(text)
+            else:
+                text = self._get_translator().translate(text, rstrip=True)
         else:
             text = ''
         return text
 
+    def _get_translator(self):
+        """Return a MarkupTranslator instance for the formatted text.
+        
+        The translator depends on the document languages and on the replacements 
+        returned by _get_replacements(), which are determined when writing. 
+        So it is compiled on the first call after write() has been invoked.
+        """
+        if self._translator is None:
+            tags = ['i', 'b']
+            odtReplacements = list(self._XML_ENTITIES)
+            odtReplacements.extend(self._get_replacements())
+            for i, language in enumerate(self.novel.languages, 1):
+                tags.append(f'lang={language}')
+                odtReplacements.append((f'[lang={language}]', f'<text:span text:style-name="T{i}">'))
+                odtReplacements.append((f'[/lang={language}]', '</text:span>'))
+            self._translator = MarkupTranslator(odtReplacements, tags, self._DISCARDED_MARKUP)
+        return self._translator
+
     def _get_fileHeaderMapping(self):
         """Return a mapping dictionary for the project section.
         
@@ -133,16 +126,16 @@ class OdtWFormatted(OdtWriter):
             styleMapping['automaticStyles'] = '\n'.join(lines)
         else:
             styleMapping['automaticStyles'] = '<office:automatic-styles/>'
-        template = Template(self._CONTENT_XML_HEADER)
+        template = self._get_template('_CONTENT_XML_HEADER')
         projectTemplateMapping = super()._get_fileHeaderMapping()
         projectTemplateMapping['ContentHeader'] = template.safe_substitute(styleMapping)
         return projectTemplateMapping
 
     def _get_replacements(self):
         return [
-                ('\n\n', ('</text:p>\r<text:p text:style-name="First_20_line_20_indent" />\r'
+                ('\n\n', ('</text:p>\n<text:p text:style-name="First_20_line_20_indent" />\n'
                           '<text:p text:style-name="Text_20_body">')),
-                ('\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent">'),
+                ('\n', '</text:p>\n<text:p text:style-name="First_20_line_20_indent">'),
                 ('\r', '\n'),
                 ('[i]', '<text:span text:style-name="Emphasis">'),
                 ('[/i]', '</text:span>'),
@@ -152,26 +145,24 @@ class OdtWFormatted(OdtWriter):
                 ('*/', '</text:p></office:annotation>'),
                 ]
 
-    def _get_text(self):
+    def _get_fragments(self):
         """Call all processing methods.
         
-        Return a string to be written to the output file.
+        Generate the strings to be written to the output file.
         Overrides the superclass method.
         """
-        lines = self._get_fileHeader()
-        lines.extend(self._get_chapters())
-        lines.append(self._fileFooter)
-        text = ''.join(lines)
-
-        # Set style of paragraphs that start with "> " to "Quotations".
-        # This is done here to include the scene openings.
-        if '&gt; ' in text:
-            quotMarks = ('"First_20_line_20_indent">&gt; ',
-                         '"Text_20_body">&gt; ',
-                         )
-            for quotMark in quotMarks:
-                text = text.replace(quotMark, '"Quotations">')
-            text = re.sub(r'"Text_20_body"\>(\<office\:annotation\>.+?\<\/office\:annotation\>)\&gt\; ',
-                          '"Quotations">\\1', text)
-        return text
+        quotMarks = ('"First_20_line_20_indent">&gt; ',
+                     '"Text_20_body">&gt; ',
+                     )
+        fragments = [self._get_fileHeader(), self._get_chapters(), [self._fileFooter]]
+        for text in chain.from_iterable(fragments):
+
+            # Set style of paragraphs that start with "> " to "Quotations".
+            # This is done here to include the scene openings.
+            if '&gt; ' in text:
+                for quotMark in quotMarks:
+                    text = text.replace(quotMark, '"Quotations">')
+                text = re.sub(r'"Text_20_body"\>(\<office\:annotation\>.+?\<\/office\:annotation\>)\&gt\; ',
+                              '"Quotations">\\1', text)
+            yield text
 
@@ -4,8 +4,6 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-import re
-from string import Template
 from pywriter.pywriter_globals import *
 from pywriter.odt_w.odt_w_formatted import OdtWFormatted
 
@@ -45,75 +43,29 @@ class OdtWProof(OdtWFormatted):
         Optional arguments:
             quick: bool -- This argument is not used here.
         
+        Extends the superclass method.
+        """
+        return super()._convert_from_yw(text)
+
+    def _get_replacements(self):
+        """Return a list of tuples: (yWriter markup, ODT markup).
+        
         Apply direct formatting instead of the emphasizing character styles.
         Overrides the superclass method.
         """
-        if text:
-            # Apply XML predefined entities.
-            odtReplacements = [
-                ('&', '&amp;'),
-                ('>', '&gt;'),
-                ('<', '&lt;'),
-                ("'", '&apos;'),
-                ('"', '&quot;'),
-                ]
-            tags = ['i', 'b']
-            odtReplacements.extend([
-                ('\n\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent" />\r<text:p text:style-name="Text_20_body">'),
-                ('\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent">'),
+        i = len(self.novel.languages)
+        return [
+                ('\n\n', ('</text:p>\n<text:p text:style-name="First_20_line_20_indent" />\n'
+                          '<text:p text:style-name="Text_20_body">')),
+                ('\n', '</text:p>\n<text:p text:style-name="First_20_line_20_indent">'),
                 ('\r', '\n'),
+                ('[i]', f'<text:span text:style-name="T{i+1}">'),
                 ('[/i]', '</text:span>'),
+                ('[b]', f'<text:span text:style-name="T{i+2}">'),
                 ('[/b]', '</text:span>'),
                 ('/*', f'<office:annotation><dc:creator>{self.novel.authorName}</dc:creator><text:p>'),
                 ('*/', '</text:p></office:annotation>'),
-            ])
-            i = 0
-            for i, language in enumerate(self.novel.languages, 1):
-                tags.append(f'lang={language}')
-                odtReplacements.append((f'[lang={language}]', f'<text:span text:style-name="T{i}">'))
-                odtReplacements.append((f'[/lang={language}]', '</text:span>'))
-            odtReplacements.extend([
-                ('[i]', f'<text:span text:style-name="T{i+1}">'),
-                ('[b]', f'<text:span text:style-name="T{i+2}">'),
-            ])
-
-            #--- Process markup reaching across linebreaks.
-            newlines = []
-            lines = text.split('\n')
-            isOpen = {}
-            opening = {}
-            closing = {}
-            for tag in tags:
-                isOpen[tag] = False
-                opening[tag] = f'[{tag}]'
-                closing[tag] = f'[/{tag}]'
-            for line in lines:
-                for tag in tags:
-                    if isOpen[tag]:
-                        if line.startswith('&gt; '):
-                            line = f"&gt; {opening[tag]}{line.lstrip('&gt; ')}"
-                        else:
-                            line = f'{opening[tag]}{line}'
-                        isOpen[tag] = False
-                    while line.count(opening[tag]) > line.count(closing[tag]):
-                        line = f'{line}{closing[tag]}'
-                        isOpen[tag] = True
-                    while line.count(closing[tag]) > line.count(opening[tag]):
-                        line = f'{opening[tag]}{line}'
-                    line = line.replace(f'{opening[tag]}{closing[tag]}', '')
-                newlines.append(line)
-            text = '\n'.join(newlines).rstrip()
-
-            #--- Apply odt formating.
-            for yw, od in odtReplacements:
-                text = text.replace(yw, od)
-
-            # Remove highlighting, alignment,
-            # strikethrough, and underline tags.
-            text = re.sub(r'\[\/*[h|c|r|s|u]\d*\]', '', text)
-        else:
-            text = ''
-        return text
+                ]
 
     def _get_fileHeaderMapping(self):
         """Return a mapping dictionary for the project section.
@@ -142,19 +94,17 @@ class OdtWProof(OdtWFormatted):
   </style:style>''')
         lines.append(' </office:automatic-styles>')
         styleMapping['automaticStyles'] = '\n'.join(lines)
-        template = Template(self._CONTENT_XML_HEADER)
+        template = self._get_template('_CONTENT_XML_HEADER')
         projectTemplateMapping = super()._get_fileHeaderMapping()
         projectTemplateMapping['ContentHeader'] = template.safe_substitute(styleMapping)
         return projectTemplateMapping
 
-    def _get_text(self):
+    def _get_fragments(self):
         """Call all processing methods.
         
-        Return a string to be written to the output file.
+        Generate the strings to be written to the output file.
         Overrides the superclass method.
         """
-        lines = self._get_fileHeader()
-        lines.extend(self._get_chapters())
-        lines.append(self._fileFooter)
-        text = ''.join(lines)
-        return text
+        yield from self._get_fileHeader()
+        yield from self._get_chapters()
+        yield self._fileFooter
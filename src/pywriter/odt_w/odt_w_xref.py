@@ -4,7 +4,6 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
-from string import Template
 from pywriter.pywriter_globals import *
 from pywriter.model.cross_references import CrossReferences
 from pywriter.odt_w.odt_writer import OdtWriter
@@ -77,7 +76,7 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Overrides the superclass method.
         """
         lines = []
-        headerTemplate = Template(self._scnPerChrTemplate)
+        headerTemplate = self._get_template('_scnPerChrTemplate')
         for crId in self._xr.scnPerChr:
             if self._xr.scnPerChr[crId]:
                 lines.append(headerTemplate.safe_substitute(self._get_characterMapping(crId)))
@@ -90,8 +89,8 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Return a list of strings.
         """
         lines = []
-        headerTemplate = Template(self._chrPerTagTemplate)
-        template = Template(self._characterTemplate)
+        headerTemplate = self._get_template('_chrPerTagTemplate')
+        template = self._get_template('_characterTemplate')
         for tag in self._xr.chrPerTag:
             if self._xr.chrPerTag[tag]:
                 lines.append(headerTemplate.safe_substitute(self._get_tagMapping(tag)))
@@ -106,7 +105,7 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Overrides the superclass method.
         """
         lines = []
-        headerTemplate = Template(self._scnPerItmTemplate)
+        headerTemplate = self._get_template('_scnPerItmTemplate')
         for itId in self._xr.scnPerItm:
             if self._xr.scnPerItm[itId]:
                 lines.append(headerTemplate.safe_substitute(self._get_itemMapping(itId)))
@@ -119,8 +118,8 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Return a list of strings.
         """
         lines = []
-        headerTemplate = Template(self._itmPerTagTemplate)
-        template = Template(self._itemTemplate)
+        headerTemplate = self._get_template('_itmPerTagTemplate')
+        template = self._get_template('_itemTemplate')
         for tag in self._xr.itmPerTag:
             if self._xr.itmPerTag[tag]:
                 lines.append(headerTemplate.safe_substitute(self._get_tagMapping(tag)))
@@ -135,7 +134,7 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Overrides the superclass method.
         """
         lines = []
-        headerTemplate = Template(self._scnPerLocTemplate)
+        headerTemplate = self._get_template('_scnPerLocTemplate')
         for lcId in self._xr.scnPerLoc:
             if self._xr.scnPerLoc[lcId]:
                 lines.append(headerTemplate.safe_substitute(self._get_locationMapping(lcId)))
@@ -148,8 +147,8 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Return a list of strings.
         """
         lines = []
-        headerTemplate = Template(self._locPerTagTemplate)
-        template = Template(self._locationTemplate)
+        headerTemplate = self._get_template('_locPerTagTemplate')
+        template = self._get_template('_locationTemplate')
         for tag in self._xr.locPerTag:
             if self._xr.locPerTag[tag]:
                 lines.append(headerTemplate.safe_substitute(self._get_tagMapping(tag)))
@@ -183,13 +182,13 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         lines = []
         for scId in scenes:
             if self.novel.scenes[scId].scType == 1:
-                template = Template(self._notesSceneTemplate)
+                template = self._get_template('_notesSceneTemplate')
             elif self.novel.scenes[scId].scType == 2:
-                template = Template(self._todoSceneTemplate)
+                template = self._get_template('_todoSceneTemplate')
             elif self.novel.scenes[scId].scType == 3:
-                template = Template(self._unusedSceneTemplate)
+                template = self._get_template('_unusedSceneTemplate')
             else:
-                template = Template(self._sceneTemplate)
+                template = self._get_template('_sceneTemplate')
             lines.append(template.safe_substitute(self._get_sceneMapping(scId)))
         return lines
 
@@ -199,7 +198,7 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         Return a list of strings.
         """
         lines = []
-        headerTemplate = Template(self._scnPerTagtemplate)
+        headerTemplate = self._get_template('_scnPerTagtemplate')
         for tag in self._xr.scnPerTag:
             if self._xr.scnPerTag[tag]:
                 lines.append(headerTemplate.safe_substitute(self._get_tagMapping(tag)))
@@ -217,20 +216,19 @@ $SceneNumber (Ch $Chapter) $Title (ToDo)
         )
         return tagMapping
 
-    def _get_text(self):
+    def _get_fragments(self):
         """Call all processing methods.
         
-        Return a string to be written to the output file.
+        Generate the strings to be written to the output file.
         Overrides the superclass method.
         """
         self._xr.generate_xref(self.novel)
-        lines = self._get_fileHeader()
-        lines.extend(self._get_characters())
-        lines.extend(self._get_locations())
-        lines.extend(self._get_items())
-        lines.extend(self._get_sceneTags())
-        lines.extend(self._get_characterTags())
-        lines.extend(self._get_locationTags())
-        lines.extend(self._get_itemTags())
-        lines.append(self._fileFooter)
-        return ''.join(lines)
+        yield from self._get_fileHeader()
+        yield from self._get_characters()
+        yield from self._get_locations()
+        yield from self._get_items()
+        yield from self._get_sceneTags()
+        yield from self._get_characterTags()
+        yield from self._get_locationTags()
+        yield from self._get_itemTags()
+        yield self._fileFooter
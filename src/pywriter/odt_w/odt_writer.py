@@ -7,6 +7,7 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 from pywriter.pywriter_globals import *
+from pywriter.file.markup_translator import MarkupTranslator
 from pywriter.odf.odf_file import OdfFile
 
 
@@ -16,9 +17,6 @@ class OdtWriter(OdfFile):
     EXTENSION = '.odt'
     # overwrites Novel.EXTENSION
 
-    _ODF_COMPONENTS = ['manifest.rdf', 'META-INF', 'content.xml', 'meta.xml', 'mimetype',
-                      'settings.xml', 'styles.xml', 'META-INF/manifest.xml']
-
     _CONTENT_XML_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
 
 <office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0" xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0" xmlns:xlink="http://www.w3.org/1999/xlink" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:meta="urn:oasis:names:tc:opendocument:xmlns:meta:1.0" xmlns:number="urn:oasis:names:tc:opendocument:xmlns:datastyle:1.0" xmlns:svg="urn:oasis:names:tc:opendocument:xmlns:svg-compatible:1.0" xmlns:chart="urn:oasis:names:tc:opendocument:xmlns:chart:1.0" xmlns:dr3d="urn:oasis:names:tc:opendocument:xmlns:dr3d:1.0" xmlns:math="http://www.w3.org/1998/Math/MathML" xmlns:form="urn:oasis:names:tc:opendocument:xmlns:form:1.0" xmlns:script="urn:oasis:names:tc:opendocument:xmlns:script:1.0" xmlns:ooo="http://openoffice.org/2004/office" xmlns:ooow="http://openoffice.org/2004/writer" xmlns:oooc="http://openoffice.org/2004/calc" xmlns:dom="http://www.w3.org/2001/xml-events" xmlns:xforms="http://www.w3.org/2002/xforms" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:rpt="http://openoffice.org/2005/report" xmlns:of="urn:oasis:names:tc:opendocument:xmlns:of:1.2" xmlns:xhtml="http://www.w3.org/1999/xhtml" xmlns:grddl="http://www.w3.org/2003/g/data-view#" xmlns:tableooo="http://openoffice.org/2009/table" xmlns:field="urn:openoffice:names:experimental:ooo-ms-interop:xmlns:field:1.0" office:version="1.2">
@@ -364,6 +362,23 @@ class OdtWriter(OdfFile):
 '''
     _MIMETYPE = 'application/vnd.oasis.opendocument.text'
 
+    _XML_ENTITIES = [
+        ('&', '&amp;'),
+        ('>', '&gt;'),
+        ('<', '&lt;'),
+        ("'", '&apos;'),
+        ('"', '&quot;'),
+        ]
+    # XML predefined entities.
+
+    _QUICK_TRANSLATOR = MarkupTranslator(_XML_ENTITIES)
+    _TRANSLATOR = MarkupTranslator(_XML_ENTITIES + [
+        ('\n\n', '</text:p>\n<text:p text:style-name="First_20_line_20_indent" />\n<text:p text:style-name="Text_20_body">'),
+        ('\n', '</text:p>\n<text:p text:style-name="First_20_line_20_indent">'),
+        ('\r', '\n'),
+        ])
+    # Apply odt linebreaks.
+
     def _convert_from_yw(self, text, quick=False):
         """Return text without markup, converted to target format.
         
@@ -376,23 +391,10 @@ class OdtWriter(OdfFile):
         Overrides the superclass method.
         """
         if text:
-            # Apply XML predefined entities.
-            ODT_REPLACEMENTS = [
-                ('&', '&amp;'),
-                ('>', '&gt;'),
-                ('<', '&lt;'),
-                ("'", '&apos;'),
-                ('"', '&quot;'),
-                ]
-            if not quick:
-                # Apply odt linebreaks.
-                ODT_REPLACEMENTS.extend([
-                    ('\n\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent" />\r<text:p text:style-name="Text_20_body">'),
-                    ('\n', '</text:p>\r<text:p text:style-name="First_20_line_20_indent">'),
-                    ('\r', '\n'),
-                    ])
-            for yw, od in ODT_REPLACEMENTS:
-                text = text.replace(yw, od)
+            if quick:
+                text = self._QUICK_TRANSLATOR.translate(text)
+            else:
+                text = self._TRANSLATOR.translate(text)
         else:
             text = ''
         return text
@@ -412,21 +414,13 @@ class OdtWriter(OdfFile):
         sceneMapping['sceneTitle'] = _('Scene')
         return sceneMapping
 
-    def _set_up(self):
+    def _get_components(self):
         """Helper method for ZIP file generation.
 
-        Add rdf manifest to the temporary directory containing the internal structure of an ODF file.
-        Raise the "Error" exception in case of error. 
+        Add the rdf manifest to the internal structure of an ODF file.
         Extends the superclass method.
         """
-
-        # Generate the common ODF components.
-        super()._set_up()
-
-        # Generate manifest.rdf
-        try:
-            with open(f'{self._tempDir}/manifest.rdf', 'w', encoding='utf-8') as f:
-                f.write(self._MANIFEST_RDF)
-        except:
-            raise Error(f'{_("Cannot write file")}: "manifest.rdf"')
+        components = super()._get_components()
+        components['manifest.rdf'] = self._MANIFEST_RDF
+        return components
 
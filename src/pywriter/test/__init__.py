@@ -6,6 +6,7 @@ helper -- Helper module for reading utf-8 or ANSI encoded files.
 export_test -- Provide an abstract test case class for yWriter export.
 import_export_test -- Provide an abstract test case class for yWriter import and export.
 import_test -- Provide an abstract test case class for yWriter import.
+synthetic_novel -- Provide a generator for synthetic novels used by the benchmarks.
 
 Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
@@ -28,6 +28,8 @@ class ExportTest:
     Subclasses must also inherit from unittest.TestCase
     """
     _exportClass = None
+    _kwargs = {}
+    # Additional keyword arguments passed to the converter.
 
     def setUp(self):
         """Set up the test environment.
@@ -56,6 +58,7 @@ class ExportTest:
         """
         converter = Yw7Converter()
         kwargs = {'suffix': self._exportClass.SUFFIX}
+        kwargs.update(self._kwargs)
         converter.run(self._testYwFile, **kwargs)
         self.assertEqual(converter.ui.infoHowText, f'{_("File written")}: "{ norm_path(self._testExpFile)}".')
         with zipfile.ZipFile(self._testExpFile, 'r') as myzip:
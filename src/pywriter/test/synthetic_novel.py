@@ -0,0 +1,64 @@
+"""Provide a generator for synthetic novels used by the benchmarks.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.model.novel import Novel
+from pywriter.model.chapter import Chapter
+from pywriter.model.scene import Scene
+from pywriter.model.character import Character
+from pywriter.model.world_element import WorldElement
+
+PARAGRAPH = ('The [i]quick[/i] brown fox & the "lazy" dog <jump> over the [b]fence[/b]. '
+             'Then they run across the meadow, and nobody knows why.')
+
+
+def create_novel(scenes=10000, scenesPerChapter=10, paragraphsPerScene=5):
+    """Return a Novel instance populated with generated content.
+    
+    Optional arguments:
+        scenes: int -- total number of scenes.
+        scenesPerChapter: int -- number of scenes per chapter.
+        paragraphsPerScene: int -- number of paragraphs per scene.
+    """
+    novel = Novel()
+    novel.title = 'Synthetic novel'
+    novel.authorName = 'Benchmark'
+    novel.desc = 'A generated novel for performance measurement.'
+    for i in range(1, 11):
+        crId = str(i)
+        novel.characters[crId] = Character()
+        novel.characters[crId].title = f'Character {i}'
+        novel.characters[crId].fullName = f'Character {i} Fullname'
+        novel.characters[crId].desc = f'Description of character {i}.'
+        novel.characters[crId].isMajor = (i < 4)
+        novel.srtCharacters.append(crId)
+        lcId = str(i)
+        novel.locations[lcId] = WorldElement()
+        novel.locations[lcId].title = f'Location {i}'
+        novel.srtLocations.append(lcId)
+    sceneText = '\n'.join([PARAGRAPH] * paragraphsPerScene)
+    chapters = (scenes + scenesPerChapter - 1) // scenesPerChapter
+    scId = 0
+    for i in range(1, chapters + 1):
+        chId = str(i)
+        novel.chapters[chId] = Chapter()
+        novel.chapters[chId].title = f'Chapter {i}'
+        novel.chapters[chId].desc = f'Summary of chapter {i}.'
+        novel.chapters[chId].chLevel = 0
+        novel.chapters[chId].chType = 0
+        novel.srtChapters.append(chId)
+        while scId < scenes and len(novel.chapters[chId].srtScenes) < scenesPerChapter:
+            scId += 1
+            sceneId = str(scId)
+            novel.scenes[sceneId] = Scene()
+            novel.scenes[sceneId].title = f'Scene {scId}'
+            novel.scenes[sceneId].desc = f'Summary of scene {scId}.'
+            novel.scenes[sceneId].sceneContent = sceneText
+            novel.scenes[sceneId].scType = 0
+            novel.scenes[sceneId].status = 1
+            novel.scenes[sceneId].characters = [str(scId % 10 + 1)]
+            novel.scenes[sceneId].locations = [str(scId % 10 + 1)]
+            novel.chapters[chId].srtScenes.append(sceneId)
+    return novel
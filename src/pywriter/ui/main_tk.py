@@ -39,6 +39,7 @@ class MainTk(Ui):
         title: str -- Application title.
         kwargs -- keyword arguments buffer.
         prjFile -- yWriter project to work with.
+        parseCache -- ParseCache instance for reopening unchanged projects; None means: no caching.
         root -- tk top level window.
         mainMenu -- top level menubar.
         mainWindow -- tk frame in the top level window.
@@ -76,6 +77,7 @@ class MainTk(Ui):
         self._statusText = ''
         self.kwargs = kwargs
         self.prjFile = None
+        self.parseCache = None
         self.novel = None
         self.root = tk.Tk()
         self.root.protocol("WM_DELETE_WINDOW", self.on_quit)
@@ -164,7 +166,7 @@ class MainTk(Ui):
         if self.prjFile is not None:
             self.close_project()
         self.kwargs['yw_last_open'] = fileName
-        self.prjFile = self._YW_CLASS(fileName)
+        self.prjFile = self._YW_CLASS(fileName, cache=self.parseCache)
         self.novel = Novel()
         self.prjFile.novel = self.novel
         try:
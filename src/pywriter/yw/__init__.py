@@ -2,9 +2,12 @@
 
 Modules:
 
+content_map -- Provide a class for reading scene contents from a memory-mapped yWriter project file.
 data_files -- Provide a class for yWriter XML data files.
+parse_cache -- Provide a class for caching the novels read from yWriter project files.
 xml_indent -- Helper module for xml pretty printing.
 yw7_file -- Provide a class for yWriter 7 project import and export.
+yw7_stats -- Provide a class for a yWriter 7 project summary, read without the scene contents.
 yw7_purge -- Helper module for removing PyWriter specific data.
 
 Copyright (c) 2023 Peter Triesberger
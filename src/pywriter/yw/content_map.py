@@ -0,0 +1,207 @@
+"""Provide a class for reading scene contents from a memory-mapped yWriter project file.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import re
+import mmap
+import weakref
+import xml.etree.ElementTree as ET
+from pywriter.pywriter_globals import *
+
+CONTROL_BYTES = re.compile(b'[\x00-\x08|\x0b-\x0c|\x0e-\x1f]')
+# Characters removed before parsing; same as CONTROL_CHARACTERS in the yw7_stream module.
+
+CONTENT_PATTERN = re.compile(b'<SceneContent>(.*?)</SceneContent>', re.DOTALL)
+# Matches a SceneContent element; the group is the element's content.
+
+CDATA_START = b'<![CDATA['
+CDATA_END = b']]>'
+
+
+class ContentMap:
+    """Memory-mapped yWriter project file, for reading scene contents on demand.
+
+    Public methods:
+        get_chunks(chunkSize) -- Return an iterator over the xml data, leaving out the scene contents.
+        read_content(start, end) -- Return the scene content stored at a byte range of the file.
+        content_startswith(start, end, prefixes) -- Return True if the scene content starts with one of the prefixes.
+        close() -- Unmap the file.
+
+    Public class methods:
+        close_all(filePath) -- Unmap the file in all instances mapping it.
+
+    Public instance variables:
+        filePath: str -- path to the UTF-8 encoded yWriter project file.
+
+    The file is mapped on the first access, and unmapped by close() or when the instance is released.
+    A pickled instance holds only the file path and the file's size and modification time, 
+    so scenes with pending contents can be cached.
+    Reading a scene content from a file that has changed since it was mapped raises the "Error" exception.
+    """
+    _instances = weakref.WeakSet()
+    # Instances that may have a file mapped.
+
+    def __init__(self, filePath):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath: str -- path to the yWriter project file.
+        """
+        self.filePath = filePath
+        self._map = None
+        self._stat = None
+        # Size and modification time of the file when it was mapped first.
+
+    @classmethod
+    def close_all(cls, filePath):
+        """Unmap the file in all instances mapping it.
+
+        Positional arguments:
+            filePath: str -- path to the yWriter project file.
+
+        The file must be unmapped before it can be replaced.
+        """
+        for contentMap in list(cls._instances):
+            if os.path.abspath(contentMap.filePath) == os.path.abspath(filePath):
+                contentMap.close()
+
+    def close(self):
+        """Unmap the file.
+        
+        A scene content read afterwards maps the file again, if it hasn't changed.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._instances.discard(self)
+
+    def get_chunks(self, chunkSize):
+        """Return an iterator over the xml data, leaving out the scene contents.
+
+        Positional arguments:
+            chunkSize: int -- maximum number of bytes per chunk.
+
+        Yield (data, loader) tuples, where data is a bytes chunk with the control characters removed.
+        If data ends with a SceneContent start tag, loader is a ContentLoader instance returning the
+        text of that element. Otherwise, loader is None.
+        Raise UnicodeError if the file is UTF-16 encoded.
+        """
+        fileMap = self._get_map()
+        if fileMap[:2] in (b'\xff\xfe', b'\xfe\xff'):
+            raise UnicodeError('Byte order mark of a UTF-16 encoded file')
+
+        position = 0
+        for match in CONTENT_PATTERN.finditer(fileMap):
+            start, end = match.span(1)
+            yield from self._get_segment(position, start, chunkSize)
+            yield b'', ContentLoader(self, start, end)
+            position = end
+        yield from self._get_segment(position, len(fileMap), chunkSize)
+
+    def read_content(self, start, end):
+        """Return the scene content stored at a byte range of the file.
+
+        Positional arguments:
+            start: int -- position of the first byte after the SceneContent start tag.
+            end: int -- position of the SceneContent end tag.
+
+        The text is decoded like by the xml parser, so CDATA sections and entities are resolved.
+        Raise the "Error" exception if the file has changed since it was mapped.
+        """
+        self._check_file()
+        data = CONTROL_BYTES.sub(b'', self._get_map()[start:end])
+        return ET.fromstring(b''.join((b'<SceneContent>', data, b'</SceneContent>'))).text
+
+    def content_startswith(self, start, end, prefixes):
+        """Return True if the scene content stored at a byte range of the file starts with one of the prefixes.
+
+        Positional arguments:
+            start: int -- position of the first byte after the SceneContent start tag.
+            end: int -- position of the SceneContent end tag.
+            prefixes: tuple of str -- prefixes without XML special characters.
+
+        If the content is a CDATA section, only its beginning is read.
+        Raise the "Error" exception if the file has changed since it was mapped.
+        """
+        self._check_file()
+        size = len(CDATA_START) + max([len(prefix.encode('utf-8')) for prefix in prefixes])
+        data = self._get_map()[start:min(start + size, end)]
+        if data.startswith(CDATA_START) and not CDATA_END in data and not CONTROL_BYTES.search(data):
+            return data[len(CDATA_START):].startswith(tuple([prefix.encode('utf-8') for prefix in prefixes]))
+
+        content = self.read_content(start, end)
+        return bool(content) and content.startswith(prefixes)
+
+    def _get_map(self):
+        """Return the memory map of the file, mapping the file if necessary."""
+        if self._map is None:
+            with open(self.filePath, 'rb') as f:
+                if self._stat is None:
+                    stat = os.fstat(f.fileno())
+                    self._stat = (stat.st_size, stat.st_mtime_ns)
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._instances.add(self)
+        return self._map
+
+    def _check_file(self):
+        """Raise the "Error" exception if the file has changed since it was mapped first."""
+        if self._stat is None:
+            return
+
+        try:
+            stat = os.stat(self.filePath)
+        except OSError:
+            stat = None
+        if stat is None or (stat.st_size, stat.st_mtime_ns) != self._stat:
+            raise Error(f'{_("File has changed since it was read")}: "{norm_path(self.filePath)}".')
+
+    def _get_segment(self, start, end, chunkSize):
+        """Yield a byte range of the file in chunks, with the control characters removed."""
+        fileMap = self._get_map()
+        for position in range(start, end, chunkSize):
+            yield CONTROL_BYTES.sub(b'', fileMap[position:min(position + chunkSize, end)]), None
+
+    def __getstate__(self):
+        """Leave out the memory map when pickling."""
+        return {'filePath': self.filePath, 'stat': self._stat}
+
+    def __setstate__(self, state):
+        """Restore an unpickled instance; the file is mapped on the first access."""
+        self.filePath = state['filePath']
+        self._map = None
+        self._stat = state.get('stat', None)
+
+
+class ContentLoader:
+    """Callable returning a scene content stored in a ContentMap.
+
+    Public methods:
+        startswith(prefixes) -- Return True if the scene content starts with one of the prefixes.
+    """
+
+    def __init__(self, contentMap, start, end):
+        """Initialize instance variables.
+
+        Positional arguments:
+            contentMap -- ContentMap instance.
+            start: int -- position of the first byte after the SceneContent start tag.
+            end: int -- position of the SceneContent end tag.
+        """
+        self._contentMap = contentMap
+        self._start = start
+        self._end = end
+
+    def __call__(self):
+        """Return the scene content."""
+        return self._contentMap.read_content(self._start, self._end)
+
+    def startswith(self, prefixes):
+        """Return True if the scene content starts with one of the prefixes, without reading all of it.
+
+        Positional arguments:
+            prefixes: tuple of str -- prefixes without XML special characters.
+        """
+        return self._contentMap.content_startswith(self._start, self._end, prefixes)
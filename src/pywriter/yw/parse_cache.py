@@ -0,0 +1,203 @@
+"""Provide a class for caching the novels read from yWriter project files.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import io
+import sys
+import hmac
+import pickle
+import hashlib
+
+
+class ParseCache:
+    """Cache for the novels read from yWriter project files.
+
+    Public methods:
+        load(filePath, novel) -- Restore a cached novel, if the project file hasn't changed.
+        save(filePath, novel) -- Store a novel read from a project file.
+        get_cache_path(filePath) -- Return the path of the cache file for a project file.
+
+    Public instance variables:
+        cacheDir: str -- directory for the cache files.
+        hits: int -- number of novels restored from the cache.
+        misses: int -- number of project files not found in the cache, or changed since cached.
+
+    A cache file holds a serialized Novel instance, together with the project file's
+    path, size, modification time, and SHA-256 hash. The cached novel is only
+    restored if all of them match the project file.
+    The cache files are kept in a per-user directory, never next to the project files.
+    Each cache file is signed with an HMAC, using a secret key stored in the cache directory.
+    The signature is verified before anything is unpickled, so a cache file that was
+    not written by this user's ParseCache is never deserialized.
+    Errors are not raised; an unreadable, or tampered cache file counts as a miss.
+    """
+    EXTENSION = '.cache'
+    _VERSION = 2
+    # Cache files with another version are ignored.
+
+    _KEY_FILE = 'cache.key'
+    # Name of the file holding the secret key in the cache directory.
+
+    _KEY_SIZE = 32
+    # Number of bytes of the secret key.
+
+    _CHUNK_SIZE = 0x100000
+    # Number of bytes hashed at once.
+
+    def __init__(self, cacheDir=None):
+        """Initialize instance variables.
+
+        Optional arguments:
+            cacheDir: str -- directory for the cache files (default: the user's cache directory).
+        """
+        if cacheDir is None:
+            cacheDir = _get_user_cache_dir()
+        self.cacheDir = cacheDir
+        self.hits = 0
+        self.misses = 0
+        self._keys = {}
+        # key: project file path, value: key of the project file at the last cache miss.
+
+    def get_cache_path(self, filePath):
+        """Return the path of the cache file for a project file.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+        """
+        pathHash = hashlib.sha256(os.path.abspath(filePath).encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheDir, f'{pathHash}{self.EXTENSION}')
+
+    def load(self, filePath, novel):
+        """Restore a cached novel, if the project file hasn't changed.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+            novel -- Novel instance to receive the cached attributes.
+
+        Return True on success, otherwise False.
+        """
+        try:
+            currentKey = self._get_key(filePath)
+        except OSError:
+            currentKey = None
+        try:
+            with open(self.get_cache_path(filePath), 'rb') as f:
+                signature = f.read(hashlib.sha256().digest_size)
+                data = f.read()
+            if hmac.compare_digest(signature, self._sign(data, create=False)):
+                f = io.BytesIO(data)
+                version, key = pickle.load(f)
+                if version == self._VERSION and key == currentKey:
+                    cachedNovel = pickle.load(f)
+                    for name, value in _get_attributes(cachedNovel).items():
+                        setattr(novel, name, value)
+                    self.hits += 1
+                    return True
+
+        except Exception:
+            pass
+        self._keys[filePath] = currentKey
+        self.misses += 1
+        return False
+
+    def save(self, filePath, novel):
+        """Store a novel read from a project file.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+            novel -- Novel instance, as read from the project file.
+
+        If load() has missed the project file before, the file is identified 
+        by the key determined at that time. So a file changed while being read
+        won't be restored from the cache.
+        Return True on success, otherwise False.
+        """
+        cachePath = self.get_cache_path(filePath)
+        try:
+            key = self._keys.pop(filePath, None)
+            if key is None:
+                key = self._get_key(filePath)
+            data = io.BytesIO()
+            pickle.dump((self._VERSION, key), data, pickle.HIGHEST_PROTOCOL)
+            pickle.dump(novel, data, pickle.HIGHEST_PROTOCOL)
+            data = data.getvalue()
+            signature = self._sign(data, create=True)
+            with open(f'{cachePath}.tmp', 'wb') as f:
+                f.write(signature)
+                f.write(data)
+            os.replace(f'{cachePath}.tmp', cachePath)
+            # A concurrent reader never sees a partially written cache file.
+        except Exception:
+            return False
+
+        return True
+
+    def _sign(self, data, create):
+        """Return the HMAC-SHA256 signature of the data.
+
+        Positional arguments:
+            data: bytes -- serialized cache content.
+            create: bool -- if True, create the cache directory and the secret key, if missing.
+
+        Raise OSError or ValueError, if the secret key is missing or invalid.
+        """
+        keyPath = os.path.join(self.cacheDir, self._KEY_FILE)
+        try:
+            with open(keyPath, 'rb') as f:
+                secret = f.read()
+        except FileNotFoundError:
+            if not create:
+                raise
+
+            os.makedirs(self.cacheDir, mode=0o700, exist_ok=True)
+            secret = os.urandom(self._KEY_SIZE)
+            try:
+                fd = os.open(keyPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+            except FileExistsError:
+                # Another process has created the key in the meantime.
+                with open(keyPath, 'rb') as f:
+                    secret = f.read()
+            else:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(secret)
+        if len(secret) != self._KEY_SIZE:
+            raise ValueError('Invalid cache key')
+
+        return hmac.new(secret, data, hashlib.sha256).digest()
+
+    def _get_key(self, filePath):
+        """Return a tuple identifying the project file's content."""
+        fileStat = os.stat(filePath)
+        sha256 = hashlib.sha256()
+        with open(filePath, 'rb') as f:
+            while True:
+                data = f.read(self._CHUNK_SIZE)
+                if not data:
+                    break
+
+                sha256.update(data)
+        return os.path.abspath(filePath), fileStat.st_size, fileStat.st_mtime_ns, sha256.hexdigest()
+
+
+def _get_user_cache_dir():
+    """Return the path of the per-user directory for the cache files."""
+    if sys.platform == 'win32':
+        baseDir = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+        return os.path.join(baseDir, 'pywriter', 'cache')
+
+    baseDir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(baseDir, 'pywriter')
+
+
+def _get_attributes(element):
+    """Return a dictionary with the instance variables of an element."""
+    attributes = {}
+    for cls in type(element).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(element, name):
+                attributes[name] = getattr(element, name)
+    attributes.update(getattr(element, '__dict__', {}))
+    return attributes
@@ -18,8 +18,31 @@ from pywriter.model.character import Character
 from pywriter.model.world_element import WorldElement
 from pywriter.model.basic_element import BasicElement
 from pywriter.file.file import File
-from pywriter.model.id_generator import create_id
+from pywriter.file.markup_translator import MarkupTranslator
+from pywriter.model.id_allocator import IdAllocator
 from pywriter.yw.xml_indent import indent
+from pywriter.yw.content_map import ContentMap
+from pywriter.yw.yw7_stream import CONTROL_CHARACTERS
+from pywriter.yw.yw7_stream import get_text_chunks
+from pywriter.yw.yw7_stream import parse_stream
+from pywriter.yw.yw7_stream import get_scene_type
+from pywriter.yw.yw7_stream import get_chapter_type
+
+XML_TRANSLATOR = MarkupTranslator([
+    ('&', '&amp;'),
+    ('>', '&gt;'),
+    ('<', '&lt;'),
+    ("'", '&apos;'),
+    ('"', '&quot;'),
+    ])
+# Apply XML predefined entities.
+
+def _get_count(xmlScene, tag):
+    """Return the integer value of a scene's count element, or None if missing."""
+    try:
+        return int(xmlScene.find(tag).text)
+    except:
+        return None
 
 
 class Yw7File(File):
@@ -30,9 +53,22 @@ class Yw7File(File):
         is_locked() -- check whether the yw7 file is locked by yWriter.
         read() -- parse the yWriter xml file and get the instance variables.
         write() -- write instance variables to the yWriter xml file.
+        register_change(elements, elemId) -- Note a change reported to the novel.
 
     Public instance variables:
         tree -- xml element tree of the yWriter project
+        streaming: bool -- if True, read() parses the file incrementally and discards the xml tree.
+        lazy: bool -- if True, read() parses the file incrementally, leaving the scene contents in the file.
+        readOnly: bool -- if True, read() parses the file incrementally and discards the xml tree; write() is refused.
+        cache -- ParseCache instance; if not None, read() restores unchanged projects from the cache.
+
+    The xml element tree is kept up to date incrementally: The project file observes the novel 
+    read or written. After the first write(), only the subtrees of the elements reported with 
+    Novel.report_change() since the last write() are rebuilt. Changes not reported are not written.
+    If nothing has been reported since the last read() or write(), write() doesn't touch the file.
+
+    In lazy mode, each scene's content is read from the memory-mapped file on first access. 
+    Until then, the scene's word count and letter count are taken from the file, if stored.
         
     Public class constants:
         PRJ_KWVAR -- List of the names of the project keyword variables.
@@ -77,6 +113,9 @@ class Yw7File(File):
     # Names of xml elements containing CDATA.
     # ElementTree.write omits CDATA tags, so they have to be inserted afterwards.
 
+    _CDATA_TAG_PATTERN = re.compile(f'<(/?)({"|".join(_CDATA_TAGS)})>')
+    # Matches opening and closing tags of elements whose text is written as CDATA section.
+
     PRJ_KWVAR = [
         'Field_LanguageCode',
         'Field_CountryCode',
@@ -97,6 +136,9 @@ class Yw7File(File):
         'Field_Link',
         ]
 
+    _STREAM_CHUNK_SIZE = 0x100000
+    # Number of characters fed to the incremental parser at once.
+
     def __init__(self, filePath, **kwargs):
         """Initialize instance variables.
         
@@ -104,12 +146,36 @@ class Yw7File(File):
             filePath: str -- path to the yw7 file.
             
         Optional arguments:
-            kwargs -- keyword arguments (not used here).            
+            streaming: bool -- if True, read the file incrementally (default: False).
+            lazy: bool -- if True, read the scene contents on first access (default: False).
+            readOnly: bool -- if True, open the project for reading only (default: False).
+            cache -- ParseCache instance for restoring unchanged projects (default: None).
         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
         self.tree = None
+        self.streaming = kwargs.get('streaming', False)
+        self.lazy = kwargs.get('lazy', False)
+        self.readOnly = kwargs.get('readOnly', False)
+        self.cache = kwargs.get('cache', None)
+        self._changes = None
+        # Changes reported since the last read() or write().
+        # key: xml element tag, e.g. 'SCENE', value: set of the IDs of the changed elements.
+        # An ID of None means: The order of the elements has changed.
+        # None means: Anything may have changed.
+
+        self._observedNovel = None
+        # Novel instance the reported changes refer to.
+
+        self._treeFilePath = None
+        # Path of the file represented by the xml element tree.
+
+        self._isBuilt = False
+        # True if the xml element tree has been built by _build_element_tree().
+
+        self._isTreePending = False
+        # True if the novel has been read without keeping the xml element tree.
 
     def adjust_scene_types(self):
         """Make sure that scenes in non-"Normal" chapters inherit the chapter's type."""
@@ -129,6 +195,10 @@ class Yw7File(File):
     def read(self):
         """Parse the yWriter xml file and get the instance variables.
         
+        If the streaming or the readOnly instance variable is set, parse the file incrementally. 
+        If the lazy instance variable is set, leave the scene contents in the file until accessed.
+        If a parse cache is set, restore the novel from the cache if the file hasn't changed.
+        Otherwise, store the novel in the cache after parsing.
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
@@ -138,74 +208,136 @@ class Yw7File(File):
 
         if self.is_locked():
             raise Error(f'{_("yWriter seems to be open. Please close first")}.')
-        try:
-            try:
-                with open(self.filePath, 'r', encoding='utf-8') as f:
-                    xmlText = f.read()
-            except:
-                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
-                with open(self.filePath, 'r', encoding='utf-16') as f:
-                    xmlText = f.read()
-        except:
-            try:
-                self.tree = ET.parse(self.filePath)
-            except Exception as ex:
-                raise Error(f'{_("Can not process file")} - {str(ex)}')
 
-        xmlText = re.sub('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]', '', xmlText)
-        root = ET.fromstring(xmlText)
-        xmlText = None
-        # saving memory
-        self.tree = ET.ElementTree(root)
-        self._read_project(root)
-        self._read_locations(root)
-        self._read_items(root)
-        self._read_characters(root)
-        self._read_projectvars(root)
-        self._read_projectnotes(root)
-        self._read_scenes(root)
-        self._read_chapters(root)
+        isCached = self.cache is not None and self.cache.load(self.filePath, self.novel)
+        if isCached:
+            self.tree = None
+        elif self.lazy:
+            self._read_lazy()
+        elif self.streaming or self.readOnly:
+            self._read_stream()
+        else:
+            root = self._parse_tree()
+            self._read_project(root)
+            self._read_locations(root)
+            self._read_items(root)
+            self._read_characters(root)
+            self._read_projectvars(root)
+            self._read_projectnotes(root)
+            self._read_scenes(root)
+            self._read_chapters(root)
         self.adjust_scene_types()
-
-        #--- Set custom instance variables.
-        for scId in self.novel.scenes:
-            self.novel.scenes[scId].scnArcs = self.novel.scenes[scId].kwVar.get('Field_SceneArcs', None)
-            scnMode = self.novel.scenes[scId].kwVar.get('Field_SceneMode', None)
-            try:
-                self.novel.scenes[scId].scnMode = int(scnMode)
-            except:
-                self.novel.scenes[scId].scnMode = None
+        if self.cache is not None and not isCached:
+            self.cache.save(self.filePath, self.novel)
+        self._isBuilt = False
+        self._isTreePending = self.tree is None and not (self.streaming or self.readOnly)
+        # The xml element tree is parsed when writing.
+        self._observe_novel()
+        self.novel.report_change()
+        # Let the other observers know.
+        self._changes = {}
+        self._treeFilePath = self.filePath
 
     def write(self):
         """Write instance variables to the yWriter xml file.
         
         Open the yWriter xml file located at filePath and replace the instance variables 
         not being None. Create new XML elements if necessary.
+        If no change has been reported since the file was read or written, skip writing.
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
         if self.is_locked():
             raise Error(f'{_("yWriter seems to be open. Please close first")}.')
 
+        if self.streaming:
+            raise Error(f'{_("Cannot write a project that has been read in streaming mode")}.')
+
+        if self.readOnly:
+            raise Error(f'{_("Cannot write a project opened read-only")}.')
+
+        if self.novel is not self._observedNovel or self.filePath != self._treeFilePath:
+            self._changes = None
+        self._observe_novel()
+
         if self.novel.languages is None:
             self.novel.get_languages()
+            if self.novel.languages:
+                self.novel.report_change(self.novel)
 
         #--- Get custom instance variables.
+        fields = self.SCN_KWVAR + ['Field_SceneStyle']
         for scId in self.novel.scenes:
+            kwVar = self.novel.scenes[scId].kwVar
+            oldValues = [kwVar.get(field, None) for field in fields]
             if self.novel.scenes[scId].scnArcs is not None:
-                self.novel.scenes[scId].kwVar['Field_SceneArcs'] = self.novel.scenes[scId].scnArcs
+                kwVar['Field_SceneArcs'] = self.novel.scenes[scId].scnArcs
             if self.novel.scenes[scId].scnMode is not None:
                 if self.novel.scenes[scId].scnMode == 0:
-                    self.novel.scenes[scId].kwVar['Field_SceneMode'] = None
+                    kwVar['Field_SceneMode'] = None
                 else:
-                    self.novel.scenes[scId].kwVar['Field_SceneMode'] = str(self.novel.scenes[scId].scnMode)
-            self.novel.scenes[scId].kwVar['Field_SceneStyle'] = None
+                    kwVar['Field_SceneMode'] = str(self.novel.scenes[scId].scnMode)
+            kwVar['Field_SceneStyle'] = None
+            if [kwVar.get(field, None) for field in fields] != oldValues:
+                self.novel.report_change(self.novel.scenes, scId)
+        if self._changes == {} and os.path.isfile(self.filePath):
+            return
+
+        for scene in self.novel.scenes.values():
+            scene.sceneContent
+            # The scene contents still in the file are loaded before the file is replaced.
+        ContentMap.close_all(self.filePath)
+        # The file can not be replaced on all platforms as long as it is mapped.
+
+        if self._isTreePending:
+            self._parse_tree()
+            self._isTreePending = False
         self._build_element_tree()
         self._write_element_tree(self)
-        self._postprocess_xml_file(self.filePath)
+
+    def register_change(self, elements, elemId):
+        """Note a change reported to the novel, for rebuilding the xml element tree incrementally.
+
+        Positional arguments:
+            elements -- dictionary containing the changed element; the novel itself; or None.
+            elemId: str -- ID of the changed element, or None.
+
+        Called by the novel; see Novel.report_change().
+        """
+        if self._changes is None:
+            return
+
+        novel = self._observedNovel
+        for section, tag in (
+                (novel.scenes, 'SCENE'),
+                (novel.chapters, 'CHAPTER'),
+                (novel.characters, 'CHARACTER'),
+                (novel.locations, 'LOCATION'),
+                (novel.items, 'ITEM'),
+                (novel.projectNotes, 'PROJECTNOTE'),
+                (novel, 'PROJECT'),
+                ):
+            if elements is section:
+                self._changes.setdefault(tag, set()).add(elemId)
+                return
+
+        self._changes = None
+
+    def _observe_novel(self):
+        """Have the changes of the novel reported to this project file."""
+        if self._observedNovel is not self.novel:
+            if self._observedNovel is not None:
+                self._observedNovel.remove_observer(self)
+            self.novel.add_observer(self)
+            self._observedNovel = self.novel
 
     def _build_element_tree(self):
-        """Modify the yWriter project attributes of an existing xml element tree."""
+        """Modify the yWriter project attributes of an existing xml element tree.
+        
+        If the tree has been built before, rebuild only the subtrees of the elements
+        reported as changed since then. A tree read from a file is completely rebuilt 
+        at first, so its format is normalized.
+        """
 
         def set_element(parent, tag, text, index):
             subelement = parent.find(tag)
@@ -697,8 +829,8 @@ class Yw7File(File):
 
         def add_projectvariable(title, desc, tags):
             # Note:
-            # prjVars, xmlProjectvars are caller's variables
-            pvId = create_id(prjVars)
+            # prjVars, prjVarIds, xmlProjectvars are caller's variables
+            pvId = prjVarIds.create_id()
             prjVars.append(pvId)
             # side effect
             xmlProjectvar = ET.SubElement(xmlProjectvars, 'PROJECTVAR')
@@ -796,6 +928,58 @@ class Yw7File(File):
             except:
                 pass
 
+        def rebuild_section(xmlSection, tag, srtIds, elements, build_subtree):
+            """Rewrite a section in the novel's sort order, rebuilding the changed subtrees.
+            
+            Return True if the section has been rewritten.
+            """
+            # Note:
+            # changes is a caller's variable
+            if changes is None:
+                changedIds = None
+            elif tag in changes:
+                changedIds = changes[tag]
+            else:
+                return False
+
+            xmlElements = {}
+            for xmlElement in xmlSection.findall(tag):
+                xmlElements[xmlElement.find('ID').text] = xmlElement
+                xmlSection.remove(xmlElement)
+            for elemId in srtIds:
+                xmlElement = xmlElements.get(elemId, None)
+                if xmlElement is None or changedIds is None or elemId in changedIds:
+                    xmlElement = ET.Element(tag)
+                    ET.SubElement(xmlElement, 'ID').text = elemId
+                    build_subtree(xmlElement, elements[elemId])
+                xmlSection.append(xmlElement)
+            return True
+
+        def is_in_place(xmlSection, tag, changedIds, elements):
+            """Return True if the changed subtrees of a section can be rebuilt in place.
+            
+            This is not the case if the order has changed, or elements have been added or removed.
+            """
+            if changedIds is None or None in changedIds:
+                return False
+
+            if not changedIds:
+                return True
+
+            xmlIds = set([xmlElement.find('ID').text for xmlElement in xmlSection.findall(tag)])
+            for elemId in changedIds:
+                if not elemId in xmlIds or not elemId in elements:
+                    return False
+
+            return True
+
+        def indent_subtree(xmlElement, level):
+            """Indent a modified subtree, keeping the indentation of the following element."""
+            tail = xmlElement.tail
+            indent(xmlElement, level)
+            if tail is not None:
+                xmlElement.tail = tail
+
         def build_project_subtree(xmlProject):
             VER = '7'
             try:
@@ -921,64 +1105,47 @@ class Yw7File(File):
 
         #--- Process project attributes.
 
+        # Rebuild only the subtrees of the elements reported as changed.
+        if self.tree is None or not self._isBuilt:
+            changes = None
+        else:
+            changes = self._changes
+        changedSections = []
+
         build_project_subtree(xmlProject)
+        changedSections.append(xmlProject)
+        # Rebuilding the project subtree is cheap, and covers the languages found in the scenes.
 
         #--- Process Locations.
 
-        # Remove LOCATION entries in order to rewrite
-        # the LOCATIONS section in a modified sort order.
-        for xmlLoc in xmlLocations.findall('LOCATION'):
-            xmlLocations.remove(xmlLoc)
-
-        # Add the new XML location subtrees to the project tree.
-        for lcId in self.novel.srtLocations:
-            xmlLoc = ET.SubElement(xmlLocations, 'LOCATION')
-            ET.SubElement(xmlLoc, 'ID').text = lcId
-            build_location_subtree(xmlLoc, self.novel.locations[lcId])
+        # Rewrite the LOCATIONS section in a modified sort order.
+        if rebuild_section(xmlLocations, 'LOCATION', self.novel.srtLocations, self.novel.locations, build_location_subtree):
+            changedSections.append(xmlLocations)
 
         #--- Process Items.
 
-        # Remove ITEM entries in order to rewrite
-        # the ITEMS section in a modified sort order.
-        for xmlItm in xmlItems.findall('ITEM'):
-            xmlItems.remove(xmlItm)
-
-        # Add the new XML item subtrees to the project tree.
-        for itId in self.novel.srtItems:
-            xmlItm = ET.SubElement(xmlItems, 'ITEM')
-            ET.SubElement(xmlItm, 'ID').text = itId
-            build_item_subtree(xmlItm, self.novel.items[itId])
+        # Rewrite the ITEMS section in a modified sort order.
+        if rebuild_section(xmlItems, 'ITEM', self.novel.srtItems, self.novel.items, build_item_subtree):
+            changedSections.append(xmlItems)
 
         #--- Process Characters.
 
-        # Remove CHARACTER entries in order to rewrite
-        # the CHARACTERS section in a modified sort order.
-        for xmlCrt in xmlCharacters.findall('CHARACTER'):
-            xmlCharacters.remove(xmlCrt)
-
-        # Add the new XML character subtrees to the project tree.
-        for crId in self.novel.srtCharacters:
-            xmlCrt = ET.SubElement(xmlCharacters, 'CHARACTER')
-            ET.SubElement(xmlCrt, 'ID').text = crId
-            build_character_subtree(xmlCrt, self.novel.characters[crId])
+        # Rewrite the CHARACTERS section in a modified sort order.
+        if rebuild_section(xmlCharacters, 'CHARACTER', self.novel.srtCharacters, self.novel.characters, build_character_subtree):
+            changedSections.append(xmlCharacters)
 
         #--- Process project notes.
 
-        # Remove PROJECTNOTE entries in order to rewrite
-        # the PROJECTNOTES section in a modified sort order.
-        if xmlProjectnotes is not None:
-            for xmlProjectnote in xmlProjectnotes.findall('PROJECTNOTE'):
-                xmlProjectnotes.remove(xmlProjectnote)
-            if not self.novel.srtPrjNotes:
-                root.remove(xmlProjectnotes)
-        elif self.novel.srtPrjNotes:
-            xmlProjectnotes = ET.SubElement(root, 'PROJECTNOTES')
-        if self.novel.srtPrjNotes:
-            # Add the new XML prjNote subtrees to the project tree.
-            for pnId in self.novel.srtPrjNotes:
-                xmlProjectnote = ET.SubElement(xmlProjectnotes, 'PROJECTNOTE')
-                ET.SubElement(xmlProjectnote, 'ID').text = pnId
-                build_prjNote_subtree(xmlProjectnote, self.novel.projectNotes[pnId])
+        # Rewrite the PROJECTNOTES section in a modified sort order.
+        if changes is None or 'PROJECTNOTE' in changes:
+            if xmlProjectnotes is not None:
+                if not self.novel.srtPrjNotes:
+                    root.remove(xmlProjectnotes)
+            elif self.novel.srtPrjNotes:
+                xmlProjectnotes = ET.SubElement(root, 'PROJECTNOTES')
+            if self.novel.srtPrjNotes:
+                rebuild_section(xmlProjectnotes, 'PROJECTNOTE', self.novel.srtPrjNotes, self.novel.projectNotes, build_prjNote_subtree)
+                changedSections.append(xmlProjectnotes)
 
         #--- Process project variables.
         xmlProjectvars = root.find('PROJECTVARS')
@@ -1011,6 +1178,7 @@ class Yw7File(File):
                 elif title == 'Country':
                     xmlProjectvar.find('Desc').text = self.novel.countryCode
                     hasCountryCode = True
+            prjVarIds = IdAllocator(prjVars)
 
             # Define project variables for the missing locale.
             if not hasLanguageCode:
@@ -1032,43 +1200,80 @@ class Yw7File(File):
                                     f'<HTM </SPAN> /HTM>',
                                     '0')
                 # adding new IDs to the prjVars list
+            changedSections.append(xmlProjectvars)
 
         #--- Process scenes.
 
-        # Save the original XML scene subtrees
-        # and remove them from the project tree.
-        for xmlScene in xmlScenes.findall('SCENE'):
-            scId = xmlScene.find('ID').text
-            xmlNewScenes[scId] = xmlScene
-            xmlScenes.remove(xmlScene)
-
-        # Add the new XML scene subtrees to the project tree.
-        for scId in self.novel.scenes:
-            if not scId in xmlNewScenes:
-                xmlNewScenes[scId] = ET.Element('SCENE')
-                ET.SubElement(xmlNewScenes[scId], 'ID').text = scId
-            build_scene_subtree(xmlNewScenes[scId], self.novel.scenes[scId])
-            xmlScenes.append(xmlNewScenes[scId])
+        if changes is None:
+            changedIds = None
+        else:
+            changedIds = changes.get('SCENE', ())
+        changedScenes = []
+        if not is_in_place(xmlScenes, 'SCENE', changedIds, self.novel.scenes):
+
+            # Save the original XML scene subtrees
+            # and remove them from the project tree.
+            for xmlScene in xmlScenes.findall('SCENE'):
+                scId = xmlScene.find('ID').text
+                xmlNewScenes[scId] = xmlScene
+                xmlScenes.remove(xmlScene)
+
+            # Add the new XML scene subtrees to the project tree.
+            for scId in self.novel.scenes:
+                isNew = not scId in xmlNewScenes
+                if isNew:
+                    xmlNewScenes[scId] = ET.Element('SCENE')
+                    ET.SubElement(xmlNewScenes[scId], 'ID').text = scId
+                if isNew or changedIds is None or scId in changedIds:
+                    build_scene_subtree(xmlNewScenes[scId], self.novel.scenes[scId])
+                    changedScenes.append(xmlNewScenes[scId])
+                xmlScenes.append(xmlNewScenes[scId])
+            changedSections.append(xmlScenes)
+        else:
+            # Modify the changed XML scene subtrees in place.
+            for xmlScene in xmlScenes.findall('SCENE'):
+                scId = xmlScene.find('ID').text
+                if scId in changedIds:
+                    build_scene_subtree(xmlScene, self.novel.scenes[scId])
+                    changedScenes.append(xmlScene)
 
         #--- Process chapters.
 
-        # Save the original XML chapter subtree
-        # and remove it from the project tree.
-        for xmlChapter in xmlChapters.findall('CHAPTER'):
-            chId = xmlChapter.find('ID').text
-            xmlNewChapters[chId] = xmlChapter
-            xmlChapters.remove(xmlChapter)
-
-        # Add the new XML chapter subtrees to the project tree.
-        for chId in self.novel.srtChapters:
-            if not chId in xmlNewChapters:
-                xmlNewChapters[chId] = ET.Element('CHAPTER')
-                ET.SubElement(xmlNewChapters[chId], 'ID').text = chId
-            build_chapter_subtree(xmlNewChapters[chId], self.novel.chapters[chId])
-            xmlChapters.append(xmlNewChapters[chId])
+        if changes is None:
+            changedIds = None
+        else:
+            changedIds = changes.get('CHAPTER', ())
+        changedChapters = []
+        if not is_in_place(xmlChapters, 'CHAPTER', changedIds, self.novel.chapters):
+
+            # Save the original XML chapter subtree
+            # and remove it from the project tree.
+            for xmlChapter in xmlChapters.findall('CHAPTER'):
+                chId = xmlChapter.find('ID').text
+                xmlNewChapters[chId] = xmlChapter
+                xmlChapters.remove(xmlChapter)
+
+            # Add the new XML chapter subtrees to the project tree.
+            for chId in self.novel.srtChapters:
+                isNew = not chId in xmlNewChapters
+                if isNew:
+                    xmlNewChapters[chId] = ET.Element('CHAPTER')
+                    ET.SubElement(xmlNewChapters[chId], 'ID').text = chId
+                if isNew or changedIds is None or chId in changedIds:
+                    build_chapter_subtree(xmlNewChapters[chId], self.novel.chapters[chId])
+                    changedChapters.append(xmlNewChapters[chId])
+                xmlChapters.append(xmlNewChapters[chId])
+            changedSections.append(xmlChapters)
+        else:
+            # Modify the changed XML chapter subtrees in place.
+            for xmlChapter in xmlChapters.findall('CHAPTER'):
+                chId = xmlChapter.find('ID').text
+                if chId in changedIds:
+                    build_chapter_subtree(xmlChapter, self.novel.chapters[chId])
+                    changedChapters.append(xmlChapter)
 
         # Modify the scene contents of an existing xml element tree.
-        for xmlScene in root.find('SCENES'):
+        for xmlScene in changedScenes:
             scId = xmlScene.find('ID').text
             if self.novel.scenes[scId].sceneContent is not None:
                 xmlScene.find('SceneContent').text = self.novel.scenes[scId].sceneContent
@@ -1089,8 +1294,26 @@ class Yw7File(File):
             except:
                 pass
 
-        indent(root)
+        if changes is None:
+            indent(root)
+        else:
+            # Indent only the modified subtrees.
+            for xmlSection in changedSections:
+                indent_subtree(xmlSection, 1)
+            if not xmlScenes in changedSections:
+                for xmlScene in changedScenes:
+                    indent_subtree(xmlScene, 2)
+            if not xmlChapters in changedSections:
+                for xmlChapter in changedChapters:
+                    indent_subtree(xmlChapter, 2)
+            root.text = '\n  '
+            for xmlSection in root:
+                xmlSection.tail = '\n  '
+            xmlSection.tail = '\n'
         self.tree = ET.ElementTree(root)
+        self._changes = {}
+        self._treeFilePath = self.filePath
+        self._isBuilt = True
 
     def _convert_from_yw(self, text, quick=False):
         """Return text without markup, converted to target format.
@@ -1104,54 +1327,41 @@ class Yw7File(File):
         Overrides the superclass method.
         """
         if text:
-            # Apply XML predefined entities.
-            XML_REPLACEMENTS = [
-                ('&', '&amp;'),
-                ('>', '&gt;'),
-                ('<', '&lt;'),
-                ("'", '&apos;'),
-                ('"', '&quot;'),
-                ]
-            for yw, xm in XML_REPLACEMENTS:
-                text = text.replace(yw, xm)
+            text = XML_TRANSLATOR.translate(text)
         else:
             text = ''
         return text
 
-    def _postprocess_xml_file(self, filePath):
-        """Postprocess an xml file created by ElementTree.
+    def _serialize_xml(self, xmlRoot):
+        """Return the xml text of an element tree, formatted the way yWriter does.
         
         Positional argument:
-            filePath: str -- path to xml file.
+            xmlRoot -- root element of the tree to serialize.
         
-        Read the xml file, put a header on top, insert the missing CDATA tags,
-        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
-        Raise the "Error" exception in case of error. 
+        Serialize the tree in memory, put a header on top, insert the missing CDATA tags,
+        and replace xml entities by plain text (unescape). 
         
-        Note: The path is given as an argument rather than using self.filePath. 
+        Note: The root element is given as an argument rather than using self.tree. 
         So this routine can be used for yWriter-generated xml files other than .yw7 as well. 
         """
-        with open(filePath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        lines = text.split('\n')
-        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
-        for line in lines:
-            for tag in self._CDATA_TAGS:
-                line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
-                line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
-            newlines.append(line)
-        text = '\n'.join(newlines)
+
+        def insert_cdata(match):
+            if match.group(1):
+                return f']]></{match.group(2)}>'
+
+            return f'<{match.group(2)}><![CDATA['
+
+        text = ET.tostring(xmlRoot, encoding='unicode')
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        # Apply the same line break normalization as reading back a written file would do.
+        text = self._CDATA_TAG_PATTERN.sub(insert_cdata, text)
+        text = f'<?xml version="1.0" encoding="utf-8"?>\n{text}'
         text = text.replace('[CDATA[ \n', '[CDATA[')
         text = text.replace('\n]]', ']]')
         if not self.novel.chapters:
             text = text.replace('<CHAPTERS />', '<CHAPTERS></CHAPTERS>')
             # otherwise, yWriter fails to parse the file if there are no chapters.
-        text = unescape(text)
-        try:
-            with open(filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
-        except:
-            raise Error(f'{_("Cannot write file")}: "{norm_path(filePath)}".')
+        return unescape(text)
 
     def _read_project(self, root):
         """Read attributes at project level from the xml element tree."""
@@ -1210,6 +1420,20 @@ class Yw7File(File):
         if self.novel.kwVar['Field_CountryCode']:
             self.novel.countryCode = self.novel.kwVar['Field_CountryCode']
 
+    def _add_kw_var(self, element, fieldNames):
+        """Initialize the custom keyword variables the element's kwVar dictionary is not created with.
+        
+        Positional arguments:
+            element -- BasicElement instance.
+            fieldNames -- list of the names of the element's keyword variables.
+        
+        The other keyword variables are initialized when the dictionary is created on first access,
+        so no dictionary is allocated for an element without custom fields.
+        """
+        for fieldName in fieldNames:
+            if not fieldName in element.KWVAR_KEYS:
+                element.kwVar.setdefault(fieldName, None)
+
     def _read_locations(self, root):
         """Read locations from the xml element tree."""
         self.novel.srtLocations = []
@@ -1236,9 +1460,7 @@ class Yw7File(File):
                     tags = string_to_list(xmlLocation.find('Tags').text)
                     self.novel.locations[lcId].tags = self._strip_spaces(tags)
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.LOC_KWVAR:
-                self.novel.locations[lcId].kwVar[fieldName] = None
+            self._add_kw_var(self.novel.locations[lcId], self.LOC_KWVAR)
 
             #--- Read location custom fields.
             for xmlLocationFields in xmlLocation.findall('Fields'):
@@ -1273,9 +1495,7 @@ class Yw7File(File):
                     tags = string_to_list(xmlItem.find('Tags').text)
                     self.novel.items[itId].tags = self._strip_spaces(tags)
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.ITM_KWVAR:
-                self.novel.items[itId].kwVar[fieldName] = None
+            self._add_kw_var(self.novel.items[itId], self.ITM_KWVAR)
 
             #--- Read item custom fields.
             for xmlItemFields in xmlItem.findall('Fields'):
@@ -1327,9 +1547,7 @@ class Yw7File(File):
             else:
                 self.novel.characters[crId].isMajor = False
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.CRT_KWVAR:
-                self.novel.characters[crId].kwVar[fieldName] = None
+            self._add_kw_var(self.novel.characters[crId], self.CRT_KWVAR)
 
             #--- Read character custom fields.
             for xmlCharacterFields in xmlCharacter.findall('Fields'):
@@ -1391,189 +1609,280 @@ class Yw7File(File):
         except:
             pass
 
+    def _parse_tree(self):
+        """Parse the yWriter xml file and keep the xml element tree.
+        
+        Return the root element.
+        Raise the "Error" exception in case of error. 
+        """
+        try:
+            try:
+                with open(self.filePath, 'r', encoding='utf-8') as f:
+                    xmlText = f.read()
+            except:
+                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                with open(self.filePath, 'r', encoding='utf-16') as f:
+                    xmlText = f.read()
+        except:
+            try:
+                self.tree = ET.parse(self.filePath)
+            except Exception as ex:
+                raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        xmlText = CONTROL_CHARACTERS.sub('', xmlText)
+        root = ET.fromstring(xmlText)
+        xmlText = None
+        # saving memory
+        self.tree = ET.ElementTree(root)
+        return root
+
+    def _read_stream(self):
+        """Parse the yWriter xml file incrementally and get the instance variables.
+        
+        Feed the file chunk by chunk to a pull parser, removing control characters per chunk.
+        Read each section of the project as soon as it is complete, 
+        and release the section's subtree afterwards. Scenes are read and released one by one.
+        The chapters are read last, because they refer to the scenes.
+        No element tree is retained.
+        Raise the "Error" exception in case of error. 
+        """
+        try:
+            try:
+                self._parse_stream(get_text_chunks(self.filePath, 'utf-8', self._STREAM_CHUNK_SIZE))
+            except UnicodeError:
+                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                self._parse_stream(get_text_chunks(self.filePath, 'utf-16', self._STREAM_CHUNK_SIZE))
+        except Exception as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+        self.tree = None
+
+    def _read_lazy(self):
+        """Parse the yWriter xml file incrementally, leaving the scene contents in the file.
+        
+        Feed the memory-mapped file to a pull parser, skipping the scene contents. 
+        Provide each scene with a loader for its content, and with the counts stored in the file.
+        If the scene contents can not be located, e.g. in a UTF-16 encoded file, read all. 
+        No element tree is retained.
+        Raise the "Error" exception in case of error. 
+        """
+        contentMap = ContentMap(self.filePath)
+        chunks = contentMap.get_chunks(self._STREAM_CHUNK_SIZE)
+        try:
+            self._parse_stream(chunks)
+        except Exception:
+            chunks.close()
+            # The iterator releases the memory map, so it can be unmapped.
+            contentMap.close()
+            self.novel.languages = None
+            # The project variables may have been read; the languages are collected anew.
+            self._read_stream()
+        self.tree = None
+
+    def _parse_stream(self, chunks):
+        """Feed the yWriter xml file to a pull parser and read the sections as they are completed.
+        
+        Positional arguments:
+            chunks -- iterable of (data, loader) tuples: data is a chunk of xml text or bytes. 
+                      A loader that is not None returns the content of the SceneContent element 
+                      whose start tag was the last data fed.
+        
+        Raise ValueError if a loader doesn't follow a scene's SceneContent start tag.
+        """
+        sectionReaders = {
+            'PROJECT': self._read_project,
+            'LOCATIONS': self._read_locations,
+            'ITEMS': self._read_items,
+            'CHARACTERS': self._read_characters,
+            'PROJECTVARS': self._read_projectvars,
+            'PROJECTNOTES': self._read_projectnotes,
+            'CHAPTERS': self._read_chapters,
+            }
+
+        def read_scene(xmlScene, loader):
+            self._read_scene(xmlScene)
+            if loader is not None:
+                self.novel.scenes[xmlScene.find('ID').text].set_content_loader(
+                    loader,
+                    _get_count(xmlScene, 'WordCount'),
+                    _get_count(xmlScene, 'LetterCount'),
+                    )
+
+        parse_stream(chunks, sectionReaders, read_scene)
+
     def _read_scenes(self, root):
         """ Read attributes at scene level from the xml element tree."""
         for xmlScene in root.find('SCENES'):
-            scId = xmlScene.find('ID').text
-            self.novel.scenes[scId] = Scene()
+            self._read_scene(xmlScene)
 
-            if xmlScene.find('Title') is not None:
-                self.novel.scenes[scId].title = xmlScene.find('Title').text
+    def _read_scene(self, xmlScene):
+        """Read the attributes of a single scene from its xml subtree."""
+        scId = xmlScene.find('ID').text
+        self.novel.scenes[scId] = Scene()
 
-            if xmlScene.find('Desc') is not None:
-                self.novel.scenes[scId].desc = xmlScene.find('Desc').text
+        if xmlScene.find('Title') is not None:
+            self.novel.scenes[scId].title = xmlScene.find('Title').text
 
-            if xmlScene.find('SceneContent') is not None:
-                sceneContent = xmlScene.find('SceneContent').text
-                if sceneContent is not None:
-                    self.novel.scenes[scId].sceneContent = sceneContent
+        if xmlScene.find('Desc') is not None:
+            self.novel.scenes[scId].desc = xmlScene.find('Desc').text
 
-            #--- Read scene type.
+        if xmlScene.find('SceneContent') is not None:
+            sceneContent = xmlScene.find('SceneContent').text
+            if sceneContent is not None:
+                self.novel.scenes[scId].sceneContent = sceneContent
 
-            # This is how yWriter 7.1.3.0 reads the scene type:
-            #
-            # Type   |<Unused>|Field_SceneType>|scType
-            #--------+--------+----------------+------
-            # Notes  | x      | 1              | 1
-            # Todo   | x      | 2              | 2
-            # Unused | -1     | N/A            | 3
-            # Unused | -1     | 0              | 3
-            # Normal | N/A    | N/A            | 0
-            # Normal | N/A    | 0              | 0
+        self.novel.scenes[scId].scType = get_scene_type(xmlScene)
 
-            self.novel.scenes[scId].scType = 0
-
-            #--- Initialize custom keyword variables.
+        self._add_kw_var(self.novel.scenes[scId], self.SCN_KWVAR)
+        kwVar = {}
+        # The element's kwVar dictionary is only created if a custom field is found.
+        for xmlSceneFields in xmlScene.findall('Fields'):
+            #--- Read scene custom fields.
             for fieldName in self.SCN_KWVAR:
-                self.novel.scenes[scId].kwVar[fieldName] = None
+                field = xmlSceneFields.find(fieldName)
+                if field is not None:
+                    kwVar[fieldName] = field.text
 
-            for xmlSceneFields in xmlScene.findall('Fields'):
-                #--- Read scene custom fields.
-                for fieldName in self.SCN_KWVAR:
-                    field = xmlSceneFields.find(fieldName)
-                    if field is not None:
-                        self.novel.scenes[scId].kwVar[fieldName] = field.text
-
-                # Read scene type, if any.
-                if xmlSceneFields.find('Field_SceneType') is not None:
-                    if xmlSceneFields.find('Field_SceneType').text == '1':
-                        self.novel.scenes[scId].scType = 1
-                    elif xmlSceneFields.find('Field_SceneType').text == '2':
-                        self.novel.scenes[scId].scType = 2
-            if xmlScene.find('Unused') is not None:
-                if self.novel.scenes[scId].scType == 0:
-                    self.novel.scenes[scId].scType = 3
-
-            # Export when RTF.
-            if xmlScene.find('ExportCondSpecific') is None:
-                self.novel.scenes[scId].doNotExport = False
-            elif xmlScene.find('ExportWhenRTF') is not None:
-                self.novel.scenes[scId].doNotExport = False
-            else:
-                self.novel.scenes[scId].doNotExport = True
+        if kwVar:
+            self.novel.scenes[scId].kwVar.update(kwVar)
 
-            if xmlScene.find('Status') is not None:
-                self.novel.scenes[scId].status = int(xmlScene.find('Status').text)
+        #--- Set custom instance variables.
+        self.novel.scenes[scId].scnArcs = kwVar.get('Field_SceneArcs', None)
+        try:
+            self.novel.scenes[scId].scnMode = int(kwVar.get('Field_SceneMode', None))
+        except:
+            self.novel.scenes[scId].scnMode = None
 
-            if xmlScene.find('Notes') is not None:
-                self.novel.scenes[scId].notes = xmlScene.find('Notes').text
+        # Export when RTF.
+        if xmlScene.find('ExportCondSpecific') is None:
+            self.novel.scenes[scId].doNotExport = False
+        elif xmlScene.find('ExportWhenRTF') is not None:
+            self.novel.scenes[scId].doNotExport = False
+        else:
+            self.novel.scenes[scId].doNotExport = True
 
-            if xmlScene.find('Tags') is not None:
-                if xmlScene.find('Tags').text is not None:
-                    tags = string_to_list(xmlScene.find('Tags').text)
-                    self.novel.scenes[scId].tags = self._strip_spaces(tags)
+        if xmlScene.find('Status') is not None:
+            self.novel.scenes[scId].status = int(xmlScene.find('Status').text)
 
-            if xmlScene.find('Field1') is not None:
-                self.novel.scenes[scId].field1 = xmlScene.find('Field1').text
+        if xmlScene.find('Notes') is not None:
+            self.novel.scenes[scId].notes = xmlScene.find('Notes').text
 
-            if xmlScene.find('Field2') is not None:
-                self.novel.scenes[scId].field2 = xmlScene.find('Field2').text
+        if xmlScene.find('Tags') is not None:
+            if xmlScene.find('Tags').text is not None:
+                tags = string_to_list(xmlScene.find('Tags').text)
+                self.novel.scenes[scId].tags = self._strip_spaces(tags)
 
-            if xmlScene.find('Field3') is not None:
-                self.novel.scenes[scId].field3 = xmlScene.find('Field3').text
+        if xmlScene.find('Field1') is not None:
+            self.novel.scenes[scId].field1 = xmlScene.find('Field1').text
 
-            if xmlScene.find('Field4') is not None:
-                self.novel.scenes[scId].field4 = xmlScene.find('Field4').text
+        if xmlScene.find('Field2') is not None:
+            self.novel.scenes[scId].field2 = xmlScene.find('Field2').text
 
-            if xmlScene.find('AppendToPrev') is not None:
-                self.novel.scenes[scId].appendToPrev = True
-            else:
-                self.novel.scenes[scId].appendToPrev = False
+        if xmlScene.find('Field3') is not None:
+            self.novel.scenes[scId].field3 = xmlScene.find('Field3').text
 
-            #--- Scene start.
-            if xmlScene.find('SpecificDateTime') is not None:
-                dateTimeStr = xmlScene.find('SpecificDateTime').text
+        if xmlScene.find('Field4') is not None:
+            self.novel.scenes[scId].field4 = xmlScene.find('Field4').text
 
-                # Check SpecificDateTime for ISO compliance.
-                try:
-                    dateTime = datetime.fromisoformat(dateTimeStr)
-                except:
-                    self.novel.scenes[scId].date = ''
-                    self.novel.scenes[scId].time = ''
-                else:
-                    startDateTime = dateTime.isoformat().split('T')
-                    self.novel.scenes[scId].date = startDateTime[0]
-                    self.novel.scenes[scId].time = startDateTime[1]
-            else:
-                if xmlScene.find('Day') is not None:
-                    day = xmlScene.find('Day').text
+        if xmlScene.find('AppendToPrev') is not None:
+            self.novel.scenes[scId].appendToPrev = True
+        else:
+            self.novel.scenes[scId].appendToPrev = False
 
-                    # Check if Day represents an integer.
-                    try:
-                        int(day)
-                    except ValueError:
-                        day = ''
-                    self.novel.scenes[scId].day = day
+        #--- Scene start.
+        if xmlScene.find('SpecificDateTime') is not None:
+            dateTimeStr = xmlScene.find('SpecificDateTime').text
 
-                hasUnspecificTime = False
-                if xmlScene.find('Hour') is not None:
-                    hour = xmlScene.find('Hour').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    hour = '00'
-                if xmlScene.find('Minute') is not None:
-                    minute = xmlScene.find('Minute').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    minute = '00'
-                if hasUnspecificTime:
-                    self.novel.scenes[scId].time = f'{hour}:{minute}:00'
+            # Check SpecificDateTime for ISO compliance.
+            try:
+                dateTime = datetime.fromisoformat(dateTimeStr)
+            except:
+                self.novel.scenes[scId].date = ''
+                self.novel.scenes[scId].time = ''
+            else:
+                startDateTime = dateTime.isoformat().split('T')
+                self.novel.scenes[scId].date = startDateTime[0]
+                self.novel.scenes[scId].time = startDateTime[1]
+        else:
+            if xmlScene.find('Day') is not None:
+                day = xmlScene.find('Day').text
+
+                # Check if Day represents an integer.
+                try:
+                    int(day)
+                except ValueError:
+                    day = ''
+                self.novel.scenes[scId].day = day
+
+            hasUnspecificTime = False
+            if xmlScene.find('Hour') is not None:
+                hour = xmlScene.find('Hour').text.zfill(2)
+                hasUnspecificTime = True
+            else:
+                hour = '00'
+            if xmlScene.find('Minute') is not None:
+                minute = xmlScene.find('Minute').text.zfill(2)
+                hasUnspecificTime = True
+            else:
+                minute = '00'
+            if hasUnspecificTime:
+                self.novel.scenes[scId].time = f'{hour}:{minute}:00'
 
-            #--- Scene duration.
-            if xmlScene.find('LastsDays') is not None:
-                self.novel.scenes[scId].lastsDays = xmlScene.find('LastsDays').text
+        #--- Scene duration.
+        if xmlScene.find('LastsDays') is not None:
+            self.novel.scenes[scId].lastsDays = xmlScene.find('LastsDays').text
 
-            if xmlScene.find('LastsHours') is not None:
-                self.novel.scenes[scId].lastsHours = xmlScene.find('LastsHours').text
+        if xmlScene.find('LastsHours') is not None:
+            self.novel.scenes[scId].lastsHours = xmlScene.find('LastsHours').text
 
-            if xmlScene.find('LastsMinutes') is not None:
-                self.novel.scenes[scId].lastsMinutes = xmlScene.find('LastsMinutes').text
+        if xmlScene.find('LastsMinutes') is not None:
+            self.novel.scenes[scId].lastsMinutes = xmlScene.find('LastsMinutes').text
 
-            if xmlScene.find('ReactionScene') is not None:
-                self.novel.scenes[scId].isReactionScene = True
-            else:
-                self.novel.scenes[scId].isReactionScene = False
+        if xmlScene.find('ReactionScene') is not None:
+            self.novel.scenes[scId].isReactionScene = True
+        else:
+            self.novel.scenes[scId].isReactionScene = False
 
-            if xmlScene.find('SubPlot') is not None:
-                self.novel.scenes[scId].isSubPlot = True
-            else:
-                self.novel.scenes[scId].isSubPlot = False
-
-            if xmlScene.find('Goal') is not None:
-                self.novel.scenes[scId].goal = xmlScene.find('Goal').text
-
-            if xmlScene.find('Conflict') is not None:
-                self.novel.scenes[scId].conflict = xmlScene.find('Conflict').text
-
-            if xmlScene.find('Outcome') is not None:
-                self.novel.scenes[scId].outcome = xmlScene.find('Outcome').text
-
-            if xmlScene.find('ImageFile') is not None:
-                self.novel.scenes[scId].image = xmlScene.find('ImageFile').text
-
-            if xmlScene.find('Characters') is not None:
-                for characters in xmlScene.find('Characters').iter('CharID'):
-                    crId = characters.text
-                    if crId in self.novel.srtCharacters:
-                        if self.novel.scenes[scId].characters is None:
-                            self.novel.scenes[scId].characters = []
-                        self.novel.scenes[scId].characters.append(crId)
-
-            if xmlScene.find('Locations') is not None:
-                for locations in xmlScene.find('Locations').iter('LocID'):
-                    lcId = locations.text
-                    if lcId in self.novel.srtLocations:
-                        if self.novel.scenes[scId].locations is None:
-                            self.novel.scenes[scId].locations = []
-                        self.novel.scenes[scId].locations.append(lcId)
-
-            if xmlScene.find('Items') is not None:
-                for items in xmlScene.find('Items').iter('ItemID'):
-                    itId = items.text
-                    if itId in self.novel.srtItems:
-                        if self.novel.scenes[scId].items is None:
-                            self.novel.scenes[scId].items = []
-                        self.novel.scenes[scId].items.append(itId)
+        if xmlScene.find('SubPlot') is not None:
+            self.novel.scenes[scId].isSubPlot = True
+        else:
+            self.novel.scenes[scId].isSubPlot = False
+
+        if xmlScene.find('Goal') is not None:
+            self.novel.scenes[scId].goal = xmlScene.find('Goal').text
+
+        if xmlScene.find('Conflict') is not None:
+            self.novel.scenes[scId].conflict = xmlScene.find('Conflict').text
+
+        if xmlScene.find('Outcome') is not None:
+            self.novel.scenes[scId].outcome = xmlScene.find('Outcome').text
+
+        if xmlScene.find('ImageFile') is not None:
+            self.novel.scenes[scId].image = xmlScene.find('ImageFile').text
+
+        if xmlScene.find('Characters') is not None:
+            for characters in xmlScene.find('Characters').iter('CharID'):
+                crId = characters.text
+                if crId in self.novel.srtCharacters:
+                    if self.novel.scenes[scId].characters is None:
+                        self.novel.scenes[scId].characters = []
+                    self.novel.scenes[scId].characters.append(crId)
+
+        if xmlScene.find('Locations') is not None:
+            for locations in xmlScene.find('Locations').iter('LocID'):
+                lcId = locations.text
+                if lcId in self.novel.srtLocations:
+                    if self.novel.scenes[scId].locations is None:
+                        self.novel.scenes[scId].locations = []
+                    self.novel.scenes[scId].locations.append(lcId)
+
+        if xmlScene.find('Items') is not None:
+            for items in xmlScene.find('Items').iter('ItemID'):
+                itId = items.text
+                if itId in self.novel.srtItems:
+                    if self.novel.scenes[scId].items is None:
+                        self.novel.scenes[scId].items = []
+                    self.novel.scenes[scId].items.append(itId)
 
     def _read_chapters(self, root):
         """Read attributes at chapter level from the xml element tree."""
@@ -1595,50 +1904,14 @@ class Yw7File(File):
             else:
                 self.novel.chapters[chId].chLevel = 0
 
-            # This is how yWriter 7.1.3.0 reads the chapter type:
-            #
-            # Type   |<Unused>|<Type>|<ChapterType>|chType
-            # -------+--------+------+--------------------
-            # Normal | N/A    | N/A  | N/A         | 0
-            # Normal | N/A    | 0    | N/A         | 0
-            # Notes  | x      | 1    | N/A         | 1
-            # Unused | -1     | 0    | N/A         | 3
-            # Normal | N/A    | x    | 0           | 0
-            # Notes  | x      | x    | 1           | 1
-            # Todo   | x      | x    | 2           | 2
-            # Unused | -1     | x    | x           | 3
-
-            self.novel.chapters[chId].chType = 0
-            if xmlChapter.find('Unused') is not None:
-                yUnused = True
-            else:
-                yUnused = False
-            if xmlChapter.find('ChapterType') is not None:
-                # The file may be created with yWriter version 7.0.7.2+
-                yChapterType = xmlChapter.find('ChapterType').text
-                if yChapterType == '2':
-                    self.novel.chapters[chId].chType = 2
-                elif yChapterType == '1':
-                    self.novel.chapters[chId].chType = 1
-                elif yUnused:
-                    self.novel.chapters[chId].chType = 3
-            else:
-                # The file may be created with a yWriter version prior to 7.0.7.2
-                if xmlChapter.find('Type') is not None:
-                    yType = xmlChapter.find('Type').text
-                    if yType == '1':
-                        self.novel.chapters[chId].chType = 1
-                    elif yUnused:
-                        self.novel.chapters[chId].chType = 3
+            self.novel.chapters[chId].chType = get_chapter_type(xmlChapter)
 
             self.novel.chapters[chId].suppressChapterTitle = False
             if self.novel.chapters[chId].title is not None:
                 if self.novel.chapters[chId].title.startswith('@'):
                     self.novel.chapters[chId].suppressChapterTitle = True
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.CHP_KWVAR:
-                self.novel.chapters[chId].kwVar[fieldName] = None
+            self._add_kw_var(self.novel.chapters[chId], self.CHP_KWVAR)
 
             #--- Read chapter fields.
             for xmlChapterFields in xmlChapter.findall('Fields'):
@@ -1695,7 +1968,8 @@ class Yw7File(File):
             else:
                 backedUp = True
         try:
-            ywProject.tree.write(ywProject.filePath, xml_declaration=False, encoding='utf-8')
+            with open(ywProject.filePath, 'w', encoding='utf-8') as f:
+                f.write(self._serialize_xml(ywProject.tree.getroot()))
         except:
             if backedUp:
                 os.replace(f'{ywProject.filePath}.bak', ywProject.filePath)
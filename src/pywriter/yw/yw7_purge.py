@@ -55,6 +55,8 @@ def reset_custom_variables(prjFile):
             if prjFile.novel.projectnotes[pnId].kwVar.get(field, None):
                 prjFile.novel.projectnotes[pnId].kwVar[field] = ''
                 hasChanged = True
+    if hasChanged:
+        prjFile.novel.report_change()
     return hasChanged
 
 
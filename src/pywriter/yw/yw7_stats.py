@@ -0,0 +1,223 @@
+"""Provide a class for a yWriter 7 project summary, read without the scene contents.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.pywriter_globals import *
+from pywriter.model.scene import count_words
+from pywriter.model.scene import count_letters
+from pywriter.yw.content_map import ContentMap
+from pywriter.yw.yw7_stream import get_text_chunks
+from pywriter.yw.yw7_stream import parse_stream
+from pywriter.yw.yw7_stream import get_scene_type
+from pywriter.yw.yw7_stream import get_chapter_type
+
+
+class Yw7Stats:
+    """Summary of a yWriter 7 project's structure and counts.
+
+    Public methods:
+        read() -- Read the summary from the yWriter project file.
+        get_chapter_counts(chId) -- Return the word count and letter count of a chapter's normal scenes.
+        get_status_counts() -- Return the number of normal scenes and their word count per scene status.
+        get_totals() -- Return the number of normal scenes, the word count, and the letter count.
+
+    Public instance variables:
+        filePath: str -- path to the yWriter project file.
+        title: str -- title.
+        authorName: str -- author's name.
+        wordTarget: int -- the word target of the project.
+        wordCountStart: int -- the word count when the project was started.
+        srtChapters: list of str -- the chapter IDs in order.
+        chapterTitles: dict -- key: chapter ID, value: chapter title.
+        chapterLevels: dict -- key: chapter ID, value: chapter level (chapter/part).
+        chapterTypes: dict -- key: chapter ID, value: chapter type (Normal/Notes/Todo/Unused).
+        chapterScenes: dict -- key: chapter ID, value: list of the chapter's scene IDs.
+        sceneTitles: dict -- key: scene ID, value: scene title.
+        sceneTypes: dict -- key: scene ID, value: scene type (Normal/Notes/Todo/Unused).
+        sceneStatus: dict -- key: scene ID, value: scene status (Outline/Draft/1st Edit/2nd Edit/Done).
+        wordCounts: dict -- key: scene ID, value: word count.
+        letterCounts: dict -- key: scene ID, value: letter count.
+
+    The file is parsed incrementally, skipping the scene contents.
+    The word counts and letter counts stored in the file are used. Only if they are missing,
+    e.g. in a file written by PyWriter, the scene content is read and counted like in the Scene class.
+    Scenes in non-"Normal" chapters inherit the chapter's type, like in Yw7File.
+    """
+    _STREAM_CHUNK_SIZE = 0x100000
+    # Number of bytes or characters fed to the incremental parser at once.
+
+    def __init__(self, filePath):
+        """Initialize instance variables.
+
+        Positional arguments:
+            filePath: str -- path to the yw7 file.
+        """
+        self.filePath = filePath
+        self._reset()
+
+    def read(self):
+        """Read the summary from the yWriter project file.
+
+        Raise the "Error" exception in case of error.
+        """
+        contentMap = ContentMap(self.filePath)
+        chunks = contentMap.get_chunks(self._STREAM_CHUNK_SIZE)
+        try:
+            try:
+                self._parse_stream(chunks)
+            except UnicodeError:
+                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                self._parse_stream(get_text_chunks(self.filePath, 'utf-16', self._STREAM_CHUNK_SIZE))
+            except ValueError:
+                # The scene contents can not be located.
+                self._parse_stream(get_text_chunks(self.filePath, 'utf-8', self._STREAM_CHUNK_SIZE))
+        except Exception as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+        finally:
+            chunks.close()
+            # The iterator releases the memory map, so it can be unmapped.
+            contentMap.close()
+
+        for chId in self.srtChapters:
+            if self.chapterTypes[chId] != 0:
+                for scId in self.chapterScenes[chId]:
+                    self.sceneTypes[scId] = self.chapterTypes[chId]
+
+    def get_chapter_counts(self, chId):
+        """Return a tuple: (word count, letter count) of a chapter's normal scenes.
+
+        Positional arguments:
+            chId: str -- chapter ID.
+        """
+        wordCount = 0
+        letterCount = 0
+        for scId in self.chapterScenes[chId]:
+            if self.sceneTypes[scId] == 0:
+                wordCount += self.wordCounts[scId]
+                letterCount += self.letterCounts[scId]
+        return wordCount, letterCount
+
+    def get_status_counts(self):
+        """Return a dictionary: key: scene status, value: tuple (number of normal scenes, word count)."""
+        statusCounts = {}
+        for chId in self.srtChapters:
+            for scId in self.chapterScenes[chId]:
+                if self.sceneTypes[scId] == 0:
+                    scenes, words = statusCounts.get(self.sceneStatus[scId], (0, 0))
+                    statusCounts[self.sceneStatus[scId]] = (scenes + 1, words + self.wordCounts[scId])
+        return statusCounts
+
+    def get_totals(self):
+        """Return a tuple: (number of normal scenes, word count, letter count)."""
+        scenes = 0
+        wordCount = 0
+        letterCount = 0
+        for chId in self.srtChapters:
+            for scId in self.chapterScenes[chId]:
+                if self.sceneTypes[scId] == 0:
+                    scenes += 1
+                    wordCount += self.wordCounts[scId]
+                    letterCount += self.letterCounts[scId]
+        return scenes, wordCount, letterCount
+
+    def _reset(self):
+        """Set the summary to an empty project."""
+        self.title = None
+        self.authorName = None
+        self.wordTarget = None
+        self.wordCountStart = None
+        self.srtChapters = []
+        self.chapterTitles = {}
+        self.chapterLevels = {}
+        self.chapterTypes = {}
+        self.chapterScenes = {}
+        self.sceneTitles = {}
+        self.sceneTypes = {}
+        self.sceneStatus = {}
+        self.wordCounts = {}
+        self.letterCounts = {}
+
+    def _parse_stream(self, chunks):
+        """Feed the yWriter xml file to a pull parser and read the summary.
+
+        Positional arguments:
+            chunks -- iterable of (data, loader) tuples, as returned by ContentMap.get_chunks().
+
+        Raise ValueError if a loader doesn't follow a scene's SceneContent start tag.
+        """
+        self._reset()
+        sectionReaders = {
+            'PROJECT': self._read_project,
+            'CHAPTERS': self._read_chapters,
+            }
+        parse_stream(chunks, sectionReaders, self._read_scene)
+
+    def _read_project(self, root):
+        """Read the project's title, author, and word count settings."""
+        xmlProject = root.find('PROJECT')
+        self.title = _get_text(xmlProject, 'Title')
+        self.authorName = _get_text(xmlProject, 'AuthorName')
+        self.wordTarget = _get_int(xmlProject, 'WordTarget')
+        self.wordCountStart = _get_int(xmlProject, 'WordCountStart')
+
+    def _read_scene(self, xmlScene, loader):
+        """Read a scene's title, type, status, and counts.
+
+        Positional arguments:
+            xmlScene -- the scene's xml subtree.
+            loader -- callable returning the scene content, or None if the content is in the subtree.
+        """
+        scId = xmlScene.find('ID').text
+        self.sceneTitles[scId] = _get_text(xmlScene, 'Title')
+        self.sceneTypes[scId] = get_scene_type(xmlScene)
+        self.sceneStatus[scId] = _get_int(xmlScene, 'Status')
+        wordCount = _get_int(xmlScene, 'WordCount')
+        letterCount = _get_int(xmlScene, 'LetterCount')
+        if wordCount is None or letterCount is None:
+            if loader is not None:
+                sceneContent = loader()
+            else:
+                sceneContent = xmlScene.findtext('SceneContent')
+            if sceneContent:
+                wordCount = count_words(sceneContent)
+                letterCount = count_letters(sceneContent)
+            else:
+                wordCount = 0
+                letterCount = 0
+        self.wordCounts[scId] = wordCount
+        self.letterCounts[scId] = letterCount
+
+    def _read_chapters(self, root):
+        """Read the chapters' titles, levels, types, and scene lists."""
+        for xmlChapter in root.find('CHAPTERS'):
+            chId = xmlChapter.find('ID').text
+            self.srtChapters.append(chId)
+            self.chapterTitles[chId] = _get_text(xmlChapter, 'Title')
+            if xmlChapter.find('SectionStart') is not None:
+                self.chapterLevels[chId] = 1
+            else:
+                self.chapterLevels[chId] = 0
+            self.chapterTypes[chId] = get_chapter_type(xmlChapter)
+            self.chapterScenes[chId] = []
+            for xmlScId in xmlChapter.findall('Scenes/ScID'):
+                if xmlScId.text in self.sceneTypes:
+                    self.chapterScenes[chId].append(xmlScId.text)
+
+
+def _get_text(parent, tag):
+    """Return the text of a subelement, or None if missing."""
+    element = parent.find(tag)
+    if element is None:
+        return None
+
+    return element.text
+
+
+def _get_int(parent, tag):
+    """Return the integer value of a subelement, or None if missing or invalid."""
+    try:
+        return int(parent.find(tag).text)
+    except:
+        return None
@@ -0,0 +1,160 @@
+"""Provide functions for parsing a yWriter 7 project file incrementally.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+import xml.etree.ElementTree as ET
+
+CONTROL_CHARACTERS = re.compile('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]')
+# Characters not allowed in XML; they are removed before parsing.
+
+
+def get_text_chunks(filePath, encoding, chunkSize):
+    """Return an iterator over (xml text, None) tuples, reading a yWriter xml file chunk by chunk.
+
+    Positional arguments:
+        filePath: str -- path to the yWriter xml file.
+        encoding: str -- encoding of the yWriter xml file.
+        chunkSize: int -- number of characters read at once.
+
+    Control characters are removed per chunk.
+    """
+    with open(filePath, 'r', encoding=encoding) as f:
+        while True:
+            xmlText = f.read(chunkSize)
+            if not xmlText:
+                break
+
+            yield CONTROL_CHARACTERS.sub('', xmlText), None
+
+
+def parse_stream(chunks, sectionReaders, read_scene):
+    """Feed a yWriter xml file to a pull parser and read the sections as they are completed.
+
+    Positional arguments:
+        chunks -- iterable of (data, loader) tuples: data is a chunk of xml text or bytes.
+                  A loader that is not None returns the content of the SceneContent element
+                  whose start tag was the last data fed.
+        sectionReaders -- dict: key: section tag, value: function to be called with the root element.
+        read_scene -- function to be called with a scene's subtree and its content loader, or None.
+
+    Each scene is read and released as soon as it is complete, and so is each section.
+    The CHAPTERS section is read last, because the chapters refer to the scenes.
+    No element tree is retained.
+    Raise ValueError if a loader doesn't follow a scene's SceneContent start tag.
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    root = None
+    xmlScenes = None
+    xmlChapters = None
+    depth = 0
+    lastStarted = None
+    # Element of the last start event, if no end event followed.
+    sceneLoader = None
+    # Content loader of the scene being parsed.
+
+    def process_events():
+        nonlocal root, xmlScenes, xmlChapters, depth, lastStarted, sceneLoader
+        for event, element in parser.read_events():
+            if event == 'start':
+                depth += 1
+                lastStarted = element
+                if depth == 1:
+                    root = element
+                elif depth == 2 and element.tag == 'SCENES':
+                    xmlScenes = element
+                continue
+
+            depth -= 1
+            lastStarted = None
+            if depth == 2 and element.tag == 'SCENE' and xmlScenes is not None:
+                # The scene is complete.
+                read_scene(element, sceneLoader)
+                sceneLoader = None
+                xmlScenes.remove(element)
+            elif depth == 1:
+                # The section is complete.
+                if element.tag == 'CHAPTERS':
+                    xmlChapters = element
+                else:
+                    if element.tag in sectionReaders:
+                        sectionReaders[element.tag](root)
+                    root.remove(element)
+
+    for data, loader in chunks:
+        parser.feed(data)
+        process_events()
+        if loader is not None:
+            if lastStarted is None or lastStarted.tag != 'SceneContent' or depth != 4 or xmlScenes is None:
+                raise ValueError('Scene content not found')
+
+            sceneLoader = loader
+    parser.close()
+    process_events()
+    if xmlChapters is not None and 'CHAPTERS' in sectionReaders:
+        sectionReaders['CHAPTERS'](root)
+
+
+def get_scene_type(xmlScene):
+    """Return the type of a scene (Normal/Notes/Todo/Unused), read from its xml subtree.
+
+    This is how yWriter 7.1.3.0 reads the scene type:
+
+    Type   |<Unused>|Field_SceneType>|scType
+    -------+--------+----------------+------
+    Notes  | x      | 1              | 1
+    Todo   | x      | 2              | 2
+    Unused | -1     | N/A            | 3
+    Unused | -1     | 0              | 3
+    Normal | N/A    | N/A            | 0
+    Normal | N/A    | 0              | 0
+    """
+    scType = 0
+    for xmlSceneFields in xmlScene.findall('Fields'):
+        ySceneType = xmlSceneFields.findtext('Field_SceneType')
+        if ySceneType == '1':
+            scType = 1
+        elif ySceneType == '2':
+            scType = 2
+    if scType == 0 and xmlScene.find('Unused') is not None:
+        scType = 3
+    return scType
+
+
+def get_chapter_type(xmlChapter):
+    """Return the type of a chapter (Normal/Notes/Todo/Unused), read from its xml subtree.
+
+    This is how yWriter 7.1.3.0 reads the chapter type:
+
+    Type   |<Unused>|<Type>|<ChapterType>|chType
+    -------+--------+------+--------------------
+    Normal | N/A    | N/A  | N/A         | 0
+    Normal | N/A    | 0    | N/A         | 0
+    Notes  | x      | 1    | N/A         | 1
+    Unused | -1     | 0    | N/A         | 3
+    Normal | N/A    | x    | 0           | 0
+    Notes  | x      | x    | 1           | 1
+    Todo   | x      | x    | 2           | 2
+    Unused | -1     | x    | x           | 3
+    """
+    chType = 0
+    yUnused = xmlChapter.find('Unused') is not None
+    if xmlChapter.find('ChapterType') is not None:
+        # The file may be created with yWriter version 7.0.7.2+
+        yChapterType = xmlChapter.find('ChapterType').text
+        if yChapterType == '2':
+            chType = 2
+        elif yChapterType == '1':
+            chType = 1
+        elif yUnused:
+            chType = 3
+    elif xmlChapter.find('Type') is not None:
+        # The file may be created with a yWriter version prior to 7.0.7.2
+        yType = xmlChapter.find('Type').text
+        if yType == '1':
+            chType = 1
+        elif yUnused:
+            chType = 3
+    return chType
@@ -0,0 +1,63 @@
+"""Regression test for the pyWriter project.
+
+Test the bulk conversion of directory trees.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+from pywriter.converter.batch_converter import BatchConverter
+import unittest
+
+DATA_PATH = '../test/data/_proof/'
+EXEC_PATH = '../test/tmp/batch/'
+STATE_FILE = '../test/tmp/batch_state.json'
+
+
+class BatchConversion(unittest.TestCase):
+
+    def setUp(self):
+        self.tearDown()
+        os.makedirs(f'{EXEC_PATH}locked', exist_ok=True)
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', f'{EXEC_PATH}project.yw7')
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', f'{EXEC_PATH}locked/project.yw7')
+        open(f'{EXEC_PATH}locked/project.yw7.lock', 'w').close()
+
+    def tearDown(self):
+        shutil.rmtree(EXEC_PATH, ignore_errors=True)
+        if os.path.isfile(STATE_FILE):
+            os.remove(STATE_FILE)
+
+    def test_round_trip(self):
+        converter = BatchConverter(suffixes=['_proof'], processes=1, statePath=STATE_FILE)
+        summary = converter.run([EXEC_PATH])
+        self.assertEqual(summary['counts'], {'converted': 1, 'failed': 0, 'skipped': 0, 'locked': 1})
+        self.assertTrue(os.path.isfile(f'{EXEC_PATH}project_proof.odt'))
+
+        # Nothing has changed since the last run.
+        summary = converter.run([EXEC_PATH])
+        self.assertEqual(summary['counts'], {'converted': 0, 'failed': 0, 'skipped': 2, 'locked': 1})
+
+        # A document that has been modified is written back, and the project is exported again.
+        shutil.copyfile(f'{DATA_PATH}proofed.odt', f'{EXEC_PATH}project_proof.odt')
+        summary = converter.run([EXEC_PATH])
+        self.assertEqual(summary['counts'], {'converted': 2, 'failed': 0, 'skipped': 0, 'locked': 1})
+        self.assertEqual([(entry['type'], entry['status']) for entry in summary['files'] if entry['status'] == 'converted'],
+                         [('import', 'converted'), ('export', 'converted')])
+
+    def test_manifest(self):
+        with open(f'{EXEC_PATH}manifest.txt', 'w', encoding='utf-8') as f:
+            f.write('# Projects to export\nproject.yw7\n')
+        converter = BatchConverter(suffixes=['_proof'], processes=1)
+        self.assertEqual(converter.collect([f'{EXEC_PATH}manifest.txt']), [os.path.normpath(f'{EXEC_PATH}project.yw7')])
+        summary = converter.run([f'{EXEC_PATH}manifest.txt'])
+        self.assertEqual(summary['counts'], {'converted': 1, 'failed': 0, 'skipped': 0, 'locked': 0})
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Regression test for the pyWriter project.
+
+Test the incremental update of the cross references.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import random
+from pywriter.model.cross_references import CrossReferences
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.yw.yw7_file import Yw7File
+import unittest
+
+TEST_PROJECT = '../test/data/_xref/normal.yw7'
+XREF_DICTIONARIES = ('scnPerChr', 'scnPerLoc', 'scnPerItm', 'scnPerTag', 'chrPerTag', 'locPerTag', 'itmPerTag',
+                     'chpPerScn', 'chrPerScn', 'locPerScn', 'itmPerScn', 'tagPerScn', 'srtScenes')
+
+
+class IncrementalXref(unittest.TestCase):
+
+    def setUp(self):
+        ywFile = Yw7File(TEST_PROJECT)
+        ywFile.novel = Novel()
+        ywFile.read()
+        self.novel = ywFile.novel
+        self.xref = CrossReferences()
+        self.xref.generate_xref(self.novel)
+        self.random = random.Random(1)
+
+    def assert_regenerated(self):
+        expected = CrossReferences()
+        expected.generate_xref(self.novel)
+        for name in XREF_DICTIONARIES:
+            self.assertEqual(getattr(self.xref, name), getattr(expected, name), name)
+
+    def change_scene(self, scId):
+        scene = self.novel.scenes[scId]
+        scene.characters = self.random.sample(self.novel.srtCharacters, self.random.randint(0, 3))
+        scene.locations = self.random.sample(self.novel.srtLocations, self.random.randint(0, 2))
+        scene.items = self.random.sample(self.novel.srtItems, self.random.randint(0, len(self.novel.srtItems)))
+        scene.tags = self.random.sample(['red', 'green', 'blue', 'new'], self.random.randint(0, 2))
+
+    def move_scene(self):
+        """Move a random scene, and return the IDs of the chapters concerned."""
+        source, target = self.random.choice(self.novel.srtChapters), self.random.choice(self.novel.srtChapters)
+        if self.novel.chapters[source].srtScenes:
+            scId = self.novel.chapters[source].srtScenes.pop(self.random.randrange(len(self.novel.chapters[source].srtScenes)))
+            self.novel.chapters[target].srtScenes.insert(self.random.randint(0, len(self.novel.chapters[target].srtScenes)), scId)
+        return source, target
+
+    def test_update_scene(self):
+        for __ in range(50):
+            scId = self.random.choice(self.xref.srtScenes)
+            self.change_scene(scId)
+            self.xref.update_scene(scId)
+            self.assert_regenerated()
+        self.assertEqual(self.xref.tagPerScn[scId], self.novel.scenes[scId].tags)
+
+    def test_update_chapter(self):
+        for __ in range(50):
+            for chId in self.move_scene():
+                self.xref.update_chapter(chId)
+            self.assert_regenerated()
+
+    def test_reorder(self):
+        for chId in self.novel.srtChapters:
+            if len(self.novel.chapters[chId].srtScenes) > 1:
+                break
+        positions = {scId: position for scId, position in self.xref._scenePositions.items() if self.xref.chpPerScn[scId] != chId}
+        self.novel.chapters[chId].srtScenes.reverse()
+        self.xref.update_chapter(chId)
+        self.assert_regenerated()
+
+        # The scenes of the other chapters keep their positions.
+        for scId in positions:
+            self.assertIs(self.xref._scenePositions[scId], positions[scId])
+
+    def test_new_scene(self):
+        scId = self.novel.create_id(self.novel.scenes)
+        self.novel.scenes[scId] = Scene()
+        self.change_scene(scId)
+        chId = self.novel.srtChapters[0]
+        self.novel.chapters[chId].srtScenes.insert(0, scId)
+        self.xref.update_chapter(chId)
+        self.assert_regenerated()
+        self.assertEqual(self.xref.chpPerScn[scId], chId)
+        self.novel.chapters[chId].srtScenes.remove(scId)
+        self.xref.update_chapter(chId)
+        self.assert_regenerated()
+        self.assertNotIn(scId, self.xref.tagPerScn)
+
+    def test_update_xref(self):
+        for __ in range(30):
+            scId = self.random.choice(list(self.novel.scenes))
+            self.change_scene(scId)
+            self.novel.report_change(self.novel.scenes, scId)
+            for chId in self.move_scene():
+                self.novel.report_change(self.novel.chapters, chId)
+            self.xref.update_xref()
+            self.assert_regenerated()
+        self.novel.srtChapters.reverse()
+        self.novel.report_change(self.novel.chapters)
+        self.xref.update_xref()
+        self.assert_regenerated()
+
+        # Changes not reported are not processed.
+        scId = self.xref.srtScenes[0]
+        self.novel.scenes[scId].tags = ['unreported']
+        self.xref.update_xref()
+        self.assertNotIn('unreported', self.xref.scnPerTag)
+        self.novel.report_change(self.novel.scenes, scId)
+        self.xref.update_xref()
+        self.assertEqual(self.xref.scnPerTag['unreported'], [scId])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Regression test for the pyWriter project.
+
+Test the export of one yWriter project to several targets.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zipfile
+from shutil import copyfile
+from pywriter.pywriter_globals import *
+from pywriter.test.helper import read_file
+from pywriter.converter.yw7_converter import Yw7Converter
+import unittest
+
+DATA_PATH = '../test/data/_proof/'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+
+
+def get_content(filePath):
+    """Return the content.xml of an ODF file as a string."""
+    with zipfile.ZipFile(filePath, 'r') as odfFile:
+        return odfFile.read('content.xml').decode('utf-8')
+
+
+class ExportAll(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._remove_all_tempfiles()
+        copyfile(f'{DATA_PATH}normal.yw7', TEST_YW_FILE)
+
+    def tearDown(self):
+        self._remove_all_tempfiles()
+
+    def test_parallel(self):
+        converter = Yw7Converter()
+        result = converter.export_all(TEST_YW_FILE, processes=2)
+        self.assertIsNone(result.sourceError)
+        self.assertEqual(result.errors, {})
+        self.assertEqual(len(result.newFiles), len(Yw7Converter.EXPORT_TARGET_CLASSES))
+        self.assertEqual(set(result.timings), set(result.newFiles))
+        self.assertEqual(read_file(f'{DATA_PATH}content.xml'), get_content(result.newFiles['_proof']))
+        parallelContents = {}
+        for suffix, filePath in result.newFiles.items():
+            parallelContents[suffix] = get_content(filePath)
+        result = converter.export_all(TEST_YW_FILE, processes=1)
+        self.assertEqual(result.errors, {})
+        for suffix, filePath in result.newFiles.items():
+            self.assertEqual(get_content(filePath), parallelContents[suffix])
+
+    def test_errors(self):
+        converter = Yw7Converter()
+        result = converter.export_all(TEST_YW_FILE, suffixes=['_proof', '_unknown'])
+        self.assertEqual(list(result.newFiles), ['_proof'])
+        self.assertEqual(list(result.errors), ['_unknown'])
+        self.assertTrue(converter.ui.infoHowText.startswith('FAIL'))
+        result = converter.export_all(f'{EXEC_PATH}missing.yw7')
+        self.assertEqual(result.sourceError, f'{_("File not found")}: "{norm_path(EXEC_PATH + "missing.yw7")}".')
+        self.assertEqual(result.newFiles, {})
+
+    def _remove_all_tempfiles(self):
+        for fileName in os.listdir(EXEC_PATH):
+            if fileName.startswith('yw7 Sample Project'):
+                os.remove(f'{EXEC_PATH}{fileName}')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
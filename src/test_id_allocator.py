@@ -0,0 +1,63 @@
+"""Regression test for the pyWriter project.
+
+Test the ID allocation for new elements.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.model.id_generator import create_id
+from pywriter.model.id_allocator import IdAllocator
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+import unittest
+
+
+class IdAllocation(unittest.TestCase):
+
+    def test_like_create_id(self):
+        elements = {'1': None, '2': None, '5': None, 'x': None}
+        allocator = IdAllocator(elements)
+        for __ in range(5):
+            expected = create_id(elements)
+            self.assertEqual(allocator.create_id(), expected)
+            elements[expected] = None
+
+    def test_external_changes(self):
+        elements = ['1', '3']
+        allocator = IdAllocator(elements)
+        elements.extend(['2', '4'])
+        self.assertEqual(allocator.create_id(), '5')
+
+    def test_release_id(self):
+        elements = {}
+        allocator = IdAllocator(elements)
+        for __ in range(4):
+            elements[allocator.create_id()] = None
+        del elements['2']
+        allocator.release_id('2')
+        allocator.release_id('2')
+        self.assertEqual(allocator.create_id(), '2')
+        self.assertEqual(allocator.create_id(), '5')
+
+        # A reused ID can be released again.
+        elements['2'] = None
+        del elements['2']
+        allocator.release_id('2')
+        self.assertEqual(allocator.create_id(), '2')
+
+    def test_novel(self):
+        novel = Novel()
+        for __ in range(3):
+            novel.scenes[novel.create_id(novel.scenes)] = Scene()
+        self.assertEqual(list(novel.scenes), ['1', '2', '3'])
+        self.assertEqual(novel.create_id(novel.chapters), '1')
+        novel.scenes = {'7': Scene()}
+        self.assertEqual(novel.create_id(novel.scenes), '1')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
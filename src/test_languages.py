@@ -0,0 +1,50 @@
+"""Regression test for the pyWriter project.
+
+Test the language discovery in scenes.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+import unittest
+
+PARAGRAPHS = [
+    'Standard text [lang=en-AU]Australian text[/lang=en-AU].',
+    '[lang=de-DE]Deutscher Text[/lang=de-DE] and [lang=en-AU]more[/lang=en-AU].',
+    '[lang=fr-FR]Texte français[/lang=fr-FR]',
+    ]
+
+
+class Languages(unittest.TestCase):
+
+    def test_scene(self):
+        scene = Scene()
+        self.assertEqual(scene.get_languages(), ())
+        scene.sceneContent = '\n'.join(PARAGRAPHS[:2])
+        self.assertEqual(scene.get_languages(), ('en-AU', 'de-DE'))
+        scene.append_paragraph(PARAGRAPHS[2])
+        self.assertEqual(scene.get_languages(), ('en-AU', 'de-DE', 'fr-FR'))
+        scene.sceneContent = PARAGRAPHS[2]
+        self.assertEqual(scene.get_languages(), ('fr-FR',))
+        scene.sceneContent = None
+        self.assertEqual(scene.get_languages(), ())
+
+    def test_novel(self):
+        novel = Novel()
+        for i, paragraph in enumerate(reversed(PARAGRAPHS)):
+            novel.scenes[str(i)] = Scene()
+            novel.scenes[str(i)].sceneContent = paragraph
+        novel.get_languages()
+        self.assertEqual(novel.languages, ['fr-FR', 'de-DE', 'en-AU'])
+        novel.scenes['0'].sceneContent = 'No language markup.'
+        novel.get_languages()
+        self.assertEqual(novel.languages, ['de-DE', 'en-AU'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
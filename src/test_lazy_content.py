@@ -0,0 +1,185 @@
+"""Regression test for the pyWriter project.
+
+Test the lazy loading of the scene contents from the yWriter 7 project file.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import shutil
+import zipfile
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.ods_w.ods_w_scenelist import OdsWSceneList
+from pywriter.odt_w.odt_w_export import OdtWExport
+from pywriter.yw.content_map import ContentMap
+from pywriter.yw.parse_cache import ParseCache
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.helper import read_file
+import unittest
+
+DATA_PATH = '../test/data/_xref/'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+REF_YW_FILE = f'{EXEC_PATH}yw7 Sample Project ref.yw7'
+CACHE_DIR = f'{EXEC_PATH}cache'
+
+
+def read_project(filePath, **kwargs):
+    """Return a Yw7File instance with the project read."""
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile
+
+
+def count_pending(novel):
+    """Return the number of scenes whose content is not loaded yet."""
+    return len([scene for scene in novel.scenes.values() if scene._contentLoader is not None])
+
+
+def is_mapped(filePath):
+    """Return True if a ContentMap instance may have the file mapped."""
+    return filePath in [contentMap.filePath for contentMap in ContentMap._instances]
+
+
+class LazyContentTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._remove_all_tempfiles()
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', TEST_YW_FILE)
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', REF_YW_FILE)
+
+    def tearDown(self):
+        self._remove_all_tempfiles()
+
+    def test_lazy_read(self):
+        refNovel = read_project(REF_YW_FILE).novel
+        ywFile = read_project(TEST_YW_FILE, lazy=True)
+        self.assertIsNone(ywFile.tree)
+        novel = ywFile.novel
+        self.assertEqual(count_pending(novel), len(novel.scenes))
+
+        # The counts stored in the file are used until the content is loaded.
+        scId = list(novel.scenes)[0]
+        self.assertEqual(novel.scenes[scId].wordCount, 376)
+        self.assertEqual(novel.scenes[scId].letterCount, 2192)
+        self.assertEqual(count_pending(novel), len(novel.scenes))
+        self.assertEqual(novel.scenes[scId].sceneContent, refNovel.scenes[scId].sceneContent)
+        self.assertEqual(count_pending(novel), len(novel.scenes) - 1)
+
+        for scId in novel.scenes:
+            self.assertEqual(novel.scenes[scId].sceneContent, refNovel.scenes[scId].sceneContent)
+            self.assertEqual(novel.scenes[scId].title, refNovel.scenes[scId].title)
+        self.assertEqual(novel.srtChapters, refNovel.srtChapters)
+        self.assertEqual(novel.languages, refNovel.languages)
+
+    def test_append_paragraph(self):
+        novel = read_project(TEST_YW_FILE, lazy=True).novel
+        refNovel = read_project(REF_YW_FILE).novel
+        scId = list(novel.scenes)[0]
+        novel.scenes[scId].append_paragraph('New paragraph.')
+        self.assertEqual(novel.scenes[scId].sceneContent, f'{refNovel.scenes[scId].sceneContent}\nNew paragraph.')
+
+    def test_write(self):
+        ywFile = read_project(TEST_YW_FILE, lazy=True)
+        refFile = read_project(REF_YW_FILE)
+        for prjFile in (ywFile, refFile):
+            scId = list(prjFile.novel.scenes)[1]
+            prjFile.novel.scenes[scId].sceneContent = 'Changed.'
+            prjFile.write()
+        self.assertEqual(count_pending(ywFile.novel), 0)
+        self.assertEqual(read_file(TEST_YW_FILE), read_file(REF_YW_FILE))
+
+    def test_close(self):
+        refNovel = read_project(REF_YW_FILE).novel
+        ywFile = read_project(TEST_YW_FILE, lazy=True)
+        scIds = list(ywFile.novel.scenes)
+        self.assertEqual(ywFile.novel.scenes[scIds[0]].sceneContent, refNovel.scenes[scIds[0]].sceneContent)
+        self.assertTrue(is_mapped(TEST_YW_FILE))
+
+        # The file is mapped again if necessary.
+        ContentMap.close_all(TEST_YW_FILE)
+        self.assertFalse(is_mapped(TEST_YW_FILE))
+        self.assertEqual(ywFile.novel.scenes[scIds[1]].sceneContent, refNovel.scenes[scIds[1]].sceneContent)
+
+        # The file is unmapped before being replaced.
+        ywFile.novel.scenes[scIds[1]].sceneContent = 'Changed.'
+        ywFile.write()
+        self.assertFalse(is_mapped(TEST_YW_FILE))
+
+    def test_changed_file(self):
+        novel = read_project(TEST_YW_FILE, lazy=True).novel
+        scIds = list(novel.scenes)
+        novel.scenes[scIds[0]].sceneContent
+        with open(TEST_YW_FILE, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        with self.assertRaises(Error):
+            novel.scenes[scIds[1]].sceneContent
+        self.assertEqual(count_pending(novel), len(novel.scenes) - 1)
+
+    def test_parse_cache(self):
+        refNovel = read_project(REF_YW_FILE).novel
+        cache = ParseCache(CACHE_DIR)
+        read_project(TEST_YW_FILE, lazy=True, cache=cache)
+        novel = read_project(TEST_YW_FILE, lazy=True, cache=cache).novel
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(count_pending(novel), len(novel.scenes))
+        for scId in novel.scenes:
+            self.assertEqual(novel.scenes[scId].sceneContent, refNovel.scenes[scId].sceneContent)
+
+    def test_export(self):
+        # Exports without scene contents leave the contents unloaded.
+        for exportClass in (OdsWSceneList, OdtWExport):
+            contents = []
+            for preload in (False, True):
+                novel = read_project(TEST_YW_FILE, lazy=True).novel
+                if preload:
+                    for scene in novel.scenes.values():
+                        scene.sceneContent
+                exportFile = exportClass(f'{EXEC_PATH}yw7 Sample Project{exportClass.SUFFIX}{exportClass.EXTENSION}')
+                exportFile.novel = novel
+                exportFile.write()
+                with zipfile.ZipFile(exportFile.filePath) as odfFile:
+                    contents.append(odfFile.read('content.xml'))
+                if not preload:
+                    if exportClass is OdsWSceneList:
+                        self.assertEqual(count_pending(novel), len(novel.scenes))
+                    else:
+                        self.assertEqual(count_pending(novel), 0)
+            self.assertEqual(contents[0], contents[1])
+
+    def test_fallback(self):
+        # A description looking like a scene content is not mistaken for one.
+        xmlText = read_file(TEST_YW_FILE).replace('<Desc><![CDATA[', '<Desc><![CDATA[<SceneContent>', 1)
+        with open(TEST_YW_FILE, 'w', encoding='utf-8') as f:
+            f.write(xmlText)
+        refNovel = read_project(TEST_YW_FILE).novel
+        novel = read_project(TEST_YW_FILE, lazy=True).novel
+        self.assertEqual(count_pending(novel), 0)
+        self.assertEqual(novel.desc, refNovel.desc)
+        self.assertEqual(novel.languages, refNovel.languages)
+        for scId in novel.scenes:
+            self.assertEqual(novel.scenes[scId].sceneContent, refNovel.scenes[scId].sceneContent)
+
+        # A UTF-16 encoded file is read completely.
+        with open(TEST_YW_FILE, 'w', encoding='utf-16') as f:
+            f.write(xmlText)
+        novel = read_project(TEST_YW_FILE, lazy=True).novel
+        self.assertEqual(count_pending(novel), 0)
+        self.assertEqual(novel.desc, refNovel.desc)
+
+    def _remove_all_tempfiles(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        for fileName in os.listdir(EXEC_PATH):
+            if fileName.startswith('yw7 Sample Project'):
+                os.remove(f'{EXEC_PATH}{fileName}')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
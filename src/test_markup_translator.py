@@ -0,0 +1,128 @@
+"""Regression test for the pyWriter project.
+
+Test the single-pass markup translation.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.file.markup_translator import MarkupTranslator
+import unittest
+
+REPLACEMENTS = [
+    ('&', '&amp;'),
+    ('<', '&lt;'),
+    ('\n\n', '|P|'),
+    ('\n', '|L|'),
+    ('\r', '\n'),
+    ('[i]', '<i>'),
+    ('[/i]', '</i>'),
+    ('[b]', '<b>'),
+    ('[/b]', '</b>'),
+    ]
+TAGS = ['i', 'b']
+DISCARD = r'\[\/*[h|c|r|s|u]\d*\]'
+
+
+class Translation(unittest.TestCase):
+
+    def setUp(self):
+        self.translator = MarkupTranslator(REPLACEMENTS, TAGS, DISCARD)
+
+    def test_replacements(self):
+        self.assertEqual(MarkupTranslator(REPLACEMENTS).translate('a&b<c\n\nd\ne\rf'),
+                         'a&amp;b&lt;c|P|d|L|e\nf')
+
+    def test_tags(self):
+        self.assertEqual(self.translator.translate('a [i]b[/i] & [b]c[/b][h1]d[/h1]'),
+                         'a <i>b</i> &amp; <b>c</b>d')
+
+    def test_tags_across_lines(self):
+        self.assertEqual(self.translator.translate('a [i]b\nc[/i] d'),
+                         'a <i>b</i>|L|<i>c</i> d')
+        self.assertEqual(self.translator.translate('[b]a [i]b\n\nc\nd[/i][/b]'),
+                         '<b>a <i>b</i></b>|P|<b><i>c</i></b>|L|<b><i>d</i></b>')
+
+    def test_unbalanced_tags(self):
+        self.assertEqual(self.translator.translate('a[/i] b'),
+                         '<i>a</i> b')
+        self.assertEqual(self.translator.translate('a [i]b'),
+                         'a <i>b</i>')
+
+    def test_empty_tag_pairs(self):
+        self.assertEqual(self.translator.translate('a[i][/i] b'),
+                         'a b')
+        self.assertEqual(self.translator.translate('a [i]b\n[/i]c'),
+                         'a <i>b</i>|L|c')
+        self.assertEqual(self.translator.translate('a\n[i][/i]\nb'),
+                         'a|P|b')
+
+        # The pairs are removed like with one str.replace() call per tag, in the given tag order.
+        self.assertEqual(self.translator.translate('a[i][i][/i][/i] b'),
+                         'a<i></i> b')
+        self.assertEqual(self.translator.translate('[b][i][/i][/b]c'),
+                         'c')
+        self.assertEqual(self.translator.translate('[i][b][/b][/i]c'),
+                         '<i></i>c')
+
+        # The line breaks before a line that has become empty are kept.
+        self.assertEqual(self.translator.translate('a\n\n[i]'),
+                         'a|P|')
+        self.assertEqual(self.translator.translate('a [i]b\n\n[i]'),
+                         'a <i>b</i>|P|<i></i>')
+
+    def test_rstrip(self):
+        self.assertEqual(self.translator.translate('a [i]b \n \n', rstrip=True),
+                         'a <i>b </i>|L|<i> </i>')
+        self.assertEqual(self.translator.translate('a [i]b[/i] \n\n', rstrip=True),
+                         'a <i>b</i>')
+        self.assertEqual(self.translator.translate('a [h1]', rstrip=True),
+                         'a ')
+
+    def test_overlapping_sources(self):
+        # The result is the same as with chained replacements in the given order.
+        replacements = REPLACEMENTS + [('/*', '<c>'), ('*/', '</c>')]
+        translator = MarkupTranslator(replacements, TAGS, DISCARD)
+        self.assertEqual(translator.translate('a /*b*/ c'),
+                         'a <c>b</c> c')
+        self.assertEqual(translator.translate('a */*b*/'),
+                         'a *<c>b</c>')
+        self.assertEqual(translator.translate('[i]*/*[h1]\n*/[/i]', rstrip=True),
+                         '<i>*<c></i>|L|<i></c></i>')
+        self.assertEqual(translator.translate('*[i][/i]/*&'),
+                         '*<c>&amp;')
+        self.assertEqual(MarkupTranslator(replacements).translate('*/*\n'),
+                         '*<c>|L|')
+
+    def test_sequential_translation(self):
+        # Without overlapping source strings, applying the replacements one after another
+        # gives the same result as the single scan.
+        texts = [
+            'a [i]b[/i] & [b]c[/b][h1]d[/h1]',
+            '[b]a [i]b\n\nc\nd[/i][/b]',
+            'a[/i] b\n[i]\n\n[/b]c',
+            'a[i][i][/i][/i] b\n[i][b][/b][/i]c\n',
+            'a [i]b \n \n',
+            'a\r[h1]\n',
+            ]
+        for text in texts:
+            for rstrip in (False, True):
+                self.assertEqual(self.translator._translate_sequentially(text, rstrip),
+                                 self.translator.translate(text, rstrip))
+
+    def test_many_languages(self):
+        languages = [f'x{i}-XX' for i in range(100)]
+        replacements = list(REPLACEMENTS)
+        for i, language in enumerate(languages, 1):
+            replacements.append((f'[lang={language}]', f'<T{i}>'))
+            replacements.append((f'[/lang={language}]', f'</T{i}>'))
+        translator = MarkupTranslator(replacements, TAGS + [f'lang={language}' for language in languages])
+        self.assertEqual(translator.translate('[lang=x99-XX]a\nb[/lang=x99-XX] [lang=x9-XX]c[/lang=x9-XX]'),
+                         '<T100>a</T100>|L|<T100>b</T100> <T10>c</T10>')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Regression test for the pyWriter project.
+
+Test the ZIP structure of the generated OpenDocument files.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zipfile
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.odt_w.odt_w_proof import OdtWProof
+from pywriter.ods_w.ods_w_scenelist import OdsWSceneList
+import unittest
+
+TEST_PROJECT = '../test/data/_proof/normal.yw7'
+EXEC_PATH = '../test/tmp/'
+
+
+def export(exportClass, **kwargs):
+    """Export the test project and return the path of the generated file."""
+    source = Yw7File(TEST_PROJECT)
+    source.novel = Novel()
+    source.read()
+    target = exportClass(f'{EXEC_PATH}package{exportClass.SUFFIX}{exportClass.EXTENSION}', **kwargs)
+    target.novel = source.novel
+    target.write()
+    return target.filePath
+
+
+class OdfPackage(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._files = []
+
+    def tearDown(self):
+        for filePath in self._files:
+            for path in (filePath, f'{filePath}.bak'):
+                try:
+                    os.remove(path)
+                except:
+                    pass
+
+    def test_components(self):
+        workdir = os.getcwd()
+        for exportClass, mimetype in (
+                (OdtWProof, 'application/vnd.oasis.opendocument.text'),
+                (OdsWSceneList, 'application/vnd.oasis.opendocument.spreadsheet'),
+                ):
+            filePath = export(exportClass)
+            self._files.append(filePath)
+            self.assertEqual(os.getcwd(), workdir)
+            with zipfile.ZipFile(filePath, 'r') as odfFile:
+                self.assertIsNone(odfFile.testzip())
+                members = odfFile.infolist()
+                self.assertEqual(members[0].filename, 'mimetype')
+                self.assertEqual(members[0].compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(odfFile.read('mimetype').decode('utf-8'), mimetype)
+                names = odfFile.namelist()
+                for component in ('content.xml', 'styles.xml', 'meta.xml', 'settings.xml', 'META-INF/manifest.xml'):
+                    self.assertIn(component, names)
+
+    def test_compress_level(self):
+        sizes = []
+        for level in (0, 9):
+            filePath = export(OdtWProof, compress_level=level)
+            with zipfile.ZipFile(filePath, 'r') as odfFile:
+                sizes.append(odfFile.getinfo('content.xml').compress_size)
+            self._files.append(filePath)
+        self.assertGreater(sizes[0], sizes[1])
+
+    def test_generation_error(self):
+        # The message of an error raised while generating the content is passed on,
+        # and no incomplete file is left.
+        with self.assertRaises(Error) as context:
+            export(FailingProof)
+        self.assertEqual(str(context.exception), 'Template failure')
+        filePath = f'{EXEC_PATH}package{OdtWProof.SUFFIX}{OdtWProof.EXTENSION}'
+        self._files.append(filePath)
+        self.assertFalse(os.path.isfile(filePath))
+
+        # A previous file is restored.
+        export(OdtWProof)
+        with open(filePath, 'rb') as f:
+            previousFile = f.read()
+        with self.assertRaises(Error):
+            export(FailingProof)
+        with open(filePath, 'rb') as f:
+            self.assertEqual(f.read(), previousFile)
+        self.assertFalse(os.path.isfile(f'{filePath}.bak'))
+
+    def test_list_based_overrides(self):
+        # Subclasses overriding the list-based template methods get the same result.
+        contents = []
+        for exportClass in (OdtWProof, ListBasedProof):
+            filePath = export(exportClass)
+            self._files.append(filePath)
+            with zipfile.ZipFile(filePath, 'r') as odfFile:
+                contents.append(odfFile.read('content.xml').decode('utf-8'))
+        self.assertIn('<!-- scenes -->', contents[1])
+        self.assertTrue(contents[1].endswith('<!-- end -->'))
+        self.assertEqual(contents[1].replace('<!-- scenes -->', '').replace('<!-- end -->', ''), contents[0])
+
+
+class FailingProof(OdtWProof):
+    """Proof writer failing after the first fragment of the content."""
+
+    def _get_fragments(self):
+        fragments = super()._get_fragments()
+        yield next(fragments)
+        raise Error('Template failure')
+
+
+class ListBasedProof(OdtWProof):
+    """Proof writer extending the scene and text processing the list-based way."""
+
+    def _get_scenes(self, chId, sceneNumber, wordsTotal, lettersTotal, doNotExport):
+        lines, sceneNumber, wordsTotal, lettersTotal = super()._get_scenes(
+            chId, sceneNumber, wordsTotal, lettersTotal, doNotExport)
+        lines.insert(0, '<!-- scenes -->')
+        return lines, sceneNumber, wordsTotal, lettersTotal
+
+    def _get_text(self):
+        return f'{super()._get_text()}<!-- end -->'
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Regression test for the pyWriter project.
+
+Test the row streaming of the ODS parser.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zipfile
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.ods_r.ods_parser import OdsParser
+from pywriter.ods_r.ods_r_loclist import OdsRLocList
+import unittest
+
+EXEC_PATH = '../test/tmp/'
+TEST_ODS_FILE = f'{EXEC_PATH}ods_parser_loclist.ods'
+
+CONTENT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0">
+ <office:body>
+  <office:spreadsheet>
+   <table:table table:name="Locations">
+    <table:table-row>
+     <table:table-cell><text:p>ID</text:p></table:table-cell>
+     <table:table-cell><text:p>Name</text:p></table:table-cell>
+     <table:table-cell><text:p>Description</text:p></table:table-cell>
+     <table:table-cell><text:p>Aka</text:p></table:table-cell>
+     <table:table-cell><text:p>Tags</text:p></table:table-cell>
+     <table:table-cell table:number-columns-repeated="1014"/>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="2">
+     <table:table-cell><text:p>LcID:1</text:p></table:table-cell>
+     <table:table-cell><text:p>Shire</text:p></table:table-cell>
+     <table:table-cell table:number-columns-repeated="1017"/>
+    </table:table-row>
+    <table:table-row table:number-rows-repeated="1048573">
+     <table:table-cell table:number-columns-repeated="1024"/>
+    </table:table-row>
+    %s
+   </table:table>
+   <table:table table:name="Sheet2">
+    <table:table-row>
+     <table:table-cell><text:p>LcID:3</text:p></table:table-cell>
+    </table:table-row>
+   </table:table>
+  </office:spreadsheet>
+ </office:body>
+</office:document-content>
+'''
+
+
+class OdsParserTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+
+    def tearDown(self):
+        os.remove(TEST_ODS_FILE)
+
+    def test_iter_rows(self):
+        self._write_ods('')
+        rows = OdsParser().iter_rows(TEST_ODS_FILE, 5)
+        self.assertEqual(next(rows), ['ID', 'Name', 'Description', 'Aka', 'Tags'])
+        self.assertEqual(list(rows), [['LcID:1', 'Shire', '', '', '']])
+
+    def test_read(self):
+        self._write_ods('')
+        locList = OdsRLocList(TEST_ODS_FILE)
+        locList.novel = Novel()
+        locList.read()
+        self.assertEqual(locList.novel.srtLocations, ['1'])
+        self.assertEqual(locList.novel.locations['1'].title, 'Shire')
+
+    def test_wrong_structure(self):
+        self._write_ods('<table:table-row><table:table-cell><text:p>LcID:2</text:p></table:table-cell></table:table-row>')
+        locList = OdsRLocList(TEST_ODS_FILE)
+        locList.novel = Novel()
+        with self.assertRaises(Error):
+            locList.read()
+
+    def _write_ods(self, lastRow):
+        with zipfile.ZipFile(TEST_ODS_FILE, 'w') as odfFile:
+            odfFile.writestr('content.xml', CONTENT_XML % lastRow)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
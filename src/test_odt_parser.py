@@ -0,0 +1,131 @@
+"""Regression test for the pyWriter project.
+
+Test the style resolution of the ODT parser.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zipfile
+from pywriter.odt_r.odt_parser import OdtParser
+import unittest
+
+EXEC_PATH = '../test/tmp/'
+TEST_ODT_FILE = f'{EXEC_PATH}odt_parser.odt'
+
+STYLES_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-styles xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0">
+ <office:styles>
+  <style:default-style style:family="paragraph">
+   <style:text-properties fo:language="en" fo:country="US"/>
+  </style:default-style>
+  <style:style style:name="Heading_20_2" style:family="paragraph" style:parent-style-name="Heading">
+   <style:text-properties fo:font-weight="bold"/>
+  </style:style>
+  <style:style style:name="Scene_20_heading" style:family="paragraph" style:parent-style-name="Heading_20_2"/>
+  <style:style style:name="Title" style:family="paragraph" style:parent-style-name="Heading"/>
+  <style:style style:name="Letter" style:family="paragraph" style:parent-style-name="Quotations"/>
+  <style:style style:name="Subtitle" style:family="paragraph">
+   <style:text-properties fo:font-style="italic"/>
+  </style:style>
+ </office:styles>
+</office:document-styles>
+'''
+
+CONTENT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0">
+ <office:automatic-styles>
+  <style:style style:name="P1" style:family="paragraph" style:parent-style-name="Letter">
+   <style:text-properties fo:language="de" fo:country="CH"/>
+  </style:style>
+  <style:style style:name="P2" style:family="paragraph" style:parent-style-name="Scene_20_heading"/>
+  <style:style style:name="P3" style:family="paragraph" style:parent-style-name="Title"/>
+  <style:style style:name="T1" style:family="text" style:parent-style-name="Emphasis">
+   <style:text-properties fo:font-weight="bold"/>
+  </style:style>
+  <style:style style:name="T2" style:family="text" style:parent-style-name="Emphasis">
+   <style:text-properties fo:font-style="normal"/>
+  </style:style>
+ </office:automatic-styles>
+ <office:body>
+  <office:text>
+   <text:p text:style-name="P1">Quote</text:p>
+   <text:p text:style-name="P2">Heading</text:p>
+   <text:p text:style-name="P3">Title</text:p>
+   <text:p text:style-name="Subtitle">Subtitle</text:p>
+   <text:p>a<text:span text:style-name="T1">b</text:span><text:span text:style-name="T2">c</text:span><text:span text:style-name="Emphasis">d</text:span></text:p>
+  </office:text>
+ </office:body>
+</office:document-content>
+'''
+
+
+class Recorder:
+    """Client recording the parser's calls."""
+
+    def __init__(self):
+        self.events = []
+
+    def handle_starttag(self, tag, attrs):
+        self.events.append(('start', tag, attrs))
+
+    def handle_endtag(self, tag):
+        self.events.append(('end', tag))
+
+    def handle_data(self, data):
+        self.events.append(('data', data))
+
+    def handle_comment(self, data):
+        self.events.append(('comment', data))
+
+
+class OdtParserTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        with zipfile.ZipFile(TEST_ODT_FILE, 'w') as odfFile:
+            odfFile.writestr('styles.xml', STYLES_XML)
+            odfFile.writestr('content.xml', CONTENT_XML)
+
+    def tearDown(self):
+        os.remove(TEST_ODT_FILE)
+
+    def test_styles(self):
+        client = Recorder()
+        OdtParser(client).feed_file(TEST_ODT_FILE)
+        self.assertEqual(client.events, [
+            ('start', 'body', [('language', 'en'), ('country', 'US')]),
+            ('start', 'blockquote', [('lang', 'de-CH')]),
+            ('data', 'Quote'),
+            ('end', 'blockquote'),
+            ('start', 'h2', [()]),
+            ('data', 'Heading'),
+            ('end', 'h2'),
+            ('start', 'p', [()]),
+            ('data', 'Title'),
+            ('end', 'p'),
+            ('start', 'p', [()]),
+            ('data', 'Subtitle'),
+            ('end', 'p'),
+            ('start', 'p', [()]),
+            ('data', 'a'),
+            ('start', 'em', [()]),
+            ('start', 'strong', [()]),
+            ('data', 'b'),
+            ('end', 'strong'),
+            ('end', 'em'),
+            ('data', 'c'),
+            ('start', 'em', [()]),
+            ('data', 'd'),
+            ('end', 'em'),
+            ('end', 'p'),
+            ('end', 'body'),
+            ])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Regression test for the pyWriter project.
+
+Test the parse cache of the yWriter 7 project file.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import pickle
+import shutil
+from pywriter.model.novel import Novel
+from pywriter.yw.parse_cache import ParseCache
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.helper import read_file
+import unittest
+
+DATA_PATH = '../test/data/_xref/'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+REF_YW_FILE = f'{EXEC_PATH}yw7 Sample Project ref.yw7'
+CACHE_DIR = f'{EXEC_PATH}cache'
+
+
+def read_project(filePath, cache=None):
+    """Return a Yw7File instance with the project read."""
+    ywFile = Yw7File(filePath, cache=cache)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile
+
+
+class ParseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._remove_all_tempfiles()
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', TEST_YW_FILE)
+        shutil.copyfile(f'{DATA_PATH}normal.yw7', REF_YW_FILE)
+
+    def tearDown(self):
+        self._remove_all_tempfiles()
+
+    def test_cache(self):
+        cache = ParseCache(CACHE_DIR)
+        refFile = read_project(REF_YW_FILE)
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertTrue(os.path.isfile(cache.get_cache_path(TEST_YW_FILE)))
+        ywFile = read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsNone(ywFile.tree)
+        self.assertEqual(ywFile.novel.title, refFile.novel.title)
+        for scId in refFile.novel.scenes:
+            self.assertEqual(ywFile.novel.scenes[scId].sceneContent, refFile.novel.scenes[scId].sceneContent)
+            self.assertEqual(ywFile.novel.scenes[scId].tags, refFile.novel.scenes[scId].tags)
+
+        # The xml element tree is parsed for writing.
+        for prjFile in (ywFile, refFile):
+            scId = list(prjFile.novel.scenes)[0]
+            prjFile.novel.scenes[scId].sceneContent = 'Changed.'
+            prjFile.novel.report_change(prjFile.novel.scenes, scId)
+            prjFile.write()
+        self.assertEqual(read_file(TEST_YW_FILE), read_file(REF_YW_FILE))
+
+        # The project file has changed since it was cached.
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_cache_dir(self):
+        # By default, the cache files are not stored next to the project.
+        self.assertNotEqual(os.path.dirname(os.path.abspath(ParseCache().get_cache_path(TEST_YW_FILE))),
+                            os.path.abspath(EXEC_PATH))
+        cache = ParseCache(CACHE_DIR)
+        read_project(TEST_YW_FILE, cache)
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertFalse(os.path.isfile(f'{TEST_YW_FILE}.cache'))
+        self.assertTrue(os.path.isfile(cache.get_cache_path(TEST_YW_FILE)))
+
+        # A damaged cache file is ignored.
+        with open(cache.get_cache_path(TEST_YW_FILE), 'wb') as f:
+            f.write(b'garbage')
+        ywFile = read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertIsNotNone(ywFile.tree)
+
+    def test_tampered(self):
+        cache = ParseCache(CACHE_DIR)
+        read_project(TEST_YW_FILE, cache)
+        cachePath = cache.get_cache_path(TEST_YW_FILE)
+        with open(cachePath, 'rb') as f:
+            data = bytearray(f.read())
+
+        # A modified cache file counts as a miss.
+        data[-2] ^= 1
+        with open(cachePath, 'wb') as f:
+            f.write(data)
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+        # An unsigned cache file is not unpickled.
+        markerDir = f'{CACHE_DIR}/unpickled'
+        with open(cachePath, 'wb') as f:
+            f.write(b'\0' * 32)
+            f.write(pickle.dumps(_Planted(markerDir)))
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        self.assertFalse(os.path.isdir(markerDir))
+
+        # Cache files signed with another user's key are not unpickled.
+        otherCache = ParseCache(f'{CACHE_DIR}/other')
+        read_project(TEST_YW_FILE, otherCache)
+        shutil.copyfile(otherCache.get_cache_path(TEST_YW_FILE), cachePath)
+        read_project(TEST_YW_FILE, cache)
+        self.assertEqual((cache.hits, cache.misses), (0, 4))
+
+    def _remove_all_tempfiles(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        for fileName in os.listdir(EXEC_PATH):
+            if fileName.startswith('yw7 Sample Project'):
+                os.remove(f'{EXEC_PATH}{fileName}')
+
+
+class _Planted:
+    """Object creating a directory when unpickled."""
+
+    def __init__(self, dirPath):
+        self.dirPath = dirPath
+
+    def __reduce__(self):
+        return os.mkdir, (self.dirPath,)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
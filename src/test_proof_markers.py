@@ -0,0 +1,104 @@
+"""Regression test for the pyWriter project.
+
+Test the recognition of the scene markers in a proofread manuscript.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import zipfile
+from pywriter.pywriter_globals import *
+from pywriter.model.chapter import Chapter
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.odt_r.odt_parser import OdtParser
+from pywriter.odt_r.odt_r_proof import OdtRProof
+import unittest
+
+EXEC_PATH = '../test/tmp/'
+TEST_ODT_FILE = f'{EXEC_PATH}markers_proof.odt'
+
+STYLES_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-styles xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0">
+ <office:styles/>
+</office:document-styles>
+'''
+
+CONTENT_XML = '''<?xml version="1.0" encoding="UTF-8"?>
+<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0" xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0">
+ <office:automatic-styles>
+  <style:style style:name="T1" style:family="text">
+   <style:text-properties fo:font-style="italic"/>
+  </style:style>
+ </office:automatic-styles>
+ <office:body>
+  <office:text>
+   <text:h text:style-name="Heading_20_2" text:outline-level="2">Chapter One</text:h>
+   <text:h text:style-name="Heading_20_3" text:outline-level="3">Scene One</text:h>
+   <text:p text:style-name="scene_20_mark">[ScID:1]</text:p>
+   <text:p text:style-name="Text_20_body">The <text:span text:style-name="T1">first</text:span> scene.</text:p>
+   <text:p text:style-name="scene_20_mark">[/ScID]</text:p>
+   <text:h text:style-name="Heading_20_3" text:outline-level="3">Scene Two</text:h>
+   <text:p text:style-name="scene_20_mark">[Sc<text:span text:style-name="T1">ID:</text:span>2]</text:p>
+   <text:p text:style-name="Text_20_body">The second scene.</text:p>
+   <text:p text:style-name="scene_20_mark"><text:span text:style-name="T1">[/</text:span>ScID]</text:p>
+  </office:text>
+ </office:body>
+</office:document-content>
+'''
+
+
+def read_proof():
+    """Return a novel with the scene contents read from the test document."""
+    novel = Novel()
+    novel.chapters['1'] = Chapter()
+    novel.chapters['1'].srtScenes = ['1', '2']
+    novel.srtChapters = ['1']
+    for scId in ('1', '2'):
+        novel.scenes[scId] = Scene()
+    proof = OdtRProof(TEST_ODT_FILE)
+    proof.novel = novel
+    proof.read()
+    return novel
+
+
+class ProofMarkersTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        with zipfile.ZipFile(TEST_ODT_FILE, 'w') as odfFile:
+            odfFile.writestr('styles.xml', STYLES_XML)
+            odfFile.writestr('content.xml', CONTENT_XML)
+
+    def tearDown(self):
+        os.remove(TEST_ODT_FILE)
+
+    def test_split_markers(self):
+        novel = read_proof()
+        self.assertEqual(novel.scenes['1'].sceneContent, 'The [i]first[/i] scene.')
+        self.assertEqual(novel.scenes['2'].sceneContent, 'The second scene.')
+
+    def test_chunk_boundaries(self):
+        chunkSize = OdtParser._CHUNK_SIZE
+        OdtParser._CHUNK_SIZE = 5
+        try:
+            novel = read_proof()
+        finally:
+            OdtParser._CHUNK_SIZE = chunkSize
+        self.assertEqual(novel.scenes['1'].sceneContent, 'The [i]first[/i] scene.')
+        self.assertEqual(novel.scenes['2'].sceneContent, 'The second scene.')
+
+    def test_corrupt_marker(self):
+        with zipfile.ZipFile(TEST_ODT_FILE, 'w') as odfFile:
+            odfFile.writestr('styles.xml', STYLES_XML)
+            odfFile.writestr('content.xml', CONTENT_XML.replace('[ScID:1]', '[ScID:]'))
+        with self.assertRaises(Error):
+            read_proof()
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
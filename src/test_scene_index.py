@@ -0,0 +1,156 @@
+"""Regression test for the pyWriter project.
+
+Test the structural scene index.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import random
+from pywriter.model.novel import Novel
+from pywriter.file.file_export import FileExport
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+import unittest
+
+YW7_FILE = '../test/data/_proof/normal.yw7'
+LAZY_YW7_FILE = '../test/data/_xref/normal.yw7'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+
+
+def read_project(filePath, **kwargs):
+    """Return the novel read from a yWriter project."""
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile.novel
+
+
+def count_pending(novel):
+    """Return the number of scenes whose content is not loaded yet."""
+    return len([scene for scene in novel.scenes.values() if scene._contentLoader is not None])
+
+
+class RecordingExport(FileExport):
+    """Export class recording the scene numbers and running totals."""
+
+    def __init__(self, filePath, **kwargs):
+        super().__init__(filePath, **kwargs)
+        self.records = {}
+
+    def _get_sceneMapping(self, scId, sceneNumber, wordsTotal, lettersTotal):
+        self.records[scId] = (sceneNumber, wordsTotal, lettersTotal)
+        return super()._get_sceneMapping(scId, sceneNumber, wordsTotal, lettersTotal)
+
+
+def get_export_records(novel):
+    """Return the scene numbers and running totals as determined by the document export."""
+    export = RecordingExport('')
+    export.novel = novel
+    list(export._get_chapters())
+    # Without templates for the other scene types, only numbered scenes are processed.
+    return export.records
+
+
+def get_index_records(novel):
+    """Return the scene numbers and running totals of the numbered scenes as determined by the scene index."""
+    index = novel.get_scene_index()
+    records = {}
+    for scId in index.srtScenes:
+        if index.get_number(scId):
+            records[scId] = (index.get_number(scId), index.get_words_total(scId), index.get_letters_total(scId))
+    return records
+
+
+class SceneIndex(unittest.TestCase):
+
+    def test_yw7_project(self):
+        ywFile = Yw7File(YW7_FILE)
+        ywFile.novel = Novel()
+        ywFile.read()
+        novel = ywFile.novel
+        self.assertEqual(get_index_records(novel), get_export_records(novel))
+
+    def test_lazy_read(self):
+        # Building the index leaves the scene contents in the file.
+        with open(LAZY_YW7_FILE, encoding='utf-8') as f:
+            xmlText = f.read()
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        with open(TEST_YW_FILE, 'w', encoding='utf-8') as f:
+            f.write(xmlText.replace('<SceneContent><![CDATA[', '<SceneContent><![CDATA[<HTML>', 1))
+        try:
+            novel = read_project(TEST_YW_FILE, lazy=True)
+            self.assertEqual(count_pending(novel), len(novel.scenes))
+            records = get_index_records(novel)
+            self.assertEqual(count_pending(novel), len(novel.scenes))
+            self.assertEqual(records, get_export_records(read_project(TEST_YW_FILE, lazy=True)))
+            self.assertEqual(len(records), len(get_export_records(read_project(LAZY_YW7_FILE))) - 1)
+        finally:
+            os.remove(TEST_YW_FILE)
+
+    def test_changes(self):
+        random.seed(14)
+        novel = create_novel(300, scenesPerChapter=7)
+        index = novel.get_scene_index()
+        self.assertEqual(index.get_ordinal('15'), 14)
+        self.assertEqual(index.chpPerScn['15'], '3')
+        self.assertEqual(get_index_records(novel), get_export_records(novel))
+        for __ in range(100):
+            scId = random.choice(index.srtScenes)
+            scene = novel.scenes[scId]
+            change = random.randrange(4)
+            if change == 0:
+                scene.sceneContent = ' '.join(['word'] * random.randrange(50))
+            elif change == 1:
+                scene.scType = random.randrange(4)
+            elif change == 2:
+                scene.doNotExport = not scene.doNotExport
+            else:
+                scene.sceneContent = '<HTML>Raw markup'
+            novel.report_change(novel.scenes, scId)
+        self.assertEqual(get_index_records(novel), get_export_records(novel))
+
+        # Changing the order has the index built again.
+        novel.chapters['2'].srtScenes.reverse()
+        novel.srtChapters.reverse()
+        novel.chapters['5'].chType = 3
+        self.assertFalse(index.is_current(novel))
+        self.assertIs(novel.get_scene_index(), index)
+        self.assertEqual(index.chpPerScn['15'], '3')
+        self.assertEqual(index.get_ordinal(novel.chapters[novel.srtChapters[0]].srtScenes[0]), 0)
+        self.assertEqual(get_index_records(novel), get_export_records(novel))
+
+        # Reporting a chapter has the index built again.
+        novel.chapters['7'].chType = 3
+        self.assertTrue(index.is_current(novel))
+        novel.report_change(novel.chapters, '7')
+        self.assertFalse(index.is_current(novel))
+        self.assertIs(novel.get_scene_index(), index)
+        self.assertEqual(get_index_records(novel), get_export_records(novel))
+
+    def test_counts(self):
+        novel = create_novel(200, scenesPerChapter=10)
+        novel.scenes['15'].scType = 1
+        index = novel.get_scene_index()
+        numbered, words, letters = index.get_totals()
+        self.assertEqual(numbered, 199)
+        self.assertEqual(words, sum(novel.scenes[scId].wordCount for scId in novel.scenes if scId != '15'))
+        self.assertEqual(letters, sum(novel.scenes[scId].letterCount for scId in novel.scenes if scId != '15'))
+        chapterWords = 0
+        chapterLetters = 0
+        for chId in novel.srtChapters[9:20]:
+            for scId in novel.chapters[chId].srtScenes:
+                chapterWords += novel.scenes[scId].wordCount
+                chapterLetters += novel.scenes[scId].letterCount
+        self.assertEqual(index.get_chapter_counts('10', '20'), (chapterWords, chapterLetters))
+        self.assertEqual(index.get_chapter_counts('2')[0], 9 * novel.scenes['1'].wordCount)
+        self.assertEqual(index.get_chapter_counts('20', '10'), (0, 0))
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
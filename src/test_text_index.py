@@ -0,0 +1,98 @@
+"""Regression test for the pyWriter project.
+
+Test the full-text index of the scenes.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import re
+from pywriter.model.novel import Novel
+from pywriter.model.text_index import TextIndex
+from pywriter.model.text_index import get_terms
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.synthetic_novel import create_novel
+import unittest
+
+YW7_FILE = '../test/data/_proof/normal.yw7'
+
+
+def search(novel, pattern):
+    """Return the IDs of the scenes whose text matches a regular expression, in the novel's order."""
+    regex = re.compile(pattern, re.IGNORECASE)
+    scIds = []
+    for chId in novel.srtChapters:
+        for scId in novel.chapters[chId].srtScenes:
+            scene = novel.scenes[scId]
+            for text in (scene.sceneContent, scene.desc, scene.notes):
+                if text and regex.search(text):
+                    scIds.append(scId)
+                    break
+    return scIds
+
+
+class TextIndexTest(unittest.TestCase):
+
+    def test_terms(self):
+        self.assertEqual(get_terms('The [i]quick[/i] brown-fox /* comment */ -- "jumps".'),
+                         ['the', 'quick', 'brownfox', 'jumps'])
+        self.assertEqual(get_terms(None), [])
+
+    def test_yw7_project(self):
+        ywFile = Yw7File(YW7_FILE)
+        ywFile.novel = Novel()
+        ywFile.read()
+        novel = ywFile.novel
+        index = TextIndex()
+        index.build(novel)
+        for word in ('the', 'and', 'but'):
+            self.assertEqual(index.find_term(word), search(novel, rf'\b{word}\b'))
+        self.assertEqual(index.find_term('THE'), index.find_term('the'))
+        self.assertEqual(index.find_prefix('th'), search(novel, r'\bth'))
+        self.assertEqual(index.find_term('no such word'), [])
+
+    def test_updates(self):
+        novel = create_novel(50, scenesPerChapter=10)
+        index = TextIndex()
+        index.build(novel)
+        self.assertEqual(len(index.find_phrase('quick brown fox')), 50)
+        self.assertEqual(index.find_phrase('brown quick fox'), [])
+        self.assertEqual(index.find_phrase('why. The quick'), index.find_term('quick'))
+
+        # A phrase doesn't reach across the end of a text.
+        self.assertEqual(index.find_phrase('why summary'), [])
+
+        novel.scenes['7'].sceneContent = 'The lazy cat.'
+        novel.scenes['3'].notes = 'A cat here.'
+        index.update_index()
+        self.assertEqual(index.find_term('cat'), [])
+        # The changes are not reported yet.
+
+        novel.report_change(novel.scenes, '7')
+        novel.report_change(novel.scenes, '3')
+        index.update_index()
+        self.assertEqual(index.find_term('cat'), ['3', '7'])
+        self.assertEqual(len(index.find_phrase('quick brown fox')), 49)
+        novel.chapters['1'].srtScenes.reverse()
+        self.assertEqual(index.find_term('cat'), ['7', '3'])
+
+        novel.scenes['3'].notes = None
+        index.update_scene('3')
+        del novel.scenes['7']
+        novel.chapters['1'].srtScenes.remove('7')
+        index.update_scene('7')
+        self.assertEqual(index.find_term('cat'), [])
+        self.assertNotIn('cat', index.postings)
+        self.assertEqual(index.find_prefix('ca'), [])
+
+        novel.scenes['5'].desc = 'A wombat.'
+        novel.report_change()
+        index.update_index()
+        self.assertEqual(index.find_term('wombat'), ['5'])
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
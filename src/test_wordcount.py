@@ -0,0 +1,57 @@
+"""Regression test for the pyWriter project.
+
+Test the word and letter counting of scenes.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.model.scene import Scene
+import unittest
+
+PARAGRAPHS = [
+    'The [i]quick[/i] brown fox -- jumps over the lazy dog.',
+    '> A quotation with a /*comment*/ and a well-known word.',
+    '',
+    '[lang=de-DE]Der Fuchs—springt über den Hund.[/lang=de-DE]',
+    ]
+
+
+class WordCount(unittest.TestCase):
+
+    def test_set_content(self):
+        scene = Scene()
+        self.assertEqual(scene.wordCount, 0)
+        self.assertEqual(scene.letterCount, 0)
+        scene.sceneContent = '\n'.join(PARAGRAPHS)
+        self.assertEqual(scene.wordCount, 23)
+        self.assertEqual(scene.letterCount, 123)
+        scene.sceneContent = 'One two'
+        self.assertEqual(scene.wordCount, 2)
+        self.assertEqual(scene.letterCount, 7)
+
+    def test_append_paragraph(self):
+        expected = Scene()
+        expected.sceneContent = '\n'.join(PARAGRAPHS)
+        for countFirst in (False, True):
+            scene = Scene()
+            for paragraph in PARAGRAPHS:
+                scene.append_paragraph(paragraph)
+                if countFirst:
+                    scene.wordCount
+            self.assertEqual(scene.wordCount, expected.wordCount)
+            self.assertEqual(scene.letterCount, expected.letterCount)
+            self.assertEqual(scene.sceneContent, expected.sceneContent)
+
+    def test_append_to_content(self):
+        scene = Scene()
+        scene.sceneContent = PARAGRAPHS[0]
+        scene.append_paragraph(PARAGRAPHS[1])
+        self.assertEqual(scene.sceneContent, f'{PARAGRAPHS[0]}\n{PARAGRAPHS[1]}')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
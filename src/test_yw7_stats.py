@@ -0,0 +1,128 @@
+"""Regression test for the pyWriter project.
+
+Test the summary read from the yWriter 7 project file without the scene contents.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from shutil import copyfile
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.yw7_stats import Yw7Stats
+from pywriter.test.helper import read_file
+import unittest
+
+DATA_PATH = '../test/data/'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+TEST_PROJECTS = [
+    f'{DATA_PATH}_xref/normal.yw7',
+    f'{DATA_PATH}_todo/normal.yw7',
+    f'{DATA_PATH}_parts/proofed.yw7',
+    f'{DATA_PATH}_import/normal.yw7',
+    ]
+
+
+def read_novel(filePath):
+    """Return a Novel instance read from the yWriter project at filePath."""
+    ywFile = Yw7File(filePath)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile.novel
+
+
+def read_stats(filePath):
+    """Return a Yw7Stats instance read from the yWriter project at filePath."""
+    stats = Yw7Stats(filePath)
+    stats.read()
+    return stats
+
+
+class Yw7StatsTest(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._remove_all_tempfiles()
+
+    def tearDown(self):
+        self._remove_all_tempfiles()
+
+    def test_structure(self):
+        for filePath in TEST_PROJECTS:
+            novel = read_novel(filePath)
+            stats = read_stats(filePath)
+            self.assertEqual(stats.title, novel.title)
+            self.assertEqual(stats.authorName, novel.authorName)
+            self.assertEqual(stats.wordTarget, novel.wordTarget)
+            self.assertEqual(stats.srtChapters, novel.srtChapters)
+            for chId in novel.srtChapters:
+                self.assertEqual(stats.chapterTitles[chId], novel.chapters[chId].title)
+                self.assertEqual(stats.chapterLevels[chId], novel.chapters[chId].chLevel)
+                self.assertEqual(stats.chapterTypes[chId], novel.chapters[chId].chType)
+                self.assertEqual(stats.chapterScenes[chId], novel.chapters[chId].srtScenes)
+            for scId in novel.scenes:
+                self.assertEqual(stats.sceneTitles[scId], novel.scenes[scId].title)
+                self.assertEqual(stats.sceneTypes[scId], novel.scenes[scId].scType)
+                self.assertEqual(stats.sceneStatus[scId], novel.scenes[scId].status)
+
+    def test_counts(self):
+        # The counts stored by yWriter are used.
+        stats = read_stats(TEST_PROJECTS[0])
+        scId = list(stats.wordCounts)[0]
+        self.assertEqual((stats.wordCounts[scId], stats.letterCounts[scId]), (376, 2192))
+
+        # Files written by PyWriter have no counts stored, so the scene contents are counted.
+        ywFile = Yw7File(TEST_YW_FILE)
+        ywFile.novel = read_novel(TEST_PROJECTS[0])
+        ywFile.write()
+        novel = read_novel(TEST_YW_FILE)
+        stats = read_stats(TEST_YW_FILE)
+        for scId in novel.scenes:
+            self.assertEqual(stats.wordCounts[scId], novel.scenes[scId].wordCount)
+            self.assertEqual(stats.letterCounts[scId], novel.scenes[scId].letterCount)
+        normalScenes = []
+        for chId in novel.srtChapters:
+            for scId in novel.chapters[chId].srtScenes:
+                if novel.scenes[scId].scType == 0:
+                    normalScenes.append(novel.scenes[scId])
+        self.assertEqual(stats.get_totals(),
+                         (len(normalScenes),
+                          sum([scene.wordCount for scene in normalScenes]),
+                          sum([scene.letterCount for scene in normalScenes])))
+        statusCounts = stats.get_status_counts()
+        self.assertEqual(sum([scenes for scenes, __ in statusCounts.values()]), len(normalScenes))
+        self.assertEqual(sum([words for __, words in statusCounts.values()]), stats.get_totals()[1])
+        for chId in novel.srtChapters:
+            chapterScenes = [scene for scene in normalScenes if scene in
+                             [novel.scenes[scId] for scId in novel.chapters[chId].srtScenes]]
+            self.assertEqual(stats.get_chapter_counts(chId),
+                             (sum([scene.wordCount for scene in chapterScenes]),
+                              sum([scene.letterCount for scene in chapterScenes])))
+
+    def test_utf16(self):
+        xmlText = read_file(TEST_PROJECTS[0])
+        with open(TEST_YW_FILE, 'w', encoding='utf-16') as f:
+            f.write(xmlText)
+        stats = read_stats(TEST_YW_FILE)
+        self.assertEqual(stats.get_totals(), read_stats(TEST_PROJECTS[0]).get_totals())
+
+    def test_error(self):
+        with open(TEST_YW_FILE, 'w', encoding='utf-8') as f:
+            f.write('<YWRITER7><PROJECT>')
+        with self.assertRaises(Error):
+            read_stats(TEST_YW_FILE)
+
+    def _remove_all_tempfiles(self):
+        for fileName in os.listdir(EXEC_PATH):
+            if fileName.startswith('yw7 Sample Project'):
+                os.remove(f'{EXEC_PATH}{fileName}')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
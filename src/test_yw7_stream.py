@@ -0,0 +1,147 @@
+"""Regression test for the pyWriter project.
+
+Test the streaming read mode of the yWriter 7 project file.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.converter.export_source_factory import ExportSourceFactory
+from pywriter.odt_w.odt_w_proof import OdtWProof
+from pywriter.odt_w.odt_w_xref import OdtWXref
+from pywriter.test.export_test import ExportTest
+import unittest
+
+TEST_PROJECTS = [
+    '../test/data/_proof/normal.yw7',
+    '../test/data/_proof/proofed.yw7',
+    '../test/data/_xref/normal.yw7',
+    '../test/data/_charlist/normal.yw7',
+    ]
+
+
+def read_novel(filePath, streaming, **kwargs):
+    """Return a Novel instance read from the yWriter project at filePath."""
+    ywFile = Yw7File(filePath, streaming=streaming, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile
+
+
+def get_attributes(element):
+    """Return a dictionary with the instance variables of a slotted element."""
+    attributes = {}
+    for elementClass in type(element).__mro__:
+        for name in getattr(elementClass, '__slots__', ()):
+            attributes[name] = getattr(element, name)
+    return attributes
+
+
+class StreamedProof(ExportTest, unittest.TestCase):
+    _exportClass = OdtWProof
+    _kwargs = {'streaming': True}
+
+    # The test methods must be defined here to identify the source of failure.
+
+    def test_yw7_to_exp(self):
+        super().test_yw7_to_exp()
+
+
+class StreamedXref(ExportTest, unittest.TestCase):
+    _exportClass = OdtWXref
+    _kwargs = {'streaming': True}
+
+    # The test methods must be defined here to identify the source of failure.
+
+    def test_yw7_to_exp(self):
+        super().test_yw7_to_exp()
+
+
+class StreamedNovel(unittest.TestCase):
+    """Compare the novel read in streaming mode with the novel read as a whole."""
+
+    def test_novel(self):
+        for filePath in TEST_PROJECTS:
+            expected = read_novel(filePath, False).novel
+            actual = read_novel(filePath, True).novel
+            self.assertEqual(actual.srtChapters, expected.srtChapters)
+            self.assertEqual(actual.srtCharacters, expected.srtCharacters)
+            self.assertEqual(actual.srtLocations, expected.srtLocations)
+            self.assertEqual(actual.srtItems, expected.srtItems)
+            self.assertEqual(actual.srtPrjNotes, expected.srtPrjNotes)
+            self.assertEqual(actual.languages, expected.languages)
+            self.assertEqual(actual.title, expected.title)
+            self.assertEqual(actual.desc, expected.desc)
+            for scId in expected.scenes:
+                self.assertEqual(get_attributes(actual.scenes[scId]), get_attributes(expected.scenes[scId]))
+            for chId in expected.chapters:
+                self.assertEqual(get_attributes(actual.chapters[chId]), get_attributes(expected.chapters[chId]))
+            for crId in expected.characters:
+                self.assertEqual(get_attributes(actual.characters[crId]), get_attributes(expected.characters[crId]))
+
+    def test_tree(self):
+        ywFile = read_novel(TEST_PROJECTS[0], True)
+        self.assertIsNone(ywFile.tree)
+        with self.assertRaises(Error):
+            ywFile.write()
+
+
+class ReadOnly(unittest.TestCase):
+    """Test the read-only mode used for exporting."""
+
+    def test_read_only(self):
+        expected = read_novel(TEST_PROJECTS[0], False).novel
+        ywFile = read_novel(TEST_PROJECTS[0], False, readOnly=True)
+        self.assertIsNone(ywFile.tree)
+        for scId in expected.scenes:
+            self.assertEqual(get_attributes(ywFile.novel.scenes[scId]), get_attributes(expected.scenes[scId]))
+        with self.assertRaises(Error):
+            ywFile.write()
+
+    def test_export_source(self):
+        source, __ = ExportSourceFactory([Yw7File]).make_file_objects(TEST_PROJECTS[0])
+        self.assertTrue(source.readOnly)
+
+
+class KeywordVariables(unittest.TestCase):
+    """Test that all custom keyword variables are present after reading."""
+
+    def test_kw_var(self):
+        for kwargs in ({'streaming': False}, {'streaming': True}, {'streaming': False, 'readOnly': True},
+                       {'streaming': False, 'lazy': True}):
+            novel = read_novel(TEST_PROJECTS[2], **kwargs).novel
+            for elements, keywords in (
+                    (novel.scenes, Yw7File.SCN_KWVAR),
+                    (novel.chapters, Yw7File.CHP_KWVAR),
+                    (novel.characters, Yw7File.CRT_KWVAR),
+                    (novel.locations, Yw7File.LOC_KWVAR),
+                    (novel.items, Yw7File.ITM_KWVAR),
+                    ):
+                self.assertTrue(elements)
+                for element in elements.values():
+                    self.assertIsNone(element._kwVar)
+                    # Without custom fields in the file, no dictionary is allocated when reading.
+                    for fieldName in keywords:
+                        self.assertIn(fieldName, element.kwVar)
+
+    def test_added_kw_var(self):
+
+        class CustomFile(Yw7File):
+            SCN_KWVAR = Yw7File.SCN_KWVAR + ['Field_Custom']
+
+        ywFile = CustomFile(TEST_PROJECTS[2])
+        ywFile.novel = Novel()
+        ywFile.read()
+        for scene in ywFile.novel.scenes.values():
+            self.assertIsNone(scene.kwVar['Field_Custom'])
+            self.assertIn('Field_SceneArcs', scene.kwVar)
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Regression test for the pyWriter project.
+
+Test the incremental writing of the yWriter 7 project file.
+
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from shutil import copyfile
+from pywriter.model.novel import Novel
+from pywriter.model.scene import Scene
+from pywriter.model.world_element import WorldElement
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.test.helper import read_file
+import unittest
+
+DATA_PATH = '../test/data/_xref/'
+EXEC_PATH = '../test/tmp/'
+TEST_YW_FILE = f'{EXEC_PATH}yw7 Sample Project.yw7'
+FULL_YW_FILE = f'{EXEC_PATH}yw7 Sample Project full.yw7'
+
+
+def read_project(filePath):
+    """Return a Yw7File instance with the project read."""
+    ywFile = Yw7File(filePath)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile
+
+
+def change_novel(novel, step):
+    """Apply and report some changes to the novel; each step changes different parts."""
+    scIds = list(novel.scenes)
+    if step == 0:
+        novel.scenes[scIds[1]].sceneContent = 'Changed scene content.'
+        novel.report_change(novel.scenes, scIds[1])
+        novel.scenes[scIds[2]].tags = ['new tag']
+        novel.report_change(novel.scenes, scIds[2])
+    elif step == 1:
+        scId = novel.create_id(novel.scenes)
+        novel.scenes[scId] = Scene()
+        novel.scenes[scId].title = 'New scene'
+        novel.scenes[scId].sceneContent = 'New scene content.'
+        novel.scenes[scId].status = 1
+        novel.scenes[scId].scType = 0
+        novel.report_change(novel.scenes, scId)
+        novel.chapters[novel.srtChapters[0]].srtScenes.append(scId)
+        novel.report_change(novel.chapters, novel.srtChapters[0])
+        novel.characters[novel.srtCharacters[0]].notes = 'Changed notes.'
+        novel.report_change(novel.characters, novel.srtCharacters[0])
+    elif step == 2:
+        novel.title = 'Changed title'
+        novel.report_change(novel)
+        novel.srtLocations.reverse()
+        novel.report_change(novel.locations)
+        itId = novel.create_id(novel.items)
+        novel.items[itId] = WorldElement()
+        novel.items[itId].title = 'New item'
+        novel.srtItems.append(itId)
+        novel.report_change(novel.items, itId)
+        novel.report_change(novel.items)
+    elif step == 3:
+        novel.chapters[novel.srtChapters[1]].srtScenes.reverse()
+        novel.report_change(novel.chapters, novel.srtChapters[1])
+        novel.scenes[scIds[0]].characters.append(novel.srtCharacters[-1])
+        novel.report_change(novel.scenes, scIds[0])
+
+
+class Yw7Write(unittest.TestCase):
+
+    def setUp(self):
+        os.makedirs(EXEC_PATH, exist_ok=True)
+        self._remove_all_tempfiles()
+        copyfile(f'{DATA_PATH}normal.yw7', TEST_YW_FILE)
+        copyfile(f'{DATA_PATH}normal.yw7', FULL_YW_FILE)
+
+    def tearDown(self):
+        self._remove_all_tempfiles()
+
+    def test_unchanged(self):
+        ywFile = read_project(TEST_YW_FILE)
+        ywFile.write()
+        self.assertFalse(os.path.isfile(f'{TEST_YW_FILE}.bak'))
+        self.assertEqual(read_file(TEST_YW_FILE), read_file(f'{DATA_PATH}normal.yw7'))
+        ywFile.novel.title = 'Changed title'
+        ywFile.write()
+        self.assertFalse(os.path.isfile(f'{TEST_YW_FILE}.bak'))
+        # The change is not reported yet.
+
+        ywFile.novel.report_change(ywFile.novel)
+        ywFile.write()
+        self.assertTrue(os.path.isfile(f'{TEST_YW_FILE}.bak'))
+        os.remove(f'{TEST_YW_FILE}.bak')
+        ywFile.write()
+        self.assertFalse(os.path.isfile(f'{TEST_YW_FILE}.bak'))
+
+    def test_incremental(self):
+        ywFile = read_project(TEST_YW_FILE)
+        fullFile = read_project(FULL_YW_FILE)
+        ywFile.novel.desc = 'Changed description'
+        fullFile.novel.desc = 'Changed description'
+        ywFile.write()
+        fullFile.write()
+        for step in range(4):
+            change_novel(ywFile.novel, step)
+            ywFile.write()
+            change_novel(fullFile.novel, step)
+            fullFile._isBuilt = False
+            # Have the whole tree rebuilt.
+            fullFile.write()
+            self.assertEqual(read_file(TEST_YW_FILE), read_file(FULL_YW_FILE))
+
+    def _remove_all_tempfiles(self):
+        for fileName in os.listdir(EXEC_PATH):
+            if fileName.startswith('yw7 Sample Project'):
+                os.remove(f'{EXEC_PATH}{fileName}')
+
+
+def main():
+    unittest.main()
+
+
+if __name__ == '__main__':
+    main()